@@ -0,0 +1,136 @@
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+# Benchmarks never open a real window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+# Slowdown over the baseline median, as a fraction, above which a benchmark is flagged
+REGRESSION_THRESHOLD = 0.2
+
+def is_selected(name, only):
+    """Check whether a benchmark group passes the --only filter
+    Args:
+        name (str): Name of the group.
+        only (str): Text the name must contain, or None to select every group.
+    Returns:
+        bool: True if the group should run.
+    """
+    return not only or only in name
+
+def time_calls(func, setup=None, repeat=200, warmup=5):
+    """Time single calls of a function
+    Each call is timed on its own, so setup can put the game back in the same state
+    before every call without being counted.
+    Args:
+        func (callable): The function to time, called without arguments.
+        setup (callable, optional): Called without arguments before every call. Defaults to None.
+        repeat (int, optional): Number of timed calls. Defaults to 200.
+        warmup (int, optional): Number of untimed calls first. Defaults to 5.
+    Returns:
+        dict: Number of calls and the mean, median, minimum and 95th percentile time of a
+            call, in microseconds.
+    """
+    perf_counter = time.perf_counter
+    for _ in range(warmup):
+        if setup:
+            setup()
+        func()
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = perf_counter()
+        func()
+        samples.append(perf_counter() - start)
+    return summarize(samples)
+
+def summarize(samples):
+    """Summarize timing samples
+    Args:
+        samples (list): Durations in seconds.
+    Returns:
+        dict: Number of samples and the mean, median, minimum and 95th percentile, in microseconds.
+    """
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "mean_us": statistics.fmean(ordered) * 1e6,
+        "median_us": statistics.median(ordered) * 1e6,
+        "min_us": ordered[0] * 1e6,
+        "p95_us": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1e6,
+    }
+
+def environment():
+    """Describe the machine and versions the benchmarks ran on
+    Returns:
+        dict: Python, pygame and platform versions and the time of the run.
+    """
+    import pygame
+    return {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "sdl": ".".join(map(str, pygame.get_sdl_version())),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+def save_results(path, results):
+    """Write benchmark results as JSON
+    Args:
+        path (str): Path of the file, or "-" for standard output.
+        results (dict): The report, as built by benchmarks.run.
+    Returns:
+        None
+    """
+    if path == "-":
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write("\n")
+        return
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+def load_results(path):
+    """Read benchmark results written by save_results
+    Args:
+        path (str): Path of the file.
+    Returns:
+        dict: The report, or None if the file does not exist.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def compare(benchmarks, baseline, threshold=REGRESSION_THRESHOLD):
+    """Compare benchmark medians with a baseline
+    Args:
+        benchmarks (dict): Timings by benchmark name, as returned by time_calls.
+        baseline (dict): Timings by benchmark name of the baseline run.
+        threshold (float, optional): Allowed slowdown as a fraction. Defaults to REGRESSION_THRESHOLD.
+    Returns:
+        dict: Maps each benchmark present in both runs to a dict with the baseline and
+            current medians, their ratio and whether it is a regression.
+    """
+    comparison = {}
+    for name, stats in benchmarks.items():
+        base = baseline.get(name)
+        if not base or not base["median_us"]:
+            continue
+        ratio = stats["median_us"] / base["median_us"]
+        comparison[name] = {
+            "baseline_median_us": base["median_us"],
+            "median_us": stats["median_us"],
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold,
+        }
+    return comparison
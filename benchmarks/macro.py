@@ -0,0 +1,72 @@
+import time
+from benchmarks.harness import summarize
+import pygame
+import snake
+from config import WIDTH, HEIGHT, SNAKE_SPEED, set_game_config
+from utils.hamiltonian import HamiltonianSolver
+
+# Length of the scripted game, in snake moves
+SCRIPTED_TICKS = 500
+
+# Level and seed of the scripted game
+SCRIPTED_LEVEL = "hard"
+SCRIPTED_SEED = 1234
+
+class ScriptedClock:
+    """Stand-in for pygame.time.Clock that reports exactly one snake move per frame
+
+    It does not sleep, so game_loop runs as fast as it can update and render, and it ends
+    the game with an ESC key press once the engine has made the requested number of moves.
+    """
+    def __init__(self, engine, ticks):
+        self.engine = engine
+        self.ticks = ticks
+        self.frames = 0
+        self.frame_ms = 1000.0 / SNAKE_SPEED
+
+    def tick(self, framerate=0):
+        self.frames += 1
+        if self.engine.ticks >= self.ticks:
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE))
+        return self.frame_ms
+
+def play_scripted_game(display, ticks):
+    """Play one scripted game through game_loop
+    The Hamiltonian solver steers, so the game never ends early and every run makes the
+    same moves.
+    Args:
+        display (Surface): The display to render on.
+        ticks (int): Number of snake moves to play.
+    Returns:
+        tuple: Wall time in seconds, number of frames and number of moves played.
+    """
+    set_game_config(SCRIPTED_LEVEL)
+    snake.SNAKE_PUNCH = 1
+    engine, direction_manager, blocks, _ = snake.initialize_game(SCRIPTED_SEED)
+    clock = ScriptedClock(engine, ticks)
+    start = time.perf_counter()
+    snake.game_loop(display, clock, engine, direction_manager, blocks, True, SCRIPTED_LEVEL,
+                    autopilot=HamiltonianSolver(engine))
+    return time.perf_counter() - start, clock.frames, engine.ticks
+
+def run(repeat=3, ticks=SCRIPTED_TICKS):
+    """Run the end-to-end benchmark
+    Args:
+        repeat (int, optional): Number of games to play. Defaults to 3.
+        ticks (int, optional): Snake moves per game. Defaults to SCRIPTED_TICKS.
+    Returns:
+        dict: Timings by benchmark name: the whole game, and one frame of it.
+    """
+    pygame.init()
+    display = pygame.display.get_surface() or pygame.display.set_mode((WIDTH, HEIGHT))
+    if not snake.SNAKE_HEAD_FRAMES:
+        snake.init_textures()
+    games, frames = [], []
+    for _ in range(repeat):
+        elapsed, n_frames, _ = play_scripted_game(display, ticks)
+        games.append(elapsed)
+        frames.append(elapsed / n_frames)
+    return {
+        f"scripted_game[level={SCRIPTED_LEVEL},ticks={ticks}]": summarize(games),
+        f"scripted_game_frame[level={SCRIPTED_LEVEL},ticks={ticks}]": summarize(frames),
+    }
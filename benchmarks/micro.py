@@ -0,0 +1,171 @@
+import inspect
+import random
+from benchmarks.harness import time_calls, is_selected
+import pygame
+import snake
+from config import WIDTH, HEIGHT, SIDE, SNAKE_COLOR
+from utils import textures
+from utils.blocks import HenBlock
+from utils.engine import SnakeEngine
+from utils.hamiltonian import HamiltonianSolver
+from utils.utils import generate_block_position
+
+# Boards of the engine benchmarks, in cells
+BOARD_SIZES = ((WIDTH // SIDE, HEIGHT // SIDE), (2 * WIDTH // SIDE, 2 * HEIGHT // SIDE), (4 * WIDTH // SIDE, 4 * HEIGHT // SIDE))
+
+# Snake lengths of the engine and drawing benchmarks
+SNAKE_LENGTHS = (10, 100, 500)
+
+# Boards larger than the window drawn through the camera, in cells
+WORLD_SIZES = ((100, 100), (1000, 1000))
+
+# Level whose rules and textures the benchmarks use
+BENCH_LEVEL = "hard"
+
+# Seed of the benchmark games
+BENCH_SEED = 1234
+
+def make_engine(cols, rows, length):
+    """Build a game on a board of the given size with a snake of the given length
+    The snake is grown by the Hamiltonian solver, so the body has a realistic shape and
+    the game is the same on every run.
+    Args:
+        cols (int): Number of columns.
+        rows (int): Number of rows.
+        length (int): Number of snake segments. Growth adds two segments per food, so odd
+            lengths are rounded up.
+    Returns:
+        SnakeEngine: The game.
+    """
+    engine = SnakeEngine({
+        "level": BENCH_LEVEL,
+        "n_food_blocks": 10,
+        "total_score_to_win": 10 ** 6,
+        "border_game_over": True,
+        "self_collision_game_over": True,
+    }, cols * SIDE, rows * SIDE, SIDE, BENCH_SEED)
+    solver = HamiltonianSolver(engine)
+    while len(engine.snake) < length and not engine.game_over:
+        engine.step(solver.next_direction())
+    if len(engine.snake) < length:
+        raise ValueError(f"A {cols}x{rows} board cannot hold a snake of {length} segments.")
+    return engine
+
+def bench_update_snake(results, repeat):
+    """Time one move of the pygame front-end, including the block bookkeeping"""
+    for cols, rows in BOARD_SIZES:
+        for length in SNAKE_LENGTHS:
+            engine = make_engine(cols, rows, length)
+            direction_manager = snake.DirectionManager(HamiltonianSolver(engine).next_direction())
+            blocks = [HenBlock(pos, BENCH_LEVEL) for pos in engine.food]
+            state = engine.snapshot()
+            initial_blocks = list(blocks)
+
+            def setup():
+                engine.restore(state)
+                blocks[:] = initial_blocks
+
+            results[f"update_snake[board={cols}x{rows},len={length}]"] = time_calls(
+                lambda: snake.update_snake(engine, direction_manager, blocks), setup, repeat)
+
+def bench_update_blocks(results, repeat):
+    """Time the food check of a move, both when the snake eats and when it does not"""
+    for cols, rows in BOARD_SIZES:
+        engine = make_engine(cols, rows, SNAKE_LENGTHS[1])
+        state = engine.snapshot()
+        food = next(iter(engine.food))
+        empty = next((x * SIDE, y * SIDE) for y in range(rows) for x in range(cols)
+                     if engine.grid[y * engine.cols + x] == 0)
+        for case, head in (("eat", food), ("miss", empty)):
+            results[f"update_blocks[board={cols}x{rows},{case}]"] = time_calls(
+                lambda: engine.update_blocks(head, []), lambda: engine.restore(state), repeat)
+
+def bench_generate_block_position(results, repeat):
+    """Time the legacy food placement, which scans the whole board"""
+    rng = random.Random(BENCH_SEED)
+    for cols, rows in BOARD_SIZES:
+        for length in SNAKE_LENGTHS:
+            engine = make_engine(cols, rows, length)
+            forbidden = set(engine.snake) | set(engine.food)
+            results[f"generate_block_position[board={cols}x{rows},len={length}]"] = time_calls(
+                lambda: generate_block_position(forbidden, cols * SIDE, rows * SIDE, SIDE, rng), repeat=repeat)
+
+def bench_drawing(results, repeat):
+    """Time drawing the snake, the background and whole frames on the game window"""
+    display = pygame.display.get_surface()
+    texture = textures.get_texture("dirt", size=SIDE, variant=snake.DIRT_VARIANTS[BENCH_LEVEL])
+    snake.draw_background(display, texture)
+    results["draw_background"] = time_calls(lambda: snake.draw_background(display, texture),
+                                            repeat=max(10, repeat // 10))
+    for length in SNAKE_LENGTHS:
+        engine = make_engine(WIDTH // SIDE, HEIGHT // SIDE, length)
+        direction_manager = snake.DirectionManager(engine.direction)
+        blocks = [HenBlock(pos, BENCH_LEVEL) for pos in engine.food]
+        results[f"draw_snake[len={length}]"] = time_calls(
+            lambda: snake.draw_snake(display, engine.snake, direction_manager), repeat=repeat)
+        results[f"draw_snake_interpolated[len={length}]"] = time_calls(
+            lambda: snake.draw_snake(display, engine.snake, direction_manager, 0.5), repeat=repeat)
+        results[f"render_game[len={length}]"] = time_calls(
+            lambda: snake.render_game(display, blocks, engine.snake, engine.score, direction_manager, BENCH_LEVEL),
+            repeat=repeat)
+
+def bench_world(results, repeat):
+    """Time frames of boards larger than the window, which should not depend on the board size"""
+    display = pygame.display.get_surface()
+    for cols, rows in WORLD_SIZES:
+        engine = make_engine(cols, rows, SNAKE_LENGTHS[1])
+        direction_manager = snake.DirectionManager(engine.direction)
+        blocks = [HenBlock(pos, BENCH_LEVEL) for pos in engine.food]
+        world = snake.create_world_view(display, engine, BENCH_LEVEL)
+        for alpha in (None, 0.5):
+            name = "render_world" if alpha is None else "render_world_interpolated"
+            results[f"{name}[world={cols}x{rows},len={SNAKE_LENGTHS[1]}]"] = time_calls(
+                lambda: snake.render_world(display, world, engine, blocks, direction_manager, BENCH_LEVEL, alpha),
+                repeat=repeat)
+
+def texture_factories():
+    """List the texture generators of utils.textures
+    Returns:
+        list: Tuples (name, function) of every create_*texture* function.
+    """
+    return [(name, func) for name, func in inspect.getmembers(textures, inspect.isfunction)
+            if name.startswith("create_") and "texture" in name and func.__module__ == textures.__name__]
+
+def bench_textures(results, repeat):
+    """Time every texture generator at the cell size and at twice the cell size"""
+    for name, func in texture_factories():
+        wants_color = "color" in inspect.signature(func).parameters
+        for size in (SIDE, 2 * SIDE):
+            args = (SNAKE_COLOR, size) if wants_color else (size,)
+            results[f"{name}[size={size}]"] = time_calls(lambda: func(*args), repeat=max(10, repeat // 4))
+
+# Every microbenchmark group, in the order they run
+MICRO_BENCHMARKS = (
+    bench_update_snake,
+    bench_update_blocks,
+    bench_generate_block_position,
+    bench_drawing,
+    bench_world,
+    bench_textures,
+)
+
+def run(repeat=200, only=None):
+    """Run the microbenchmarks
+    Args:
+        repeat (int, optional): Timed calls per benchmark. Defaults to 200.
+        only (str, optional): Run only the groups whose function name contains this text.
+            Defaults to None.
+    Returns:
+        dict: Timings by benchmark name, as returned by time_calls.
+    """
+    pygame.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((WIDTH, HEIGHT))
+    if not snake.SNAKE_HEAD_FRAMES:
+        snake.init_textures()
+    results = {}
+    for bench in MICRO_BENCHMARKS:
+        if not is_selected(bench.__name__, only):
+            continue
+        bench(results, repeat)
+    return results
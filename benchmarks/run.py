@@ -0,0 +1,94 @@
+# Run the benchmark suite headlessly and compare it with a stored baseline.
+# Usage, from the repository root:
+#     python -m benchmarks.run                      # run everything, compare with the baseline
+#     python -m benchmarks.run --save-baseline      # record the current timings as the baseline
+#     python -m benchmarks.run --only textures --json results.json
+import argparse
+import os
+import sys
+from benchmarks import harness
+from benchmarks import macro, micro
+
+# Baseline timings the runs are compared with
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Name of the macrobenchmark group for --only, matched like the microbenchmark groups
+MACRO_GROUP = "macro"
+
+def parse_args(argv=None):
+    """Parse the command line options of the benchmark runner
+    Args:
+        argv (list, optional): The arguments to parse. Defaults to sys.argv[1:].
+    Returns:
+        Namespace: The parsed options.
+    """
+    parser = argparse.ArgumentParser(description="Snake Game benchmarks")
+    parser.add_argument("--only", help="run only the benchmark groups whose name contains this text "
+                                       "(update_snake, update_blocks, generate_block_position, drawing, "
+                                       "world, textures or macro)")
+    parser.add_argument("--repeat", type=int, default=200, help="timed calls per microbenchmark")
+    parser.add_argument("--games", type=int, default=3, help="scripted games played by the macrobenchmark")
+    parser.add_argument("--ticks", type=int, default=macro.SCRIPTED_TICKS, help="snake moves per scripted game")
+    parser.add_argument("--json", metavar="PATH", help="write the report as JSON to PATH, or - for stdout")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline report to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=harness.REGRESSION_THRESHOLD,
+                        help="slowdown over the baseline median, as a fraction, flagged as a regression")
+    return parser.parse_args(argv)
+
+def print_report(benchmarks, comparison, stream=sys.stderr):
+    """Print a table of the timings and their change from the baseline
+    Args:
+        benchmarks (dict): Timings by benchmark name.
+        comparison (dict): Comparison by benchmark name, as returned by harness.compare.
+        stream (file, optional): Where to print. Defaults to sys.stderr, so stdout can carry JSON.
+    Returns:
+        None
+    """
+    width = max((len(name) for name in benchmarks), default=0)
+    for name, stats in benchmarks.items():
+        line = f"{name:<{width}}  {stats['median_us']:>12.1f} us  (p95 {stats['p95_us']:.1f})"
+        change = comparison.get(name)
+        if change:
+            line += f"  {change['ratio']:.2f}x baseline"
+            if change["regression"]:
+                line += "  REGRESSION"
+        print(line, file=stream)
+
+def main(argv=None):
+    """Run the benchmarks, report them and flag regressions
+    Args:
+        argv (list, optional): The arguments to parse. Defaults to sys.argv[1:].
+    Returns:
+        int: 1 if a benchmark regressed against the baseline, 0 otherwise.
+    """
+    args = parse_args(argv)
+    benchmarks = {}
+    if any(harness.is_selected(bench.__name__, args.only) for bench in micro.MICRO_BENCHMARKS):
+        benchmarks.update(micro.run(args.repeat, args.only))
+    if harness.is_selected(MACRO_GROUP, args.only):
+        benchmarks.update(macro.run(args.games, args.ticks))
+
+    baseline = harness.load_results(args.baseline)
+    comparison = harness.compare(benchmarks, baseline["benchmarks"], args.threshold) if baseline else {}
+    report = {
+        "environment": harness.environment(),
+        "threshold": args.threshold,
+        "benchmarks": benchmarks,
+        "comparison": comparison,
+    }
+    print_report(benchmarks, comparison)
+    if args.json:
+        harness.save_results(args.json, report)
+    if args.save_baseline:
+        harness.save_results(args.baseline, {"environment": report["environment"], "benchmarks": benchmarks})
+
+    regressions = [name for name, change in comparison.items() if change["regression"]]
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than the baseline by more than "
+              f"{args.threshold:.0%}: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
 import utils.globals
+import os
 import sys
 
 # Configuration Parameters
@@ -21,6 +22,22 @@ SIDE = 30                # Size of each grid cell in the game.
 FPS = 60                 # Frames per second. Increased for smoother animation.
 SNAKE_SPEED = 5          # The speed at which the snake moves, measured in blocks per second.
 MOVE_DELAY = FPS // SNAKE_SPEED  # The number of frames between each snake movement. Calculated as FPS // SNAKE_SPEED.
+DIRTY_RECT_RENDERING = False     # Repaint only the cells that changed each frame instead of the whole window. Ignored on boards larger than the window.
+INTERPOLATE_MOVEMENT = True      # Ease snake segments between cells while rendering. Ignored with dirty-rect rendering.
+WORLD_SIZE = None                # Board size in cells (cols, rows) for a world larger than the window, e.g. (1000, 1000). None fits the board to the window. Also set with --world.
+CHUNK_CELLS = 16                 # Side in cells of the pre-rendered background chunks of a world larger than the window.
+CHUNK_CACHE_SIZE = 48            # Background chunks kept in memory; the least recently drawn is dropped first.
+MAX_FRAME_TIME = 0.25            # Longest frame time in seconds fed to the simulation, so a stall does not fast-forward the game.
+GAME_SEED = None                 # Seed for the food placement of every game, for reproducible games. None draws a new seed per game.
+RECORD_REPLAYS = False           # Save a compact binary replay of every game to REPLAY_DIR. Also set with --record-replays.
+REPLAY_DIR = "replays"           # Directory where game replays are saved.
+ARCHIVE_GAMES = False            # Append every game to the replay archive in REPLAY_DIR for bulk analysis. Also set with --archive.
+AUTOPILOT = None                 # Planner steering the snake: "bfs", "hamiltonian", "mcts" or None to play. Also set with --autopilot.
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "snake-game")  # User cache directory for data computed once and reused across runs, whatever the working directory.
+TEXTURE_DISK_CACHE = True        # Persist generated textures in CACHE_DIR so later launches load them instead.
+PROFILE_FRAMES = False           # Record the time of every phase of each frame. Also enabled with --profile.
+PROFILE_OVERLAY = False          # Show frame time percentiles on screen while profiling.
+PROFILE_DUMP = None              # File the recorded frames are written to on exit (.json or .csv), or None.
 
 # Color Definitions
 BLOCKS_COLOR = YELLOW_MUSTARD = (220, 220, 60)  # RGB color value for the color of the blocks. Also referred to as YELLOW_MUSTARD.
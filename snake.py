@@ -1,10 +1,22 @@
 import pygame
 import random
 import sys
+import argparse
+import atexit
+import os
+from collections import OrderedDict, deque
 from utils.utils import *
 from utils.textures import *
 from utils.blocks import HenBlock
-from utils.matrix import generate_block_position, get_random_empty_cell
+from utils.fonts import render_text
+from utils.replay import record_game, MAX_SEED
+from utils.archive import ReplayArchive
+from utils.autopilot import Autopilot
+from utils.hamiltonian import HamiltonianSolver, has_hamiltonian_cycle
+from utils.mcts import MCTSAgent
+from utils.profiler import FrameProfiler, NULL_PROFILER
+from utils.world import WorldView
+from utils.engine import SnakeEngine, EVENT_MOVE, EVENT_EAT, EVENT_SPAWN, CELL_EMPTY, CELL_FOOD
 from utils.globals import *
 from config import *
 
@@ -13,40 +25,61 @@ STEP = SIDE
 
 FOOD_BLOCKS_TEXTURE = None
 
+# Snake head animation frames by pose, built once in init_textures
+SNAKE_HEAD_FRAMES = {}
+
+# Rotated variants of the head and tail textures, {texture: {angle: (rotated texture, offset)}}
+ROTATED_TEXTURES = {}
+
+# Maximum number of backgrounds kept by get_background_surface before the least recently used is dropped
+BACKGROUND_CACHE_SIZE = 6
+
+# Pre-rendered backgrounds by the (level, resolution, texture) they were built for
+BACKGROUND_CACHE = OrderedDict()
+
+# Dirt texture variant of each level's background
+DIRT_VARIANTS = {"baby": 1, "medium": 2, "hard": 3}
+
+# Largest board side in cells, as replays store the board size in 16-bit pixels
+MAX_WORLD_CELLS = 65535 // SIDE
+
+# Planners that can steer the snake, by the name given to --autopilot
+AUTOPILOTS = {"bfs": Autopilot, "hamiltonian": HamiltonianSolver, "mcts": MCTSAgent}
+
 def init_textures():
     """Initialize all textures with gradient-dot pattern and special head texture
-    This function initializes the textures used in the game, including the block texture,
-    snake texture, snake head texture, snake tail texture, and dirt texture. It sets up the
-    visual appearance of the game elements.
+    This function initializes the textures of the snake: its body, head animation and tail,
+    and their rotated copies. The food and background textures are fetched from get_texture
+    when they are first drawn.
     Returns:
         None
     """
-    global HEN_TEXTURE, APPLE_TEXTURE, RABBIT_TEXTURE, SNAKE_TEXTURE, SNAKE_HEAD_TEXTURE, SNAKE_TAIL_TEXTURE, BG_TEXTURE_LEVEL_1,  BG_TEXTURE_LEVEL_2,  BG_TEXTURE_LEVEL_3
-
-    HEN_TEXTURE = create_hen_texture(SIDE)  # Hen texture for regular blocks
-    APPLE_TEXTURE = create_apple_texture(SIDE)  # Apple texture for food blocks
-    RABBIT_TEXTURE = create_rabbit_texture(SIDE)  # Rabbit texture for food blocks
-    SNAKE_TEXTURE = create_gradient_dot_texture(SNAKE_COLOR)
-    SNAKE_HEAD_TEXTURE = create_serpent_short_thong_head_texture(SNAKE_HEAD_COLOR)  # Start with open eyes
-    SNAKE_TAIL_TEXTURE = create_snake_tail_texture(SNAKE_TAIL_COLOR)
-    BG_TEXTURE_LEVEL_1 = create_dirt_texture_level_1(SIDE)  # Dirt texture for background
-    BG_TEXTURE_LEVEL_2 = create_dirt_texture_level_2(SIDE)  # Dirt texture for background
-    BG_TEXTURE_LEVEL_3 = create_dirt_texture_level_3(SIDE)  # Dirt texture for background
+    global SNAKE_TEXTURE, SNAKE_HEAD_TEXTURE, SNAKE_TAIL_TEXTURE, SNAKE_HEAD_FRAMES, ROTATED_TEXTURES
+
+    # Food and background textures are generated on first use by get_texture
+    SNAKE_TEXTURE = get_texture("gradient_dot", SNAKE_COLOR, SIDE)
+    SNAKE_HEAD_FRAMES = {pose: get_texture("serpent_head", SNAKE_HEAD_COLOR, SIDE, pose) for pose in SNAKE_HEAD_POSES}
+    SNAKE_HEAD_TEXTURE = SNAKE_HEAD_FRAMES["short_tongue"]  # Start with open eyes
+    SNAKE_TAIL_TEXTURE = get_texture("snake_tail", SNAKE_TAIL_COLOR, SIDE)
+
+    # Precompute every orientation of the sprites drawn rotated
+    ROTATED_TEXTURES = {texture: build_rotations(texture, SIDE)
+                        for texture in (*SNAKE_HEAD_FRAMES.values(), SNAKE_TAIL_TEXTURE)}
 
 def update_head_snake_textures():
     """Update the head texture based on the current tick counter
-    This function updates the snake head texture based on whether the snake's eyes are closed
-    or open. It changes the texture to reflect the current state of the snake's head.
+    This function selects the snake head animation frame based on whether the snake's eyes
+    are closed or its tongue is out. The frames are built once by init_textures.
     Returns:
         None
     """
     global SNAKE_HEAD_TEXTURE
     if get_tick_counter(close_eyes_ticks):
-        SNAKE_HEAD_TEXTURE = create_serpent_head_texture_closed_eyes(SNAKE_HEAD_COLOR)
+        SNAKE_HEAD_TEXTURE = SNAKE_HEAD_FRAMES["closed_eyes"]
     elif get_tick_counter(tongue_long_ticks):
-        SNAKE_HEAD_TEXTURE = create_serpent_long_thong_head_texture(SNAKE_HEAD_COLOR)
+        SNAKE_HEAD_TEXTURE = SNAKE_HEAD_FRAMES["long_tongue"]
     else:
-        SNAKE_HEAD_TEXTURE = create_serpent_short_thong_head_texture(SNAKE_HEAD_COLOR)
+        SNAKE_HEAD_TEXTURE = SNAKE_HEAD_FRAMES["short_tongue"]
 
 def draw_block(display, pos, color, texture=None, rotation=0):
     """Draw a textured block with optional rotation
@@ -66,7 +99,7 @@ def draw_block(display, pos, color, texture=None, rotation=0):
     # If no texture provided, use default textures
     if texture is None:
         if color == BLOCKS_COLOR:
-            texture = APPLE_TEXTURE
+            texture = get_texture("apple", size=SIDE)
         elif color == SNAKE_HEAD_COLOR:
             texture = SNAKE_HEAD_TEXTURE
         elif color == SNAKE_TAIL_COLOR:
@@ -76,12 +109,15 @@ def draw_block(display, pos, color, texture=None, rotation=0):
 
     if texture:  # Make sure texture exists
         if rotation != 0:
-            # Rotate the texture
-            rotated_texture = pygame.transform.rotate(texture, rotation)
+            rotations = ROTATED_TEXTURES.get(texture)
+            if rotations is None or rotation not in rotations:
+                # Rotate the texture on the fly for sprites without precomputed rotations
+                rotated_texture = pygame.transform.rotate(texture, rotation)
+                offset = ((SIDE - rotated_texture.get_width()) // 2, (SIDE - rotated_texture.get_height()) // 2)
+            else:
+                rotated_texture, offset = rotations[rotation]
             # Adjust position to keep the center aligned
-            new_x = x + (SIDE - rotated_texture.get_width()) // 2
-            new_y = y + (SIDE - rotated_texture.get_height()) // 2
-            display.blit(rotated_texture, (new_x, new_y))
+            display.blit(rotated_texture, (x + offset[0], y + offset[1]))
         else:
             display.blit(texture, (x, y))
     else:
@@ -101,15 +137,13 @@ def show_game_over(screen, score):
     """
     global game_start_time
 
-    font = pygame.font.SysFont(None, 100)
-    text = font.render("GAME OVER", True, (255, 255, 255))
+    text = render_text("GAME OVER", 100, (255, 255, 255))
     text_rect = text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 50))
     screen.blit(text, text_rect)
 
     # Display the final score
-    font2 = pygame.font.SysFont(None, 60)
     total_score_to_win = game_config["total_score_to_win"]
-    score_text = font2.render(f"Puntos: {score}/{total_score_to_win}", True, (255, 255, 255))  # White color for score
+    score_text = render_text(f"Puntos: {score}/{total_score_to_win}", 60, (255, 255, 255))  # White color for score
     score_rect = score_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 40))
     screen.blit(score_text, score_rect)
 
@@ -117,7 +151,7 @@ def show_game_over(screen, score):
     elapsed_time = get_current_time()
     minutes = elapsed_time // 60
     seconds = elapsed_time % 60
-    time_text = font2.render(f"TIEMPO: {format_time(elapsed_time)}", True, (255, 255, 255))  # White color for time
+    time_text = render_text(f"TIEMPO: {format_time(elapsed_time)}", 60, (255, 255, 255))  # White color for time
     time_rect = time_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 100))
     screen.blit(time_text, time_rect)
     set_game_start_time(int(time.time()))
@@ -147,21 +181,19 @@ def show_game_win(screen, score):
     """
     global game_start_time
 
-    font = pygame.font.SysFont(None, 100)
-    text = font.render("¡¡ GANASTE !!", True, (0, 255, 0))  # Green color for win message
+    text = render_text("¡¡ GANASTE !!", 100, (0, 255, 0))  # Green color for win message
     text_rect = text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 50))
     screen.blit(text, text_rect)
 
     # Display the final score
-    font2 = pygame.font.SysFont(None, 60)
     total_score_to_win = game_config["total_score_to_win"]
-    score_text = font2.render(f"Puntos: {score}/{total_score_to_win}", True, (255, 255, 255))  # White color for score
+    score_text = render_text(f"Puntos: {score}/{total_score_to_win}", 60, (255, 255, 255))  # White color for score
     score_rect = score_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 40))
     screen.blit(score_text, score_rect)
 
     # Display the elapsed time
     elapsed_time = get_current_time()
-    time_text = font2.render(f"TIEMPO: {format_time(elapsed_time)}", True, (255, 255, 255))  # White color for time
+    time_text = render_text(f"TIEMPO: {format_time(elapsed_time)}", 60, (255, 255, 255))  # White color for time
     time_rect = time_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 100))
     screen.blit(time_text, time_rect)
     set_game_start_time(int(time.time()))
@@ -179,35 +211,45 @@ def show_game_win(screen, score):
                 return True
         pygame.time.wait(50)
 
-def draw_score_time_and_level_label(screen, score, level):
-    """Draw the score, time, and level labels on the screen
-    This function displays the current score, elapsed time, and selected level on the screen.
-    The score is displayed in the top-right corner, the elapsed time below it, and the level below the time.
+def build_score_time_and_level_labels(score, level):
+    """Render the score, time, and level labels and place them on the screen
+    The score is placed in the top-right corner, the elapsed time below it, and the level below the time.
     Args:
-        screen (Surface): The Pygame surface to draw the labels on.
         score (int): The current score to display.
         level (str): The selected level to display.
     Returns:
-        None
+        list: A list of (Surface, Rect) pairs, one per label.
     """
-    font = pygame.font.SysFont(None, 40)
 
-    # Draw score label
+    # Score label
     total_score_to_win  = game_config["total_score_to_win"]
-    score_text = font.render(f"Puntos: {score}/{total_score_to_win}", True, (255, 255, 0))
+    score_text = render_text(f"Puntos: {score}/{total_score_to_win}", 40, (255, 255, 0))
     score_rect = score_text.get_rect(topright=(WIDTH - 10, 10))
-    screen.blit(score_text, score_rect)
 
-    # Draw time label
+    # Time label
     elapsed_time = get_current_time()
-    time_text = font.render(f"TIEMPO: {format_time(elapsed_time)}", True, (255, 255, 255))
+    time_text = render_text(f"TIEMPO: {format_time(elapsed_time)}", 40, (255, 255, 255))
     time_rect = time_text.get_rect(topright=(WIDTH - 10, 50))
-    screen.blit(time_text, time_rect)
 
-    # Draw level label
-    level_text = font.render(f"NIVEL: {level.upper()}", True, (255, 255, 255))
+    # Level label
+    level_text = render_text(f"NIVEL: {level.upper()}", 40, (255, 255, 255))
     level_rect = level_text.get_rect(topright=(WIDTH - 10, 90))
-    screen.blit(level_text, level_rect)
+
+    return [(score_text, score_rect), (time_text, time_rect), (level_text, level_rect)]
+
+def draw_score_time_and_level_label(screen, score, level):
+    """Draw the score, time, and level labels on the screen
+    This function displays the current score, elapsed time, and selected level on the screen.
+    The score is displayed in the top-right corner, the elapsed time below it, and the level below the time.
+    Args:
+        screen (Surface): The Pygame surface to draw the labels on.
+        score (int): The current score to display.
+        level (str): The selected level to display.
+    Returns:
+        None
+    """
+    for text, rect in build_score_time_and_level_labels(score, level):
+        screen.blit(text, rect)
 
 # === Classes ===
 class DirectionManager:
@@ -220,7 +262,7 @@ class DirectionManager:
                 Defaults to RIGHT.
         """
         self.current_direction = initial_direction
-        self.direction_queue = []
+        self.direction_queue = deque()
 
     def handle_key_press(self, key, is_pressed):
         """Handle keyboard input for direction changes and SNAKE_PUNCH logic
@@ -284,65 +326,31 @@ class DirectionManager:
             tuple: The next valid direction (dx, dy) for the snake.
         """
         if self.direction_queue:
-            self.current_direction = self.direction_queue.pop(0)
+            self.current_direction = self.direction_queue.popleft()
         return self.current_direction
 
 # === Functions ===
-def generate_initial_blocks():
-    """Generate initial blocks for the game start
-    This function generates the initial blocks for the game start. It creates a list of
-    blocks placed at random positions on the grid, ensuring that they do not overlap with
-    the initial snake position.
-    Returns:
-        list: A list of generated Food objects.
-    """
-    blocks = []
-    forbidden = {(WIDTH // 4, HEIGHT // 2)}  # Initial snake position
-    for _ in range(game_config["n_food_blocks"]):
-        pos = generate_block_position(forbidden)
-        if pos:
-            blocks.append(HenBlock(pos))
-            forbidden.add(pos)
-    return blocks
-
-def update_blocks(blocks, snake, score):
-    """Update blocks positions and handle collisions
-    This function updates the positions of the blocks and checks for collisions with the
-    snake. If the snake collides with a block, the block is "eaten" by the snake, and a
-    new block is generated in a random empty position.
+def sync_food_blocks(blocks, events, level=None):
+    """Keep the drawable food blocks in sync with the engine
+    This function removes the blocks eaten during the last move and creates blocks for
+    the food spawned by the engine, so that each food keeps its texture between frames.
     Args:
         blocks (list): The list of current blocks in the game.
-        snake (list): The current snake body segments.
-        score (int): The current score of the player.
+        events (list): The (event, payload) tuples returned by SnakeEngine.step.
+        level (str, optional): Level deciding the texture of new blocks. Defaults to the
+            level in game_config.
     Returns:
-        int: The updated score after handling block collisions.
+        None
     """
-    snake_head = snake[0]
-
-    # Check collisions with snake head
-    for block in blocks[:]:  # Create a copy of the list to safely modify it
-        # Check if the snake head overlaps with any block
-        if block.pos[0] == snake_head[0] and block.pos[1] == snake_head[1]:
-            if not block.hit:
-                block.hit = True
-                score += 1
-                blocks.remove(block)
-
-                # Keep the tail position for growing
-                old_tail = snake[-1]
-
-                # Grow the snake by adding a new segment at the tail position
-                snake.append(old_tail)
-
-                # Create a new block in a random empty position
-                forbidden = set(snake)
-                forbidden.update(b.pos for b in blocks)
-                new_block_pos = generate_block_position(forbidden)
-                if new_block_pos:
-                    blocks.append(HenBlock(new_block_pos))
-                break
-
-    return score
+    for event, payload in events:
+        if event == EVENT_EAT:
+            for block in blocks:
+                if block.pos == payload:
+                    block.hit = True
+                    blocks.remove(block)
+                    break
+        elif event == EVENT_SPAWN:
+            blocks.append(HenBlock(payload, level))
 
 def draw_food_blocks(blocks, display):
     """Draw all blocks on the display
@@ -357,7 +365,54 @@ def draw_food_blocks(blocks, display):
     for block in blocks:
         block.draw(display)
 
-def draw_snake(display, snake, direction_manager):
+def get_interpolated_segment_position(snake, i, alpha, vacated_tail=None):
+    """Get where to draw a snake segment between its previous and current cell
+    After a move every segment sits in the cell of the segment behind it one move ago, so
+    segment i slides from snake[i + 1] to snake[i], and the tail slides from the cell it
+    vacated. Segments that wrapped through a border are not interpolated.
+    Args:
+        snake (list): The current snake body segments.
+        i (int): Index of the segment, 0 being the head.
+        alpha (float): Fraction of the current simulation tick that has elapsed (0 to 1).
+        vacated_tail (tuple, optional): Cell vacated by the tail on the last move. Defaults to None.
+    Returns:
+        tuple: The position (x, y) to draw the segment at.
+    """
+    pos = snake[i]
+    previous = snake[i + 1] if i + 1 < len(snake) else (vacated_tail or pos)
+    if abs(previous[0] - pos[0]) > SIDE or abs(previous[1] - pos[1]) > SIDE:
+        return pos
+    return get_segment_position(previous, pos, alpha, 1.0, move_resolution=1.0)
+
+def draw_snake_segment(display, snake, i, direction_manager, draw_pos=None):
+    """Draw one snake segment with the head, tail or body texture
+    Args:
+        display (Surface): The Pygame surface to draw on.
+        snake (list): The current snake body segments.
+        i (int): Index of the segment to draw, 0 being the head.
+        direction_manager (DirectionManager): The direction manager for handling snake direction.
+        draw_pos (tuple, optional): Position (x, y) to draw at instead of the segment's cell.
+            Defaults to None.
+    Returns:
+        None
+    """
+    pos = snake[i] if draw_pos is None else draw_pos
+    if i == 0:  # Head
+        if len(snake) > 1:
+            head_direction = get_tail_direction(snake[0], snake[1])
+        else:
+            head_direction = direction_manager.get_next_direction() or RIGHT
+        head_angle = get_direction_angle(head_direction)
+        draw_block(display, pos, SNAKE_HEAD_COLOR, rotation=head_angle)
+    elif i == len(snake) - 1:  # Tail
+        # Calculate tail direction
+        tail_direction = get_tail_direction(snake[-2], snake[-1])
+        tail_angle = get_direction_angle(tail_direction)
+        draw_block(display, pos, SNAKE_TAIL_COLOR, rotation=tail_angle)
+    else:  # Body
+        draw_block(display, pos, SNAKE_COLOR)
+
+def draw_snake(display, snake, direction_manager, alpha=None, vacated_tail=None):
     """Draw the snake with special head and tail textures, rotating the head
     This function draws the snake on the display. It uses a special texture for the snake's
     head and tail, and it rotates the head texture based on the snake's movement direction.
@@ -365,27 +420,17 @@ def draw_snake(display, snake, direction_manager):
         display (Surface): The Pygame surface to draw on.
         snake (list): The current snake body segments.
         direction_manager (DirectionManager): The direction manager for handling snake direction.
+        alpha (float, optional): Fraction of the current simulation tick that has elapsed, used
+            to ease segments between cells. None draws every segment in its cell. Defaults to None.
+        vacated_tail (tuple, optional): Cell vacated by the tail on the last move. Defaults to None.
     Returns:
         None
     """
-    for i, pos in enumerate(snake):
-        if i == 0:  # Head
-            if len(snake) > 1:
-                head_direction = get_tail_direction(snake[0], snake[1])
-            else:
-                head_direction = direction_manager.get_next_direction() or RIGHT
-            head_angle = get_direction_angle(head_direction)
-            draw_block(display, pos, SNAKE_HEAD_COLOR, rotation=head_angle)
-        elif i == len(snake) - 1:  # Tail
-            # Calculate tail direction
-            if len(snake) > 1:
-                tail_direction = get_tail_direction(snake[-2], snake[-1])
-                tail_angle = get_direction_angle(tail_direction)
-                draw_block(display, pos, SNAKE_TAIL_COLOR, rotation=tail_angle)
-            else:
-                draw_block(display, pos, SNAKE_TAIL_COLOR)  # No rotation for single-segment snake
-        else:  # Body
-            draw_block(display, pos, SNAKE_COLOR)
+    for i in range(len(snake)):
+        draw_pos = None
+        if alpha is not None:
+            draw_pos = get_interpolated_segment_position(snake, i, alpha, vacated_tail)
+        draw_snake_segment(display, snake, i, direction_manager, draw_pos)
 
 def draw_background(display, texture):
     """Draw the background texture to fill the screen
@@ -400,28 +445,77 @@ def draw_background(display, texture):
         for y in range(0, HEIGHT, SIDE):
             display.blit(texture, (x, y))
 
+def get_background_surface(level):
+    """Get the full-window background of a level, composing it on first use
+    This function tiles the level's dirt texture across a window-sized surface once and
+    caches it, so that rendering a frame costs a single blit. Every level keeps its own
+    surface, so switching levels does not rebuild it; a new one is built only for a new
+    texture or window resolution, and past BACKGROUND_CACHE_SIZE surfaces the least
+    recently used is dropped.
+    Args:
+        level (str): The selected level ("baby", "medium" or "hard").
+    Returns:
+        Surface: The background surface for the level.
+    """
+    texture = get_texture("dirt", size=SIDE, variant=DIRT_VARIANTS.get(level, 1))
+
+    key = (level, WIDTH, HEIGHT, texture)
+    background = BACKGROUND_CACHE.get(key)
+    if background is not None:
+        BACKGROUND_CACHE.move_to_end(key)
+        return background
+
+    background = pygame.Surface((WIDTH, HEIGHT))
+    if pygame.display.get_surface() is not None:
+        background = background.convert()  # Match the display format for fast blits
+    draw_background(background, texture)
+    BACKGROUND_CACHE[key] = background
+    if len(BACKGROUND_CACHE) > BACKGROUND_CACHE_SIZE:
+        BACKGROUND_CACHE.popitem(last=False)
+    return background
+
 # Refactored main function to reduce cognitive complexity
 # Extracted game initialization and game loop logic into separate functions
 
-def initialize_game():
+def initialize_game(seed=None, world_size=None):
     """Initialize the game state
-    This function initializes the game state, including the snake's initial position,
-    direction manager, blocks, score, and game start flag.
+    This function creates the headless game engine for the current game configuration,
+    the direction manager and the drawable food blocks.
+    Args:
+        seed (int, optional): Seed for the game's food placement. Defaults to a random seed.
+        world_size (tuple, optional): Size of the board in cells (cols, rows), independent
+            of the window. Defaults to None, which fits the board to the window.
     Returns:
-        tuple: A tuple containing the initial snake, direction manager, blocks, score, and game started flag.
+        tuple: A tuple containing the game engine, direction manager, blocks and game started flag.
     """
-    center_x = (WIDTH // SIDE // 2) * SIDE
-    center_y = (HEIGHT // SIDE // 2) * SIDE
-    snake = [(center_x, center_y), (center_x - STEP, center_y)]  # Start with head and tail
+    if world_size:
+        engine = SnakeEngine(game_config, world_size[0] * SIDE, world_size[1] * SIDE, SIDE, seed)
+    else:
+        engine = SnakeEngine(game_config, seed=seed)
     direction_manager = DirectionManager(None)
-    blocks = generate_initial_blocks()
-    score = 0
+    blocks = [HenBlock(pos) for pos in engine.food]
     game_started = False
-    return snake, direction_manager, blocks, score, game_started
+    return engine, direction_manager, blocks, game_started
 
 # Further refactored game_loop to reduce cognitive complexity
 # Extracted event handling and rendering logic into separate functions
 
+def start_game(direction_manager):
+    """Start a game waiting for its first move
+    This function shows the HUD and starts the game timer. It runs when the player presses
+    the first arrow key, or right away when an autopilot plays.
+    Args:
+        direction_manager (DirectionManager): The direction manager for handling snake direction.
+    Returns:
+        bool: The new game started flag, always True.
+    """
+    global GAME_RUNNING
+    GAME_RUNNING = True  # Set GAME_RUNNING to True when the game starts
+    direction_manager.current_direction = None
+    if game_start_time is None:
+        set_game_start_time(int(time.time()))
+    return True
+
 def handle_events(game_started, direction_manager):
     """Handle Pygame events for the game
     This function processes the Pygame events, such as keyboard input and window events.
@@ -433,7 +527,6 @@ def handle_events(game_started, direction_manager):
         tuple: A tuple containing the updated game started flag and game over flag.
     """
     GAME_OVER = False
-    global GAME_RUNNING
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             pygame.quit()
@@ -444,11 +537,7 @@ def handle_events(game_started, direction_manager):
                 GAME_OVER = True
                 continue
             if not game_started and is_pressed and event.key in (pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT):
-                game_started = True
-                GAME_RUNNING = True  # Set GAME_RUNNING to True when the game starts
-                direction_manager.current_direction = None
-                if game_start_time is None:
-                    set_game_start_time(int(time.time()))
+                game_started = start_game(direction_manager)
                 try:
                     direction_manager.handle_key_press(event.key, is_pressed)
                 except Exception:
@@ -456,7 +545,7 @@ def handle_events(game_started, direction_manager):
             direction_manager.handle_key_press(event.key, is_pressed)
     return game_started, GAME_OVER
 
-def render_game(display, blocks, snake, score, direction_manager, level):
+def render_game(display, blocks, snake, score, direction_manager, level, alpha=None, vacated_tail=None):
     """Render the game elements on the display
     This function renders all the game elements on the display, including the background,
     blocks, snake, score label, time label, and level label. It updates the display with the rendered content.
@@ -467,106 +556,370 @@ def render_game(display, blocks, snake, score, direction_manager, level):
         score (int): The current score of the player.
         direction_manager (DirectionManager): The direction manager for handling snake direction.
         level (str): The selected level to display.
+        alpha (float, optional): Fraction of the current simulation tick that has elapsed, used
+            to interpolate the snake. Defaults to None (no interpolation).
+        vacated_tail (tuple, optional): Cell vacated by the tail on the last move. Defaults to None.
     Returns:
         None
     """
     global GAME_RUNNING
-    display.fill((0, 0, 0))
-
-    # Draw the background based on the selected level
-    if game_config["level"] == "baby":
-        draw_background(display, BG_TEXTURE_LEVEL_1)
-    elif game_config["level"] == "medium":
-        draw_background(display, BG_TEXTURE_LEVEL_2)
-    elif game_config["level"] == "hard":
-        draw_background(display, BG_TEXTURE_LEVEL_3)
-    else:
-        draw_background(display, BG_TEXTURE_LEVEL_1)
+
+    # Draw the pre-rendered background of the selected level in a single blit
+    display.blit(get_background_surface(level), (0, 0))
 
     # Draw blocks and snake
     draw_food_blocks(blocks, display)
-    draw_snake(display, snake, direction_manager)
+    draw_snake(display, snake, direction_manager, alpha, vacated_tail)
 
     if GAME_RUNNING:
         draw_score_time_and_level_label(display, score, level)
-    pygame.display.flip()
 
-def update_snake(snake, direction_manager, blocks, score):
-    """Update the snake's position and check for collisions
-    This function updates the snake's position based on its current direction. It checks
-    for collisions with the game boundaries, itself, and blocks. It returns a game over
-    flag if a collision occurs.
+def create_world_view(display, engine, level):
+    """Create the camera and chunked background of a board larger than the window
     Args:
-        snake (list): The current snake body segments.
+        display (Surface): The Pygame display surface.
+        engine (SnakeEngine): The engine holding the game state.
+        level (str): The selected level, deciding the dirt of the background.
+    Returns:
+        WorldView: The view of the board, or None if the board fits the window.
+    """
+    width, height = display.get_size()
+    if engine.width <= width and engine.height <= height:
+        return None
+    return WorldView(width, height, engine, DIRT_VARIANTS.get(level, 1))
+
+def draw_visible_snake(display, engine, camera, direction_manager, alpha=None, vacated_tail=None):
+    """Draw the part of the snake inside the view of a camera
+    The body is found by scanning the occupancy grid over the visible cells only, so the
+    cost depends on the size of the view and not on the length of the snake or the size
+    of the board. With interpolation only the segments at both ends (head, neck, tail and
+    the segment before it) are eased between cells as draw_snake does; the rest of the
+    body is drawn in its cells, which covers the same ground while the snake moves.
+    Args:
+        display (Surface): The Pygame surface to draw on.
+        engine (SnakeEngine): The engine holding the game state.
+        camera (Camera): The camera giving the view.
         direction_manager (DirectionManager): The direction manager for handling snake direction.
+        alpha (float, optional): Fraction of the current simulation tick that has elapsed, used
+            to ease the head and tail between cells. Defaults to None.
+        vacated_tail (tuple, optional): Cell vacated by the tail on the last move. Defaults to None.
+    Returns:
+        None
+    """
+    snake = engine.snake
+    grid, cols = engine.grid, engine.cols
+    # The neck is drawn with the ends, so that it slides out from under the head. Cells
+    # holding end segments only leave the static pass the segments drawn at the ends.
+    ends = sorted({0, 1, len(snake) - 2, len(snake) - 1})
+    end_counts = {}
+    for i in ends:
+        end_counts[snake[i]] = end_counts.get(snake[i], 0) + 1
+    columns, rows = camera.visible_cells(cols, engine.rows)
+    x0, x1 = columns.start, columns.stop
+    body = []
+    for y in rows:
+        row = grid[y * cols + x0:y * cols + x1]
+        if not any(row):
+            continue
+        for x, count in enumerate(row, x0):
+            if count == CELL_EMPTY or count == CELL_FOOD:
+                continue
+            pos = (x * SIDE, y * SIDE)
+            if count > end_counts.get(pos, 0):
+                body.append((SNAKE_TEXTURE, (pos[0] - camera.x, pos[1] - camera.y)))
+    display.blits(body, doreturn=False)
+
+    for i in ends:
+        pos = get_interpolated_segment_position(snake, i, alpha, vacated_tail) if alpha is not None else snake[i]
+        if camera.is_visible(pos):
+            draw_snake_segment(display, snake, i, direction_manager, camera.to_screen(pos))
+
+def render_world(display, world, engine, blocks, direction_manager, level, alpha=None, vacated_tail=None):
+    """Render the part of a board larger than the window that is around the snake head
+    The camera follows the head, and only the background chunks, food and snake cells in
+    its view are drawn, so the cost of a frame depends on the size of the window and not
+    on the size of the board.
+    Args:
+        display (Surface): The Pygame surface to draw on.
+        world (WorldView): The camera and background of the board.
+        engine (SnakeEngine): The engine holding the game state.
         blocks (list): The list of current blocks in the game.
-        score (int): The current score of the player.
+        direction_manager (DirectionManager): The direction manager for handling snake direction.
+        level (str): The selected level to display.
+        alpha (float, optional): Fraction of the current simulation tick that has elapsed, used
+            to ease the head, the tail and the camera between cells. Defaults to None.
+        vacated_tail (tuple, optional): Cell vacated by the tail on the last move. Defaults to None.
+    Returns:
+        None
+    """
+    camera = world.camera
+    snake = engine.snake
+    camera.follow(get_interpolated_segment_position(snake, 0, alpha) if alpha is not None else snake[0])
+    world.background.draw(display, camera)
+
+    # A level has a handful of food blocks, so they are culled one by one
+    for block in blocks:
+        if camera.is_visible(block.pos):
+            block.draw(display, camera.to_screen(block.pos))
+    draw_visible_snake(display, engine, camera, direction_manager, alpha, vacated_tail)
+
+    if GAME_RUNNING:
+        draw_score_time_and_level_label(display, engine.score, level)
+
+def present_frame(display, renderer, engine, blocks, direction_manager, level, alpha=None, vacated_tail=None,
+                  profiler=NULL_PROFILER, world=None):
+    """Draw the current frame and push it to the screen
+    Args:
+        display (Surface): The Pygame surface to draw on.
+        renderer (DirtyRectRenderer): The dirty-rect renderer, or None to repaint the whole window.
+        engine (SnakeEngine): The engine holding the game state.
+        blocks (list): The list of current blocks in the game.
+        direction_manager (DirectionManager): The direction manager for handling snake direction.
+        level (str): The selected level to display.
+        alpha (float, optional): Fraction of the current simulation tick that has elapsed, used
+            to interpolate the snake when repainting the whole window. Defaults to None.
+        vacated_tail (tuple, optional): Cell vacated by the tail on the last move. Defaults to None.
+        profiler (FrameProfiler, optional): Profiler timing the render and flip phases and
+            drawing its overlay. Defaults to NULL_PROFILER.
+        world (WorldView, optional): View of a board larger than the window, drawn by
+            render_world instead of the renderer. Defaults to None.
     Returns:
-        tuple: A tuple containing a game over flag and the updated score.
+        None
     """
-    direction = direction_manager.get_next_direction() or RIGHT
-    new_head = (
-        (snake[0][0] + direction[0] * STEP) // SIDE * SIDE,
-        (snake[0][1] + direction[1] * STEP) // SIDE * SIDE
-    )
-
-    # Ensure the initial movement does not trigger a collision
-    if len(snake) == 2 and new_head == snake[1]:
-        snake.insert(0, new_head)
-        snake.pop()
-        return False, score
-
-    if game_config["border_game_over"]:
-        # Check for collision with borders
-        if new_head[0] < 0 or new_head[0] >= WIDTH or new_head[1] < 0 or new_head[1] >= HEIGHT:
-            return True, score
+    if world is not None:
+        render_world(display, world, engine, blocks, direction_manager, level, alpha, vacated_tail)
+        rects = None
+    elif renderer:
+        rects = renderer.draw(engine, blocks, direction_manager, level)
     else:
-        # Handle border wrapping logic
-        if new_head[0] < 0:  # Left border
-            new_head = (WIDTH - SIDE, new_head[1])
-        elif new_head[0] >= WIDTH:  # Right border
-            new_head = (0, new_head[1])
-        elif new_head[1] < 0:  # Top border
-            new_head = (new_head[0], HEIGHT - SIDE)
-        elif new_head[1] >= HEIGHT:  # Bottom border
-            new_head = (new_head[0], 0)
-
-    # Check for collision with itself
-    if game_config["self_collision_game_over"]:
-        if new_head in snake[1:]: return True, score
-
-    snake.insert(0, new_head)
-    increase_counter()
-    old_score = score
-    score = update_blocks(blocks, snake, score)
-
-    if score == old_score:
-        snake.pop()
-
-    return False, score
-
-def game_loop(display, clock, snake, direction_manager, blocks, score, game_started, level):
+        render_game(display, blocks, engine.snake, engine.score, direction_manager, level, alpha, vacated_tail)
+        rects = None
+    overlay = profiler.draw_overlay(display)
+    if overlay is not None and renderer:
+        # The overlay covers the cells under it, which are repainted on the next frame
+        renderer.mark_rect(overlay)
+        if rects is not None:
+            rects.append(overlay)
+    profiler.mark("render")
+    if rects is None:
+        pygame.display.flip()
+    elif rects:
+        pygame.display.update(rects)
+    profiler.mark("flip")
+
+class DirtyRectRenderer:
+    def __init__(self, display):
+        """Initialize a renderer that repaints only the regions that changed
+        Between snake moves almost nothing on screen changes, so instead of redrawing the
+        whole window every frame this class tracks the cells touched by the last moves
+        (head, neck, tail, eaten and spawned food), the head animation and the HUD labels,
+        repaints only those regions and updates them with pygame.display.update(rects).
+        The first frame is drawn in full. present_frame pushes the repainted regions to
+        the screen.
+        Args:
+            display (Surface): The Pygame display surface.
+        """
+        self.display = display
+        self.dirty_cells = set()
+        self.full_redraw = True
+        self.head_texture = None
+        self.hud_key = None
+        self.hud_rect = None
+
+    def mark_events(self, engine, events):
+        """Mark the cells changed by a snake move as dirty
+        Args:
+            engine (SnakeEngine): The engine holding the game state.
+            events (list): The (event, payload) tuples returned by SnakeEngine.step.
+        Returns:
+            None
+        """
+        snake = engine.snake
+        for event, payload in events:
+            if event == EVENT_MOVE:
+                new_head, vacated_tail = payload
+                self.dirty_cells.add(new_head)
+                self.dirty_cells.add(snake[1])   # Old head, now drawn as body
+                self.dirty_cells.add(snake[-1])  # New tail, now drawn as tail
+                if vacated_tail is not None:
+                    self.dirty_cells.add(vacated_tail)
+            elif event in (EVENT_EAT, EVENT_SPAWN):
+                self.dirty_cells.add(payload)
+
+    def draw(self, engine, blocks, direction_manager, level):
+        """Repaint the dirty regions without pushing them to the screen
+        Args:
+            engine (SnakeEngine): The engine holding the game state.
+            blocks (list): The list of current blocks in the game.
+            direction_manager (DirectionManager): The direction manager for handling snake direction.
+            level (str): The selected level to display.
+        Returns:
+            list: The repainted rectangles to update, or None if the whole window was
+                redrawn and must be flipped.
+        """
+        display = self.display
+        hud_key = (engine.score, get_current_time(), level) if GAME_RUNNING else None
+
+        if self.full_redraw:
+            render_game(display, blocks, engine.snake, engine.score, direction_manager, level)
+            self.full_redraw = False
+            self.dirty_cells.clear()
+            self.head_texture = SNAKE_HEAD_TEXTURE
+            self.hud_key = hud_key
+            self.hud_rect = self._labels_rect(build_score_time_and_level_labels(engine.score, level)) if GAME_RUNNING else None
+            return None
+
+        # The head animation changed its texture
+        if SNAKE_HEAD_TEXTURE is not self.head_texture:
+            self.head_texture = SNAKE_HEAD_TEXTURE
+            self.dirty_cells.add(engine.snake[0])
+
+        # Repaint the HUD when its values change or a repainted cell covers part of it
+        labels = []
+        hud_dirty = hud_key != self.hud_key or (
+            self.hud_rect is not None and
+            any(self.hud_rect.colliderect(pygame.Rect(pos, (SIDE, SIDE))) for pos in self.dirty_cells))
+        if hud_dirty:
+            labels = build_score_time_and_level_labels(engine.score, level) if GAME_RUNNING else []
+            new_rect = self._labels_rect(labels)
+            for rect in (self.hud_rect, new_rect):
+                if rect is not None:
+                    self.mark_rect(rect)
+            self.hud_key = hud_key
+            self.hud_rect = new_rect
+
+        if not self.dirty_cells:
+            return []
+
+        background = get_background_surface(level)
+        blocks_by_pos = {block.pos: block for block in blocks}
+        rects = []
+        for pos in self.dirty_cells:
+            rect = pygame.Rect(pos, (SIDE, SIDE))
+            display.blit(background, rect, rect)
+            block = blocks_by_pos.get(pos)
+            if block:
+                block.draw(display)
+            self._draw_segments_at(engine, pos, direction_manager)
+            rects.append(rect)
+        for text, rect in labels:
+            display.blit(text, rect)
+        self.dirty_cells.clear()
+        return rects
+
+    def _draw_segments_at(self, engine, pos, direction_manager):
+        """Draw the snake segments in a cell in the same order as draw_snake
+        Args:
+            engine (SnakeEngine): The engine holding the game state.
+            pos (tuple): Position (x, y) of the cell.
+            direction_manager (DirectionManager): The direction manager for handling snake direction.
+        Returns:
+            None
+        """
+        snake = engine.snake
+        # Cells of the window outside a board smaller than the window hold no segments
+        if pos[0] >= engine.cols * engine.side or pos[1] >= engine.rows * engine.side:
+            return
+        count = engine.grid[engine.cell_index(pos)]
+        if count in (CELL_EMPTY, CELL_FOOD):
+            return
+        if count == 1:
+            if snake[0] == pos:
+                draw_snake_segment(self.display, snake, 0, direction_manager)
+            elif snake[-1] == pos:
+                draw_snake_segment(self.display, snake, len(snake) - 1, direction_manager)
+            else:
+                draw_block(self.display, pos, SNAKE_COLOR)
+            return
+        # Overlapping segments are rare, so find them with a scan of the body
+        for i, segment in enumerate(snake):
+            if segment == pos:
+                draw_snake_segment(self.display, snake, i, direction_manager)
+
+    def mark_rect(self, rect):
+        """Mark every cell of the window overlapping a rectangle as dirty
+        Args:
+            rect (Rect): The rectangle in pixels.
+        Returns:
+            None
+        """
+        rect = rect.clip(self.display.get_rect())
+        if not rect:
+            return
+        for x in range(rect.left // SIDE, (rect.right - 1) // SIDE + 1):
+            for y in range(rect.top // SIDE, (rect.bottom - 1) // SIDE + 1):
+                self.dirty_cells.add((x * SIDE, y * SIDE))
+
+    @staticmethod
+    def _labels_rect(labels):
+        """Get the rectangle covering all the HUD labels
+        Args:
+            labels (list): The (Surface, Rect) pairs of the labels.
+        Returns:
+            Rect: The union of the label rectangles, or None if there are no labels.
+        """
+        if not labels:
+            return None
+        return labels[0][1].unionall([rect for _, rect in labels[1:]])
+
+def update_snake(engine, direction_manager, blocks):
+    """Move the snake one step using the next queued direction
+    This function feeds the next direction from the direction manager into the game
+    engine, advances the animation counter and keeps the drawable blocks in sync with
+    the food eaten and spawned during the move.
+    Args:
+        engine (SnakeEngine): The engine holding the game state.
+        direction_manager (DirectionManager): The direction manager for handling snake direction.
+        blocks (list): The list of current blocks in the game.
+    Returns:
+        tuple: A tuple containing a game over flag and the events of the move.
+    """
+    state, events = engine.step(direction_manager.get_next_direction())
+    if any(event == EVENT_MOVE for event, _ in events):
+        increase_counter()
+    sync_food_blocks(blocks, events)
+    return state.game_over, events
+
+def game_loop(display, clock, engine, direction_manager, blocks, game_started, level, replay=None, autopilot=None,
+              profiler=NULL_PROFILER):
     """Main game loop
-    This function is the main loop of the game. It handles the game events, updates the
-    game state, and renders the game elements. It continues running until the game is
-    over.
+    This function is the main loop of the game. It translates the Pygame events into
+    directions for the game engine and renders the game elements. The engine is stepped
+    on a fixed timestep of SNAKE_SPEED moves per second (doubled by SNAKE_PUNCH) fed by
+    the measured frame time, so the game speed does not depend on the frame rate, and
+    the snake is interpolated between moves when rendering. It continues running until
+    the game is over.
     Args:
         display (Surface): The Pygame surface to draw on.
         clock (Clock): The Pygame clock object for controlling the frame rate.
-        snake (list): The current snake body segments.
+        engine (SnakeEngine): The engine holding the game state.
         direction_manager (DirectionManager): The direction manager for handling snake direction.
         blocks (list): The list of current blocks in the game.
-        score (int): The current score of the player.
         game_started (bool): The flag indicating if the game has started.
         level (str): The selected level to display.
+        replay (Replay, optional): Replay the direction of every move is recorded into.
+            Defaults to None.
+        autopilot (Autopilot, optional): Planner queueing a direction before every move
+            the player has not queued one for. Defaults to None.
+        profiler (FrameProfiler, optional): Profiler recording the time of each phase of
+            every frame. Defaults to NULL_PROFILER, which records nothing.
     Returns:
         int: The final score when the game is over.
     """
     global SNAKE_PUNCH, GAME_RUNNING
-    move_counter = 0
+    accumulator = 0.0
     game_over = False
+    vacated_tail = None
+    has_moved = False
+    world = create_world_view(display, engine, level)
+    # The view of a large board scrolls with every move, so it is always redrawn in full
+    renderer = DirtyRectRenderer(display) if DIRTY_RECT_RENDERING and world is None else None
+    interpolate = INTERPOLATE_MOVEMENT and renderer is None
+    if autopilot is not None and not game_started:
+        game_started = start_game(direction_manager)  # Autopilots start without waiting for a key
 
     while not game_over:
+        profiler.begin_frame()
         game_started, game_over = handle_events(game_started, direction_manager)
 
         if game_over:
@@ -574,29 +927,50 @@ def game_loop(display, clock, snake, direction_manager, blocks, score, game_star
         # Ensure SNAKE_PUNCH is reset to 1 if no button is pressed
         if not pygame.key.get_pressed():
             SNAKE_PUNCH = 1
+        profiler.mark("events")
 
         update_head_snake_textures()
+        profiler.mark("textures")
 
         if not game_started:
-            render_game(display, blocks, snake, score, direction_manager, level)
+            present_frame(display, renderer, engine, blocks, direction_manager, level, profiler=profiler, world=world)
             clock.tick(FPS)
+            profiler.mark("wait")
+            profiler.end_frame()
             continue
 
-        move_counter += 1
-        if move_counter >= MOVE_DELAY // SNAKE_PUNCH:
-            move_counter = 0
-            game_over, score = update_snake(snake, direction_manager, blocks, score)
-
-        render_game(display, blocks, snake, score, direction_manager, level)
-        clock.tick(FPS)
-
-        if score >= game_config["total_score_to_win"]:
+        # Run every simulation tick that fits in the time elapsed so far
+        tick_interval = 1.0 / (SNAKE_SPEED * SNAKE_PUNCH)
+        while accumulator >= tick_interval and not game_over:
+            accumulator -= tick_interval
+            if autopilot is not None and not direction_manager.direction_queue:
+                direction = autopilot.next_direction()
+                if direction is not None:
+                    direction_manager.queue_direction(direction)
+            snake_dead, events = update_snake(engine, direction_manager, blocks)
+            game_over = game_over or snake_dead
+            if replay is not None:
+                replay.append(engine.direction)
+            for event, payload in events:
+                if event == EVENT_MOVE:
+                    vacated_tail = payload[1]
+                    has_moved = True
+            if renderer:
+                renderer.mark_events(engine, events)
+        profiler.mark("update")
+
+        alpha = min(1.0, accumulator / tick_interval) if interpolate and has_moved else None
+        present_frame(display, renderer, engine, blocks, direction_manager, level, alpha, vacated_tail, profiler, world)
+        accumulator += min(clock.tick(FPS) / 1000.0, MAX_FRAME_TIME)
+        profiler.mark("wait")
+        profiler.end_frame()
+
+        if engine.game_win:
             GAME_RUNNING = False
-            GAME_WIN = True
             game_over = True
             break
 
-    return score
+    return engine.score
 
 def display_level_selection_menu(screen):
     """Display a menu to select the game level.
@@ -609,23 +983,22 @@ def display_level_selection_menu(screen):
     screen.fill((0, 0, 0))  # Fill the screen with black
     pygame.display.flip()
 
-    font = pygame.font.SysFont(None, 60)
 
     # Display the menu title
-    title_text = font.render("SELECCIONA NIVEL", True, (255, 255, 255))
+    title_text = render_text("SELECCIONA NIVEL", 60, (255, 255, 255))
     title_rect = title_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 100))
     screen.blit(title_text, title_rect)
 
     # Display level options
-    easy_text = font.render("Baby (1)", True, (0, 255, 0))
+    easy_text = render_text("Baby (1)", 60, (0, 255, 0))
     easy_rect = easy_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 30))
     screen.blit(easy_text, easy_rect)
 
-    medium_text = font.render("Medium (2)", True, (255, 255, 0))
+    medium_text = render_text("Medium (2)", 60, (255, 255, 0))
     medium_rect = medium_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 30))
     screen.blit(medium_text, medium_rect)
 
-    hard_text = font.render("Hard (3)", True, (255, 0, 0))
+    hard_text = render_text("Hard (3)", 60, (255, 0, 0))
     hard_rect = hard_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 90))
     screen.blit(hard_text, hard_rect)
 
@@ -646,6 +1019,84 @@ def display_level_selection_menu(screen):
                     return "hard"
         pygame.time.wait(50)
 
+def save_replay(replay):
+    """Save the replay of a finished game to REPLAY_DIR
+    Args:
+        replay (Replay): The replay of the game.
+    Returns:
+        str: The path of the saved replay.
+    """
+    os.makedirs(REPLAY_DIR, exist_ok=True)
+    path = os.path.join(REPLAY_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{replay.seed}.snkr")
+    replay.save(path)
+    return path
+
+def parse_world_size(text):
+    """Parse a board size given on the command line
+    Args:
+        text (str): The size as COLSxROWS, e.g. 1000x1000.
+    Returns:
+        tuple: The size in cells (cols, rows).
+    """
+    try:
+        cols, rows = (int(n) for n in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected COLSxROWS, got {text!r}")
+    if not (2 <= cols <= MAX_WORLD_CELLS and 1 <= rows <= MAX_WORLD_CELLS):
+        raise argparse.ArgumentTypeError(f"a board must be 2 to {MAX_WORLD_CELLS} columns and 1 to "
+                                         f"{MAX_WORLD_CELLS} rows, got {text!r}")
+    return cols, rows
+
+def parse_seed(text):
+    """Parse a game seed given on the command line
+    Args:
+        text (str): The seed, an integer from 0 to MAX_SEED so replays can store it.
+    Returns:
+        int: The seed.
+    """
+    try:
+        seed = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected an integer, got {text!r}")
+    if not 0 <= seed <= MAX_SEED:
+        raise argparse.ArgumentTypeError(f"a seed must be 0 to {MAX_SEED}, got {text!r}")
+    return seed
+
+def parse_args(argv=None):
+    """Parse the command line options of the game
+    Args:
+        argv (list, optional): The arguments to parse. Defaults to sys.argv[1:].
+    Returns:
+        Namespace: The parsed options.
+    """
+    parser = argparse.ArgumentParser(description="Snake Game")
+    parser.add_argument("--seed", type=parse_seed, default=GAME_SEED,
+                        help="seed for the food placement, to replay the same games")
+    parser.add_argument("--autopilot", nargs="?", const="bfs", default=AUTOPILOT, choices=sorted(AUTOPILOTS),
+                        help="let a built-in planner play: shortest paths to food (bfs, the default), "
+                             "a board-filling Hamiltonian cycle or Monte-Carlo tree search")
+    parser.add_argument("--world", metavar="COLSxROWS", type=parse_world_size, default=WORLD_SIZE,
+                        help="play on a board of this many cells, independent of the window; "
+                             "larger boards scroll with the snake")
+    parser.add_argument("--record-replays", action="store_true", default=RECORD_REPLAYS,
+                        help=f"save a replay of every game to {REPLAY_DIR}/")
+    parser.add_argument("--archive", action="store_true", default=ARCHIVE_GAMES,
+                        help=f"append every game to the replay archive in {REPLAY_DIR}/")
+    parser.add_argument("--profile", action="store_true", default=PROFILE_FRAMES,
+                        help="record the time of every phase of each frame")
+    parser.add_argument("--profile-overlay", action="store_true", default=PROFILE_OVERLAY,
+                        help="show frame time percentiles on screen (implies --profile)")
+    parser.add_argument("--profile-dump", metavar="PATH", default=PROFILE_DUMP,
+                        help="write the recorded frames to PATH on exit, as JSON if it ends in .json "
+                             "and CSV otherwise (implies --profile)")
+    args = parser.parse_args(argv)
+    if args.autopilot == "hamiltonian":
+        cols, rows = args.world or (WIDTH // SIDE, HEIGHT // SIDE)
+        if not has_hamiltonian_cycle(cols, rows):
+            parser.error(f"the hamiltonian autopilot needs a board at least 2x2 with an even side, "
+                         f"got {cols}x{rows}")
+    return args
+
 def main():
     """Main entry point of the game
     This function is the main entry point of the game. It initializes Pygame, creates the
@@ -655,21 +1106,37 @@ def main():
         None
     """
     global game_start_time
+    args = parse_args()
     pygame.init()
     display = pygame.display.set_mode((WIDTH, HEIGHT), pygame.NOFRAME)
     pygame.display.set_caption("Snake Game")
     clock = pygame.time.Clock()
     init_textures()  # Initialize textures once at the start
+    profiler = NULL_PROFILER
+    if args.profile or args.profile_overlay or args.profile_dump:
+        profiler = FrameProfiler(overlay=args.profile_overlay)
+        if args.profile_dump:
+            atexit.register(profiler.dump, args.profile_dump)
 
     while True:
-        snake, direction_manager, blocks, score, game_started = initialize_game()
         game_start_time = None  # Reset game start time on restart
         # Display level selection menu and set game configuration
         selected_level = display_level_selection_menu(display)
         set_game_config(selected_level)
-        score = game_loop(display, clock, snake, direction_manager, blocks, score, game_started, selected_level)
-        if GAME_WIN and not show_game_win(display, score):
-            break
+        engine, direction_manager, blocks, game_started = initialize_game(args.seed, args.world)
+        autopilot = AUTOPILOTS[args.autopilot](engine) if args.autopilot else None
+        replay = record_game(engine, selected_level) if args.record_replays or args.archive else None
+        score = game_loop(display, clock, engine, direction_manager, blocks, game_started, selected_level,
+                          replay, autopilot, profiler)
+        if replay is not None and len(replay):
+            if args.record_replays:
+                save_replay(replay)
+            if args.archive:
+                ReplayArchive(REPLAY_DIR).append(replay, engine, get_current_time())
+        if engine.game_win:
+            if not show_game_win(display, score):
+                break
+            continue
         if not show_game_over(display, score):
             break
 
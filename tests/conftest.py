@@ -0,0 +1,10 @@
+import os
+import tempfile
+
+# The tests never open a real window or audio device
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+# Cached textures and cycles go to a fresh directory instead of the user cache
+os.environ["XDG_CACHE_HOME"] = tempfile.mkdtemp(prefix="snake-test-cache-")
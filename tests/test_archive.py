@@ -0,0 +1,34 @@
+from tests.test_replay import play_game
+from utils.archive import ReplayArchive, DEATH_CAUSES
+from utils.replay import ReplayPlayer
+
+def test_append_and_read_back(tmp_path):
+    archive = ReplayArchive(tmp_path)
+    games = [play_game("baby", seed, 400, move_seed=seed) for seed in range(3)]
+    games.append(play_game("hard", 3, 5000))
+    for i, (engine, replay, _) in enumerate(games):
+        assert archive.append(replay, engine, elapsed=10 + i) == i
+
+    reopened = ReplayArchive(tmp_path)
+    assert len(reopened) == len(games)
+    records = reopened.records
+    for i, (engine, replay, _) in enumerate(games):
+        assert int(records[i]["seed"]) == replay.seed
+        assert int(records[i]["ticks"]) == len(replay)
+        assert int(records[i]["score"]) == engine.score
+        assert int(records[i]["elapsed"]) == 10 + i
+        assert bytes(reopened.moves(i)) == replay.to_bytes()
+        state = ReplayPlayer(reopened.replay(i)).play_to_end()
+        assert list(state.snake) == list(engine.snake)
+    assert DEATH_CAUSES[records[3]["death_cause"]] == games[3][0].death_cause
+
+def test_summary_by_level(tmp_path):
+    archive = ReplayArchive(tmp_path)
+    assert archive.summary_by_level() == {}
+    for seed in range(4):
+        engine, replay, _ = play_game("baby", seed, 300, move_seed=seed)
+        archive.append(replay, engine, elapsed=5)
+    summary = archive.summary_by_level()
+    assert list(summary) == ["baby"]
+    assert summary["baby"]["games"] == 4
+    assert summary["baby"]["death_causes"]["quit"] == 4
@@ -0,0 +1,112 @@
+import pytest
+from config import SIDE, levels_config
+from utils.autopilot import Autopilot, ASTAR_MAX_TARGETS
+from utils.body import SnakeBody
+from utils.engine import SnakeEngine, CELL_EMPTY, CELL_FOOD
+from utils.globals import UP, DOWN, LEFT, RIGHT
+from utils.matrix import FreeCells
+
+def make_engine(cols, rows, walls, snake, food, direction):
+    """Engine on a cols x rows board with the given snake and food cells, as (x, y) pairs"""
+    engine = SnakeEngine({"level": "test", "n_food_blocks": 0, "total_score_to_win": 10 ** 6,
+                          "border_game_over": walls, "self_collision_game_over": True},
+                         cols * SIDE, rows * SIDE, SIDE, seed=0)
+    engine.snake = SnakeBody([(x * SIDE, y * SIDE) for x, y in snake])
+    engine.grid = bytearray(cols * rows)
+    engine.free = FreeCells(cols * rows, range(cols * rows))
+    for pos in engine.snake:
+        engine._occupy(engine.cell_index(pos))
+    for x, y in food:
+        cell = y * cols + x
+        engine.food[(x * SIDE, y * SIDE)] = cell
+        engine.grid[cell] = CELL_FOOD
+        engine.free.discard(cell)
+    engine.direction = direction
+    return engine
+
+def play_until_eaten(engine, autopilot, max_moves=100):
+    """Step the autopilot's moves until it eats, returning the number of moves"""
+    score = engine.score
+    for moves in range(1, max_moves + 1):
+        engine.step(autopilot.next_direction())
+        assert not engine.game_over
+        if engine.score > score:
+            return moves
+    raise AssertionError("the autopilot never reached the food")
+
+@pytest.fixture
+def fallbacks(monkeypatch):
+    """Count the calls to the largest-area fallback"""
+    calls = []
+    original = Autopilot._roomiest_action
+    def spy(self, head):
+        calls.append(head)
+        return original(self, head)
+    monkeypatch.setattr(Autopilot, "_roomiest_action", spy)
+    return calls
+
+# Far food blocks that switch the planner from A* to breadth-first search
+FAR_FOOD = [(9, 7), (9, 6), (8, 7), (0, 7)]
+
+@pytest.mark.parametrize("extra_food", [[], FAR_FOOD], ids=["astar", "bfs"])
+def test_shortest_path_with_walls(extra_food, fallbacks):
+    engine = make_engine(10, 8, True, [(2, 2), (1, 2)], [(6, 4)] + extra_food, RIGHT)
+    assert (len(engine.food) <= ASTAR_MAX_TARGETS) == (not extra_food)
+    assert play_until_eaten(engine, Autopilot(engine)) == 4 + 2
+    assert not fallbacks
+
+@pytest.mark.parametrize("extra_food", [[], FAR_FOOD], ids=["astar", "bfs"])
+def test_shortest_path_wraps_around(extra_food, fallbacks):
+    engine = make_engine(10, 8, False, [(1, 3), (2, 3)], [(8, 3)] + extra_food, LEFT)
+    autopilot = Autopilot(engine)
+    assert autopilot.next_direction() == LEFT
+    assert play_until_eaten(engine, autopilot) == 3
+    assert not fallbacks
+
+def test_path_through_cells_the_tail_leaves(fallbacks):
+    # The body walls off row 2, but its tail end clears before the head gets there
+    snake = [(0, 1), (0, 2), (1, 2), (2, 2), (3, 2), (4, 2), (5, 2), (5, 3), (5, 4)]
+    engine = make_engine(6, 5, True, snake, [(3, 4)], UP)
+    autopilot = Autopilot(engine)
+    # Along row 1, then down through (4, 2), which the body leaves after 4 moves
+    assert play_until_eaten(engine, autopilot) == 8
+    assert not fallbacks
+
+def test_unreachable_food_falls_back_to_roomiest_move(fallbacks):
+    # Column 3 is body that clears too late for any shortest path to cross it
+    snake = [(2, 0), (3, 0), (3, 1), (3, 2), (3, 3), (4, 3), (5, 3), (5, 2), (5, 1)]
+    engine = make_engine(6, 4, True, snake, [(4, 0)], LEFT)
+    autopilot = Autopilot(engine)
+    assert autopilot.next_direction() in (DOWN, LEFT)
+    assert fallbacks
+    # The snake stays alive while its body moves out of the way, then eats
+    play_until_eaten(engine, autopilot, max_moves=40)
+
+def test_no_move_when_every_move_is_fatal():
+    engine = make_engine(3, 3, True, [(0, 0), (1, 0), (1, 1), (0, 1), (0, 2)], [], LEFT)
+    assert Autopilot(engine).next_direction() is None
+
+def level_engine(level, seed):
+    config = levels_config[level]
+    return SnakeEngine({"level": level, "n_food_blocks": config["n_blocks"],
+                        "total_score_to_win": config["total_score_to_win"],
+                        "border_game_over": config["border_game_over"],
+                        "self_collision_game_over": config["self_collision_game_over"]}, seed=seed)
+
+def test_wins_medium():
+    engine = level_engine("medium", 0)
+    autopilot = Autopilot(engine)
+    while not engine.game_over:
+        engine.step(autopilot.next_direction())
+    assert engine.game_win
+
+@pytest.mark.parametrize("seed", range(3))
+def test_hard_dies_by_self_collision_after_a_long_game(seed):
+    # Greedy shortest paths eventually box the snake in on the hard level: pin down that
+    # it only dies of self-collision, never a wall, and only after a long game
+    engine = level_engine("hard", seed)
+    autopilot = Autopilot(engine)
+    while not engine.game_over:
+        engine.step(autopilot.next_direction())
+    assert engine.death_cause == "self"
+    assert 40 <= engine.score < engine.config["total_score_to_win"]
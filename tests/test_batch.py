@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from config import levels_config
+from utils.batch import BatchSnakeEnv, ACTIONS
+from utils.engine import SnakeEngine
+from utils.globals import RIGHT
+from utils.utils import is_opposite_direction
+
+RIGHT_ACTION = 3
+
+def engine_for(level):
+    rules = levels_config[level]
+    return SnakeEngine({
+        "level": level,
+        "n_food_blocks": 0,
+        "total_score_to_win": rules["total_score_to_win"],
+        "border_game_over": rules["border_game_over"],
+        "self_collision_game_over": rules["self_collision_game_over"],
+    }, seed=0)
+
+def test_board_matches_engine():
+    env = BatchSnakeEnv(1)
+    engine = engine_for("baby")
+    assert (env.cols, env.rows) == (engine.cols, engine.rows)
+    head = engine.snake[0]
+    assert (env.head_x[0], env.head_y[0]) == (head[0] // engine.side, head[1] // engine.side)
+
+def test_food_never_spawns_on_partial_cells():
+    env = BatchSnakeEnv(64, seed=1)
+    for _ in range(20):
+        env.reset()
+        cells = np.flatnonzero(env.food.any(axis=0))
+        assert (cells % env.cols < env.food_cols).all()
+        assert (cells // env.cols < env.food_rows).all()
+
+def test_border_wraps_like_engine():
+    env = BatchSnakeEnv(1, "baby", seed=0)
+    env.food[:] = False
+    engine = engine_for("baby")
+    for _ in range(engine.cols + 3):
+        env.step([RIGHT_ACTION])
+        engine.step(RIGHT)
+        assert env.head_x[0] * engine.side == engine.snake[0][0]
+
+def test_border_kills_like_engine():
+    env = BatchSnakeEnv(1, "hard", seed=0)
+    env.food[:] = False
+    engine = engine_for("hard")
+    steps = 0
+    while not engine.game_over:
+        engine.step(RIGHT)
+        steps += 1
+    for step in range(1, steps + 1):
+        _, dones = env.step([RIGHT_ACTION])
+        assert dones[0] == (step == steps)
+
+def body_cells(env, index):
+    """Cells of a batch game's snake, head first"""
+    return [int(env.body[index, (env.head_ptr[index] - i) % env.capacity]) for i in range(int(env.length[index]))]
+
+@pytest.mark.parametrize("level", ["baby", "hard"])
+@pytest.mark.parametrize("first", range(4))
+def test_first_move_like_engine(level, first):
+    env = BatchSnakeEnv(1, level, seed=0)
+    env.food[:] = False
+    engine = engine_for(level)
+    rng = np.random.default_rng(first)
+    actions = [first] + list(rng.integers(0, 4, size=40))
+    for action in actions:
+        direction = ACTIONS[action]
+        if engine.direction is not None and is_opposite_direction(engine.direction, direction):
+            direction = engine.direction
+        engine.step(direction)
+        _, dones = env.step([action])
+        assert dones[0] == engine.game_over
+        if engine.game_over:
+            break
+        assert body_cells(env, 0) == [engine.cell_index(pos) for pos in engine.snake]
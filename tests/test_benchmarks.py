@@ -0,0 +1,25 @@
+import pytest
+from benchmarks import macro, micro, run
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Record which benchmark groups run, without timing anything"""
+    calls = []
+    monkeypatch.setattr(micro, "MICRO_BENCHMARKS", (micro.bench_update_snake, micro.bench_textures))
+    monkeypatch.setattr(micro, "run", lambda repeat, only: calls.append("micro") or {})
+    monkeypatch.setattr(macro, "run", lambda games, ticks: calls.append("macro") or {})
+    return calls
+
+@pytest.mark.parametrize("only, expected", [
+    (None, ["micro", "macro"]),
+    ("macro", ["macro"]),
+    ("mac", ["macro"]),
+    ("textures", ["micro"]),
+    ("update", ["micro"]),
+    ("a", ["micro", "macro"]),
+    ("nothing", []),
+])
+def test_only_matches_every_group_by_substring(calls, tmp_path, only, expected):
+    argv = ["--baseline", str(tmp_path / "baseline.json")] + (["--only", only] if only else [])
+    assert run.main(argv) == 0
+    assert calls == expected
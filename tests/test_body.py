@@ -0,0 +1,43 @@
+import random
+from collections import deque
+import pytest
+from utils.body import SnakeBody
+
+def test_matches_deque_under_random_operations():
+    rng = random.Random(0)
+    body = SnakeBody([(0, 0), (1, 0)], capacity=2)
+    expected = deque([(0, 0), (1, 0)])
+    for step in range(5000):
+        operation = rng.random()
+        if operation < 0.4:
+            body.appendleft((step, 0))
+            expected.appendleft((step, 0))
+        elif operation < 0.6:
+            body.append((step, 1))
+            expected.append((step, 1))
+        elif expected:
+            assert body.pop() == expected.pop()
+        assert len(body) == len(expected)
+        if expected:
+            assert body[0] == expected[0] and body[-1] == expected[-1]
+    assert list(body) == list(expected)
+    assert [body[i] for i in range(len(body))] == list(expected)
+    assert [body[-i] for i in range(1, len(body) + 1)] == list(reversed(expected))
+
+def test_copy_is_independent():
+    body = SnakeBody([(0, 0), (1, 0), (2, 0)])
+    clone = body.copy()
+    clone.appendleft((5, 5))
+    clone.pop()
+    assert list(body) == [(0, 0), (1, 0), (2, 0)]
+    assert list(clone) == [(5, 5), (0, 0), (1, 0)]
+
+def test_index_and_pop_errors():
+    body = SnakeBody([(0, 0)])
+    with pytest.raises(IndexError):
+        body[1]
+    with pytest.raises(IndexError):
+        body[-2]
+    body.pop()
+    with pytest.raises(IndexError):
+        body.pop()
@@ -0,0 +1,8 @@
+import os
+import config
+from utils import textures
+
+def test_cache_dir_does_not_depend_on_working_directory():
+    assert os.path.isabs(config.CACHE_DIR)
+    assert config.CACHE_DIR == os.path.join(os.environ["XDG_CACHE_HOME"], "snake-game")
+    assert textures.TEXTURE_CACHE_DIR.startswith(config.CACHE_DIR)
@@ -0,0 +1,23 @@
+import pytest
+from snake import parse_args
+from utils.replay import MAX_SEED
+
+@pytest.mark.parametrize("seed", ["0", "42", str(MAX_SEED)])
+def test_seed_in_range(seed):
+    assert parse_args(["--seed", seed]).seed == int(seed)
+
+@pytest.mark.parametrize("seed", ["-1", str(MAX_SEED + 1), "abc"])
+def test_seed_out_of_range(seed):
+    with pytest.raises(SystemExit):
+        parse_args(["--seed", seed])
+
+def test_nothing_written_by_default():
+    args = parse_args([])
+    assert not args.record_replays
+    assert not args.archive
+
+def test_record_replays_flag():
+    assert parse_args(["--record-replays"]).record_replays
+
+def test_archive_flag():
+    assert parse_args(["--archive"]).archive
@@ -0,0 +1,86 @@
+import random
+import pytest
+from utils.engine import SnakeEngine, CELL_EMPTY, CELL_FOOD, MAX_CELL_SEGMENTS, EVENT_MOVE
+from utils.globals import UP, DOWN, LEFT, RIGHT
+
+RULES = {
+    "level": "baby",
+    "n_food_blocks": 6,
+    "total_score_to_win": 1000,
+    "border_game_over": False,
+    "self_collision_game_over": False,
+}
+
+def play(engine, moves):
+    return [engine.step(move)[1] for move in moves]
+
+def moves(n, seed=0):
+    rng = random.Random(seed)
+    return [rng.choice((UP, DOWN, LEFT, RIGHT)) for _ in range(n)]
+
+def test_same_seed_same_game():
+    a = SnakeEngine(RULES, seed=42)
+    b = SnakeEngine(RULES, seed=42)
+    assert play(a, moves(500)) == play(b, moves(500))
+    assert (list(a.snake), a.food, a.grid, a.score) == (list(b.snake), b.food, b.grid, b.score)
+
+def test_snapshot_restore_replays_identically():
+    engine = SnakeEngine(RULES, seed=3)
+    play(engine, moves(100))
+    state = engine.snapshot()
+    first = play(engine, moves(300, seed=1))
+    after = (list(engine.snake), dict(engine.food), bytes(engine.grid), engine.score, engine.ticks)
+    engine.restore(state)
+    assert play(engine, moves(300, seed=1)) == first
+    assert (list(engine.snake), dict(engine.food), bytes(engine.grid), engine.score, engine.ticks) == after
+
+def test_clone_is_independent_and_identical():
+    engine = SnakeEngine(RULES, seed=5)
+    play(engine, moves(50))
+    clone = engine.clone()
+    assert play(clone, moves(200, seed=2)) == play(engine, moves(200, seed=2))
+    clone.step(UP)
+    assert clone.ticks == engine.ticks + 1
+
+def test_grid_matches_snake_and_food():
+    engine = SnakeEngine(RULES, seed=7)
+    for _ in play(engine, moves(1000)):
+        counts = {}
+        for pos in engine.snake:
+            counts[engine.cell_index(pos)] = counts.get(engine.cell_index(pos), 0) + 1
+        for pos, cell in engine.food.items():
+            assert engine.grid[cell] == CELL_FOOD and cell == engine.cell_index(pos)
+        for cell, value in enumerate(engine.grid):
+            if value != CELL_FOOD:
+                assert value == counts.get(cell, 0)
+            if value != CELL_EMPTY:
+                assert cell not in engine.free
+
+def test_stacked_segments_never_read_as_food():
+    engine = SnakeEngine(dict(RULES, n_food_blocks=0), seed=0)
+    tail = engine.snake[-1]
+    cell = engine.cell_index(tail)
+    for _ in range(2 * CELL_FOOD):
+        engine._push_tail(tail)
+    assert engine.grid[cell] == MAX_CELL_SEGMENTS
+    assert cell not in engine.free
+    clone = engine.clone()
+    state = engine.snapshot()
+    for _ in range(2 * CELL_FOOD):
+        engine._pop_tail()
+        assert engine.grid[cell] not in (CELL_EMPTY, CELL_FOOD)
+    engine._pop_tail()
+    assert engine.grid[cell] == CELL_EMPTY and cell in engine.free and not engine.overflow
+    engine.restore(state)
+    assert engine.grid[cell] == MAX_CELL_SEGMENTS and engine.overflow == clone.overflow
+
+@pytest.mark.parametrize("direction", [UP, DOWN, LEFT, RIGHT])
+def test_border_rules(direction):
+    wrapping = SnakeEngine(dict(RULES, n_food_blocks=0), seed=0)
+    walled = SnakeEngine(dict(RULES, n_food_blocks=0, border_game_over=True), seed=0)
+    for _ in range(max(walled.cols, walled.rows) + 1):
+        walled.step(direction)
+        events = wrapping.step(direction)[1]
+        assert any(event == EVENT_MOVE for event, _ in events)
+    assert walled.game_over and walled.death_cause == "border"
+    assert not wrapping.game_over
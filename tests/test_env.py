@@ -0,0 +1,68 @@
+import random
+import numpy as np
+import pygame
+import pytest
+import snake
+from config import WIDTH, HEIGHT
+from utils.env import SnakeEnv
+
+def render_reference(env):
+    """Render the environment's game the way the window does"""
+    surface = pygame.Surface((WIDTH, HEIGHT), 0, 32)
+    blocks = [snake.HenBlock(pos, env.level) for pos in env.engine.food]
+    snake.SNAKE_HEAD_TEXTURE = snake.SNAKE_HEAD_FRAMES["short_tongue"]
+    snake.render_game(surface, blocks, env.engine.snake, env.engine.score, snake.DirectionManager(None), env.level)
+    return pygame.surfarray.array3d(surface).transpose(1, 0, 2)
+
+def test_grid_observation():
+    env = SnakeEnv("baby", seed=0)
+    obs, info = env.reset(seed=0)
+    assert obs.shape == env.observation_shape
+    engine = env.engine
+    head = engine.snake[0]
+    assert obs[0].sum() == 1 and obs[0, head[1] // engine.side, head[0] // engine.side] == 1
+    assert obs[2].sum() == len(engine.food)
+    assert obs[1].sum() == len(set(engine.snake))
+    assert info == {"score": 0, "ticks": 0, "death_cause": None}
+
+@pytest.mark.parametrize("level", ["baby", "hard"])
+def test_pixels_match_render_game(level):
+    env = SnakeEnv(level, "pixels", seed=1)
+    obs, _ = env.reset(seed=1)
+    assert obs.shape == env.observation_shape == (HEIGHT, WIDTH, 3)
+    assert np.array_equal(obs, render_reference(env))
+    rng = random.Random(0)
+    for tick in range(600):
+        obs, _, done, _, _ = env.step(rng.randrange(4))
+        # Cells shared by several segments are drawn in a different order, so skip them
+        if tick % 25 == 0 and len(set(env.engine.snake)) == len(env.engine.snake):
+            assert np.array_equal(obs, render_reference(env))
+        if done:
+            obs, _ = env.reset()
+            assert np.array_equal(obs, render_reference(env))
+
+def test_pixel_observations_are_copies():
+    env = SnakeEnv("baby", "pixels", seed=2)
+    first, _ = env.reset()
+    kept = first.copy()
+    for _ in range(20):
+        env.step(3)
+    assert np.array_equal(first, kept)
+
+def test_background_cache_keeps_every_level():
+    snake.BACKGROUND_CACHE.clear()
+    surfaces = {level: snake.get_background_surface(level) for level in ("baby", "medium", "hard")}
+    for level, surface in surfaces.items():
+        assert snake.get_background_surface(level) is surface
+    assert len(snake.BACKGROUND_CACHE) == 3
+
+def test_background_cache_drops_least_recently_used(monkeypatch):
+    monkeypatch.setattr(snake, "BACKGROUND_CACHE_SIZE", 2)
+    snake.BACKGROUND_CACHE.clear()
+    baby = snake.get_background_surface("baby")
+    medium = snake.get_background_surface("medium")
+    assert snake.get_background_surface("baby") is baby
+    snake.get_background_surface("hard")
+    assert len(snake.BACKGROUND_CACHE) == 2
+    assert snake.get_background_surface("baby") is baby
+    assert snake.get_background_surface("medium") is not medium
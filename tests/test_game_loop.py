@@ -0,0 +1,57 @@
+import pygame
+import pytest
+import snake
+import utils.utils
+from config import SIDE, levels_config
+from utils.engine import SnakeEngine
+from utils.profiler import FrameProfiler
+
+class IdleAutopilot:
+    """Autopilot that never queues a direction, so the snake runs straight"""
+    def next_direction(self):
+        return None
+
+@pytest.fixture
+def display():
+    pygame.init()
+    yield pygame.display.set_mode((snake.WIDTH, snake.HEIGHT))
+    pygame.display.quit()
+
+def hard_engine(cols, rows):
+    """Engine on a walled board without food, where a snake running straight dies quickly"""
+    config = levels_config["hard"]
+    return SnakeEngine({"level": "hard", "n_food_blocks": 0, "total_score_to_win": config["total_score_to_win"],
+                        "border_game_over": True, "self_collision_game_over": True}, cols * SIDE, rows * SIDE, SIDE, seed=0)
+
+@pytest.fixture
+def textures():
+    if not snake.SNAKE_HEAD_FRAMES:
+        snake.init_textures()
+
+def test_autopilot_games_start_the_clock(display, textures, monkeypatch):
+    monkeypatch.setattr(utils.utils, "game_start_time", None)
+    monkeypatch.setattr(snake, "GAME_RUNNING", False)
+    engine = hard_engine(4, 3)
+    snake.game_loop(display, pygame.time.Clock(), engine, snake.DirectionManager(None), [], False, "hard",
+                    autopilot=IdleAutopilot())
+    assert engine.game_over and engine.death_cause == "border"
+    assert utils.utils.game_start_time is not None
+    assert snake.GAME_RUNNING
+
+@pytest.mark.parametrize("cols, rows", [(10, 8), (20, 15), (26, 19)])
+def test_dirty_rects_with_overlay_on_board_smaller_than_window(display, textures, monkeypatch, cols, rows):
+    monkeypatch.setattr(snake, "DIRTY_RECT_RENDERING", True)
+    engine = hard_engine(cols, rows)
+    profiler = FrameProfiler(overlay=True)
+    snake.game_loop(display, pygame.time.Clock(), engine, snake.DirectionManager(None), [], False, "hard",
+                    autopilot=IdleAutopilot(), profiler=profiler)
+    assert engine.game_over and engine.death_cause == "border"
+    assert len(profiler) > 0
+
+def test_mark_rect_stays_inside_the_window(display):
+    renderer = snake.DirtyRectRenderer(display)
+    renderer.mark_rect(pygame.Rect(-10, display.get_height() - 20, 3 * SIDE, 100))
+    assert renderer.dirty_cells == {(x * SIDE, (display.get_height() - 20) // SIDE * SIDE) for x in range(3)}
+    renderer.dirty_cells.clear()
+    renderer.mark_rect(pygame.Rect(display.get_width() + 5, 0, 50, 50))
+    assert not renderer.dirty_cells
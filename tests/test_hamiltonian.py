@@ -0,0 +1,57 @@
+import os
+import pytest
+import utils.hamiltonian as hamiltonian
+from config import SIDE
+from snake import parse_args
+from utils.engine import SnakeEngine
+from utils.hamiltonian import (HamiltonianSolver, build_hamiltonian_cycle, has_hamiltonian_cycle,
+                               load_hamiltonian_cycle)
+
+def assert_valid_cycle(cycle, cols, rows):
+    assert sorted(cycle) == list(range(cols * rows))
+    for a, b in zip(cycle, cycle[1:] + cycle[:1]):
+        assert abs(a % cols - b % cols) + abs(a // cols - b // cols) == 1
+
+@pytest.mark.parametrize("cols, rows", [(2, 2), (2, 3), (3, 2), (4, 5), (5, 4), (26, 20), (27, 20), (25, 20)])
+def test_cycle_visits_every_cell_once(cols, rows):
+    assert has_hamiltonian_cycle(cols, rows)
+    assert_valid_cycle(list(build_hamiltonian_cycle(cols, rows)), cols, rows)
+
+@pytest.mark.parametrize("cols, rows", [(1, 4), (4, 1), (3, 3), (27, 21), (2, 1)])
+def test_boards_without_cycle(cols, rows):
+    assert not has_hamiltonian_cycle(cols, rows)
+    with pytest.raises(ValueError):
+        build_hamiltonian_cycle(cols, rows)
+
+def test_cycle_cache_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(hamiltonian, "_cycles", {})
+    cycle = load_hamiltonian_cycle(6, 4, str(tmp_path))
+    files = os.listdir(tmp_path)
+    assert files == [f"hamiltonian-v{hamiltonian.HAMILTONIAN_CACHE_VERSION}-6x4.bin"]
+    monkeypatch.setattr(hamiltonian, "_cycles", {})
+    assert load_hamiltonian_cycle(6, 4, str(tmp_path)) == cycle
+
+def test_unwritable_cache_still_returns_cycle(tmp_path, monkeypatch):
+    monkeypatch.setattr(hamiltonian, "_cycles", {})
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_bytes(b"")
+    cycle = load_hamiltonian_cycle(4, 4, str(blocker / "cache"))
+    assert_valid_cycle(list(cycle), 4, 4)
+
+@pytest.mark.parametrize("seed", range(3))
+def test_solver_wins(seed):
+    engine = SnakeEngine({"level": "hard", "n_food_blocks": 1, "total_score_to_win": 20,
+                          "border_game_over": True, "self_collision_game_over": True}, 8 * SIDE, 6 * SIDE, SIDE, seed)
+    solver = HamiltonianSolver(engine)
+    while not engine.game_over:
+        engine.step(solver.next_direction())
+    assert engine.game_win
+
+@pytest.mark.parametrize("world", ["27x21", "3x3", "8x1"])
+def test_cli_rejects_boards_without_cycle(world):
+    with pytest.raises(SystemExit):
+        parse_args(["--world", world, "--autopilot", "hamiltonian"])
+    parse_args(["--world", world, "--autopilot", "bfs"])
+
+def test_cli_accepts_board_with_cycle():
+    assert parse_args(["--world", "27x20", "--autopilot", "hamiltonian"]).world == (27, 20)
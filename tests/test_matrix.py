@@ -0,0 +1,46 @@
+import random
+import pytest
+from utils.matrix import FreeCells
+
+def test_matches_set_under_random_operations():
+    rng = random.Random(0)
+    universe = [c for c in range(100) if c % 10 != 9]  # The last column can never be free
+    free = FreeCells(100, universe)
+    expected = set(universe)
+    for _ in range(5000):
+        cell = rng.randrange(100)
+        if rng.random() < 0.5:
+            free.discard(cell)
+            expected.discard(cell)
+        else:
+            free.add(cell)
+            if cell in universe:
+                expected.add(cell)
+        assert len(free) == len(expected)
+    assert {c for c in range(100) if c in free} == expected
+
+def test_sample_draws_free_cells_only():
+    free = FreeCells(9, range(9))
+    for cell in (0, 2, 4, 6, 8):
+        free.discard(cell)
+    rng = random.Random(1)
+    assert {free.sample(rng) for _ in range(200)} == {1, 3, 5, 7}
+    for cell in (1, 3, 5, 7):
+        free.discard(cell)
+    assert free.sample(rng) is None
+
+def test_copy_is_independent():
+    free = FreeCells(4, range(4))
+    clone = free.copy()
+    clone.discard(2)
+    assert 2 in free and 2 not in clone
+    assert len(free) == 4 and len(clone) == 3
+
+@pytest.mark.parametrize("cell", [0, 3])
+def test_add_and_discard_are_idempotent(cell):
+    free = FreeCells(4, range(4))
+    free.add(cell)
+    assert len(free) == 4
+    free.discard(cell)
+    free.discard(cell)
+    assert len(free) == 3 and cell not in free
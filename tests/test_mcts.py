@@ -0,0 +1,73 @@
+import random
+import pytest
+from config import SIDE
+from utils.engine import SnakeEngine
+from utils.globals import UP, DOWN, RIGHT
+from utils.mcts import MCTS_ACTIONS, MCTSAgent, _legal_actions, _safe_actions, search
+
+def hard_engine(cols=10, rows=8, seed=0):
+    return SnakeEngine({"level": "hard", "n_food_blocks": 3, "total_score_to_win": 10 ** 6,
+                        "border_game_over": True, "self_collision_game_over": True},
+                       cols * SIDE, rows * SIDE, SIDE, seed)
+
+def observe(engine):
+    """Everything search could modify, in comparable form"""
+    free = [cell for cell in range(engine.cols * engine.rows) if cell in engine.free]
+    return (list(engine.snake), dict(engine.food), bytes(engine.grid), dict(engine.overflow), free,
+            engine.score, engine.direction, engine.ticks, engine.game_over, engine.rng.getstate())
+
+def test_search_leaves_engine_unchanged():
+    engine = hard_engine(seed=1)
+    for direction in (RIGHT, UP, UP):
+        engine.step(direction)
+    before = observe(engine)
+    stats = search(engine, time_budget=0.02, seed=0)
+    assert observe(engine) == before
+    assert set(stats) <= set(_legal_actions(engine))
+    assert sum(visits for visits, _ in stats.values()) > 0
+
+def test_agent_at_a_wall_turns():
+    engine = hard_engine(seed=2)
+    while engine.next_head(RIGHT) is not None:
+        engine.step(RIGHT)
+    agent = MCTSAgent(engine, time_budget=0.01, n_workers=1)
+    agent.rng.seed(0)
+    assert agent.next_direction() in (UP, DOWN)
+
+@pytest.mark.parametrize("seed", range(3))
+def test_agent_never_picks_a_fatal_move(seed):
+    engine = hard_engine(seed=seed)
+    agent = MCTSAgent(engine, time_budget=0.005, n_workers=1)
+    agent.rng.seed(seed)
+    for _ in range(150):
+        if engine.game_over:
+            break
+        safe = [MCTS_ACTIONS[a] for a in _safe_actions(engine, _legal_actions(engine))]
+        fatal = len(safe) == len(_legal_actions(engine)) and all(
+            engine.clone(random.Random(0)).step(d)[0].game_over for d in safe)
+        direction = agent.next_direction()
+        if not fatal:
+            assert direction in safe
+            engine.step(direction)
+            assert not engine.game_over
+        else:
+            engine.step(direction)
+
+def test_worker_pool_returns_a_move_and_shuts_down():
+    engine = hard_engine(seed=3)
+    agent = MCTSAgent(engine, time_budget=0.02, n_workers=2)
+    agent.rng.seed(0)
+    try:
+        for _ in range(3):
+            direction = agent.next_direction()
+            assert direction in MCTS_ACTIONS
+            engine.step(direction)
+        processes = list(agent._pool._processes.values())
+        assert len(processes) == 2
+    finally:
+        agent.close()
+    assert agent._pool is None
+    for process in processes:
+        process.join(timeout=10)
+        assert not process.is_alive()
+    agent.close()
@@ -0,0 +1,72 @@
+import random
+from config import levels_config
+from utils.engine import SnakeEngine
+from utils.globals import UP, DOWN, LEFT, RIGHT
+from utils.replay import Replay, ReplayPlayer, record_game, MAX_SEED
+
+def observe(engine):
+    """Get the parts of the game a player sees, plus the random generator state"""
+    return list(engine.snake), dict(engine.food), engine.score, engine.game_over, engine.rng.getstate()
+
+def play_game(level, seed, n_moves, move_seed=0):
+    """Play random moves and record them, stopping at the end of the game"""
+    config = dict(levels_config[level], level=level, n_food_blocks=levels_config[level]["n_blocks"])
+    engine = SnakeEngine(config, seed=seed)
+    replay = record_game(engine, level)
+    rng = random.Random(move_seed)
+    states = [observe(engine)]
+    for _ in range(n_moves):
+        if engine.game_over:
+            break
+        direction = rng.choice((UP, DOWN, LEFT, RIGHT))
+        engine.step(direction)
+        replay.append(direction)
+        states.append(observe(engine))
+    return engine, replay, states
+
+def test_bytes_round_trip():
+    _, replay, _ = play_game("baby", 11, 1000)
+    decoded = Replay.from_bytes(replay.to_bytes())
+    assert (decoded.level, decoded.config, decoded.seed, decoded.n_ticks) == (replay.level, replay.config, replay.seed, replay.n_ticks)
+    assert [decoded.action(t) for t in range(len(decoded))] == [replay.action(t) for t in range(len(replay))]
+
+def test_save_load_reproduces_game(tmp_path):
+    engine, replay, _ = play_game("baby", 12, 1000)
+    path = tmp_path / "game.snkr"
+    replay.save(path)
+    player = ReplayPlayer(Replay.load(path))
+    state = player.play_to_end()
+    assert list(state.snake) == list(engine.snake)
+    assert state.score == engine.score
+
+def test_seek_forward_and_backward():
+    _, replay, states = play_game("baby", 13, 1000)
+    player = ReplayPlayer(replay, keyframe_interval=64)
+    for tick in (500, 10, 999, 64, 0, 640, 641, 3):
+        player.seek(tick)
+        assert player.tick == tick
+        assert observe(player.engine) == states[tick]
+
+def test_seek_is_clamped():
+    _, replay, _ = play_game("baby", 14, 300)
+    player = ReplayPlayer(replay)
+    player.seek(10 ** 9)
+    assert player.tick == len(replay)
+    player.seek(-5)
+    assert player.tick == 0
+
+def test_seek_stops_at_game_over():
+    engine, replay, _ = play_game("hard", 15, 5000)
+    assert engine.game_over
+    # Moves recorded past the end of the game must not hang playback
+    for _ in range(20):
+        replay.append(UP)
+    player = ReplayPlayer(replay)
+    state = player.play_to_end()
+    assert state.game_over
+    assert player.tick == engine.ticks
+
+def test_largest_seed_round_trips():
+    engine = SnakeEngine(dict(levels_config["baby"], n_food_blocks=1), seed=MAX_SEED)
+    replay = record_game(engine, "baby")
+    assert Replay.from_bytes(replay.to_bytes()).seed == MAX_SEED
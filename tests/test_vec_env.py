@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+from utils.env import SnakeEnv
+from utils.vec_env import SubprocSnakeVecEnv
+
+@pytest.mark.parametrize("level", ["baby", "hard"])
+def test_matches_sequential_envs(level):
+    n_envs, seed, max_ticks = 5, 10, 150
+    envs = [SnakeEnv(level, seed=seed + i, max_ticks=max_ticks) for i in range(n_envs)]
+    expected = np.stack([env.reset(seed + i)[0] for i, env in enumerate(envs)])
+    rng = np.random.default_rng(0)
+    with SubprocSnakeVecEnv(n_envs, n_workers=2, level=level, seed=seed, max_ticks=max_ticks) as vec_env:
+        assert np.array_equal(vec_env.reset(seed), expected)
+        for _ in range(400):
+            actions = rng.integers(0, 4, size=n_envs)
+            obs, rewards, terminated, truncated, scores = vec_env.step(actions)
+            for i, env in enumerate(envs):
+                env_obs, reward, done, cut, info = env.step(int(actions[i]))
+                assert (rewards[i], terminated[i], truncated[i], scores[i]) == (reward, done, cut, info["score"])
+                if done or cut:
+                    env_obs = env.reset()[0]
+                assert np.array_equal(obs[i], env_obs)
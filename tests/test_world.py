@@ -0,0 +1,95 @@
+import pygame
+import pytest
+import snake
+from config import SIDE
+from utils.body import SnakeBody
+from utils.engine import SnakeEngine
+from utils.globals import RIGHT
+from utils.matrix import FreeCells
+from utils.world import Camera, ChunkedBackground
+
+def test_camera_centers_on_target():
+    camera = Camera(300, 240, 3000, 2400, SIDE)
+    camera.follow((1500, 1200))
+    assert (camera.x, camera.y) == (1500 + SIDE // 2 - 150, 1200 + SIDE // 2 - 120)
+    assert camera.to_screen((1500, 1200)) == (150 - SIDE // 2, 120 - SIDE // 2)
+
+@pytest.mark.parametrize("pos, expected", [((0, 0), (0, 0)), ((2970, 2370), (2700, 2160)), ((-500, 5000), (0, 2160))])
+def test_camera_clamps_to_board_edges(pos, expected):
+    camera = Camera(300, 240, 3000, 2400, SIDE)
+    camera.follow(pos)
+    assert (camera.x, camera.y) == expected
+
+def test_camera_centers_small_board():
+    camera = Camera(300, 240, 150, 2400, SIDE)
+    camera.follow((120, 1200))
+    assert camera.x == (150 - 300) // 2
+    assert 0 <= camera.y <= 2400 - 240
+
+def test_visible_cells():
+    camera = Camera(300, 240, 3000, 2400, SIDE)
+    camera.x, camera.y = 45, 60
+    columns, rows = camera.visible_cells(100, 80)
+    assert (columns.start, columns.stop) == (1, 12)  # Pixels 45..344
+    assert (rows.start, rows.stop) == (2, 10)       # Pixels 60..299
+    camera.x, camera.y = 2700, 2160
+    columns, rows = camera.visible_cells(100, 80)
+    assert (columns.start, columns.stop, rows.start, rows.stop) == (90, 100, 72, 80)
+    camera.x = -75  # Board narrower than the view
+    assert camera.visible_cells(5, 80)[0] == range(0, 5)
+
+def test_is_visible():
+    camera = Camera(300, 240, 3000, 2400, SIDE)
+    camera.x, camera.y = 300, 300
+    assert camera.is_visible((300 - SIDE + 1, 300))
+    assert not camera.is_visible((300 - SIDE, 300))
+    assert camera.is_visible((599, 539))
+    assert not camera.is_visible((600, 300))
+
+def test_chunk_cache_evicts_least_recently_used():
+    background = ChunkedBackground(1, 3000, 2400, SIDE, chunk_cells=2, capacity=2)
+    first = background.chunk(0, 0)
+    background.chunk(1, 0)
+    assert background.chunk(0, 0) is first  # Now the most recently used
+    background.chunk(2, 0)                  # Evicts (1, 0)
+    assert background.generated == 3
+    assert background.chunk(0, 0) is first
+    background.chunk(1, 0)
+    assert background.generated == 4
+    assert len(background._chunks) == 2
+
+def test_chunks_come_back_unchanged():
+    background = ChunkedBackground(2, 3000, 2400, SIDE, chunk_cells=2, capacity=1)
+    first = pygame.image.tostring(background.chunk(3, 4), "RGB")
+    background.chunk(0, 0)
+    assert pygame.image.tostring(background.chunk(3, 4), "RGB") == first
+
+@pytest.mark.parametrize("alpha", [None, 0.5])
+@pytest.mark.parametrize("length", [2, 3, 4, 8])
+def test_visible_snake_draws_each_segment_once(monkeypatch, alpha, length):
+    if not snake.SNAKE_HEAD_FRAMES:
+        snake.init_textures()
+    engine = SnakeEngine({"level": "baby", "n_food_blocks": 0, "total_score_to_win": 100,
+                          "border_game_over": False, "self_collision_game_over": False},
+                         40 * SIDE, 30 * SIDE, SIDE, seed=0)
+    engine.snake = SnakeBody([((20 - i) * SIDE, 10 * SIDE) for i in range(length)])
+    engine.grid = bytearray(engine.cols * engine.rows)
+    engine.free = FreeCells(engine.cols * engine.rows, range(engine.cols * engine.rows))
+    for pos in engine.snake:
+        engine._occupy(engine.cell_index(pos))
+    engine.direction = RIGHT
+    camera = Camera(600, 450, engine.width, engine.height, SIDE)
+    camera.follow(engine.snake[0])
+
+    ends = []
+    monkeypatch.setattr(snake, "draw_snake_segment", lambda display, body, i, manager, pos: ends.append(i))
+    display = pygame.Surface((600, 450))
+    statics = []
+    class Display:
+        def blits(self, sequence, doreturn=True):
+            statics.extend(sequence)
+        def __getattr__(self, name):
+            return getattr(display, name)
+    snake.draw_visible_snake(Display(), engine, camera, snake.DirectionManager(None), alpha, None)
+    assert sorted(ends) == sorted({0, 1, length - 2, length - 1})
+    assert len(statics) + len(ends) == length
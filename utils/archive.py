@@ -0,0 +1,136 @@
+import mmap
+import os
+import numpy as np
+from utils.replay import Replay, REPLAY_LEVELS, UNKNOWN_LEVEL
+
+# Why a game ended, by the code stored in the death_cause field
+DEATH_CAUSES = ("quit", "border", "self", "win")
+
+# Fixed-layout record of one archived game. The replay itself (header and packed moves)
+# lives in the moves file at moves_offset.
+GAME_RECORD = np.dtype([
+    ("seed", "<u8"),
+    ("moves_offset", "<u8"),
+    ("moves_size", "<u4"),
+    ("ticks", "<u4"),
+    ("score", "<u4"),
+    ("length", "<u4"),
+    ("elapsed", "<u4"),        # Seconds, as returned by get_current_time
+    ("level", "u1"),           # Index into REPLAY_LEVELS, or UNKNOWN_LEVEL
+    ("death_cause", "u1"),     # Index into DEATH_CAUSES
+    ("reserved", "u2"),
+])
+
+RECORDS_FILE = "games.rec"
+MOVES_FILE = "games.moves"
+
+class ReplayArchive:
+    def __init__(self, directory):
+        """Open an append-only archive of finished games
+        The archive is a file of fixed-size GAME_RECORD entries plus a file with the
+        variable-length replays. Both are read through mmap, so aggregate queries over
+        scores, lengths, times and levels work on zero-copy NumPy views without
+        deserializing any game.
+        Args:
+            directory (str): Directory holding the archive files, created if missing.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.records_path = os.path.join(directory, RECORDS_FILE)
+        self.moves_path = os.path.join(directory, MOVES_FILE)
+        self._records = None
+        self._moves = None
+
+    def __len__(self):
+        return os.path.getsize(self.records_path) // GAME_RECORD.itemsize if os.path.exists(self.records_path) else 0
+
+    def append(self, replay, engine, elapsed):
+        """Add a finished game to the archive
+        The replay is written before its record, so readers never see a record whose
+        replay is missing.
+        Args:
+            replay (Replay): The replay of the game.
+            engine (SnakeEngine): The engine at the end of the game.
+            elapsed (int): Duration of the game in seconds.
+        Returns:
+            int: Index of the game in the archive.
+        """
+        data = replay.to_bytes()
+        with open(self.moves_path, "ab") as f:
+            offset = f.tell()
+            f.write(data)
+
+        record = np.zeros(1, dtype=GAME_RECORD)
+        record["seed"] = replay.seed
+        record["moves_offset"] = offset
+        record["moves_size"] = len(data)
+        record["ticks"] = replay.n_ticks
+        record["score"] = engine.score
+        record["length"] = len(engine.snake)
+        record["elapsed"] = elapsed
+        record["level"] = REPLAY_LEVELS.index(replay.level) if replay.level in REPLAY_LEVELS else UNKNOWN_LEVEL
+        record["death_cause"] = DEATH_CAUSES.index("win" if engine.game_win else engine.death_cause or "quit")
+        with open(self.records_path, "ab") as f:
+            index = f.tell() // GAME_RECORD.itemsize
+            f.write(record.tobytes())
+        return index
+
+    @property
+    def records(self):
+        """Get a read-only view of all game records
+        Returns:
+            numpy.ndarray: A memory-mapped array of GAME_RECORD entries.
+        """
+        n_games = len(self)
+        if self._records is None or len(self._records) != n_games:
+            if n_games == 0:
+                self._records = np.zeros(0, dtype=GAME_RECORD)
+            else:
+                self._records = np.memmap(self.records_path, dtype=GAME_RECORD, mode="r", shape=(n_games,))
+        return self._records
+
+    def moves(self, index):
+        """Get the raw replay of a game without copying it
+        Args:
+            index (int): Index of the game.
+        Returns:
+            memoryview: The serialized replay, as produced by Replay.to_bytes.
+        """
+        record = self.records[index]
+        end = int(record["moves_offset"]) + int(record["moves_size"])
+        if self._moves is None or len(self._moves) < end:
+            with open(self.moves_path, "rb") as f:
+                self._moves = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._moves)[int(record["moves_offset"]):end]
+
+    def replay(self, index):
+        """Decode the replay of a game
+        Args:
+            index (int): Index of the game.
+        Returns:
+            Replay: The replay of the game.
+        """
+        return Replay.from_bytes(self.moves(index))
+
+    def summary_by_level(self):
+        """Aggregate the archived games per level
+        Returns:
+            dict: Maps each level name to a dict with the number of games, the mean and
+                maximum score, the mean snake length, the mean elapsed time in seconds and
+                the number of games per death cause.
+        """
+        records = self.records
+        summary = {}
+        for code, level in enumerate(REPLAY_LEVELS):
+            games = records[records["level"] == code]
+            if not len(games):
+                continue
+            causes = np.bincount(games["death_cause"], minlength=len(DEATH_CAUSES))
+            summary[level] = {
+                "games": len(games),
+                "mean_score": float(games["score"].mean()),
+                "max_score": int(games["score"].max()),
+                "mean_length": float(games["length"].mean()),
+                "mean_elapsed": float(games["elapsed"].mean()),
+                "death_causes": {cause: int(n) for cause, n in zip(DEATH_CAUSES, causes)},
+            }
+        return summary
@@ -0,0 +1,332 @@
+import time
+from array import array
+from collections import deque
+from heapq import heappush, heappop
+from utils.engine import CELL_EMPTY, CELL_FOOD
+from utils.globals import UP, DOWN, LEFT, RIGHT
+
+# Directions tried by the planner, by index
+AUTOPILOT_ACTIONS = (UP, DOWN, LEFT, RIGHT)
+OPPOSITE_ACTIONS = (1, 0, 3, 2)  # UP<->DOWN, LEFT<->RIGHT
+
+# Number of recent planning times kept for the metrics
+PLAN_TIME_WINDOW = 120
+
+# Neighbour of a cell whose move hits a wall
+NO_CELL = -1
+
+# With at most this many food blocks the planner uses A* instead of a plain breadth-first search
+ASTAR_MAX_TARGETS = 4
+
+class Autopilot:
+    def __init__(self, engine):
+        """Initialize a planner that steers the snake of an engine towards the nearest food
+        Every tick the planner searches a shortest path from the head over the engine's
+        occupancy grid: a breadth-first search, or A* guided by the distance to the closest
+        food when there are at most ASTAR_MAX_TARGETS food blocks, so that large boards with
+        little food are not flooded entirely. The neighbour table honours the level topology
+        (wrapping borders or walls), and body segments are only obstacles when
+        self_collision_game_over is set. A segment does not block a cell the head reaches
+        after the segment has left it, so the snake can follow its own tail.
+        All buffers are allocated once. Each search takes a new stamp and a cell counts as
+        visited only when its stamp matches, so the distance field is never cleared. The
+        body is tracked incrementally: each new head gets the next sequence number, from
+        which the number of moves until any segment leaves its cell follows in O(1).
+        Args:
+            engine (SnakeEngine): The engine whose snake is steered.
+        """
+        self.engine = engine
+        self.cols = engine.cols
+        self.rows = engine.rows
+        self.wrap = not engine.config["border_game_over"]
+        self.n_cells = engine.cols * engine.rows
+        self.neighbours = self._build_neighbours(engine.cols, engine.rows, engine.config["border_game_over"])
+        self.distance = array("i", [0]) * self.n_cells
+        self.first_action = array("b", [0]) * self.n_cells
+        self.visited = array("I", [0]) * self.n_cells
+        self.queue = array("i", [0]) * self.n_cells
+        self.stamp = 0
+        # Sequence number of the newest segment pushed into each cell, valid where the grid holds the snake
+        self.segment_seq = array("q", [0]) * self.n_cells
+        self._head_seq = 0
+        self._synced = None  # (ticks, head, length) of the engine at the last sync
+        self.plan_times = deque(maxlen=PLAN_TIME_WINDOW)
+        self.last_plan_time = 0.0
+
+    @staticmethod
+    def _build_neighbours(cols, rows, border_game_over):
+        """Precompute the cell reached from every cell in every direction
+        Args:
+            cols (int): Number of grid columns.
+            rows (int): Number of grid rows.
+            border_game_over (bool): True if leaving the board ends the game.
+        Returns:
+            array: Flat table where entry cell * 4 + action is the next cell, or NO_CELL
+                if the move hits a wall.
+        """
+        neighbours = array("i", [NO_CELL]) * (cols * rows * 4)
+        for y in range(rows):
+            for x in range(cols):
+                for action, (dx, dy) in enumerate(AUTOPILOT_ACTIONS):
+                    nx, ny = x + dx, y + dy
+                    if not (0 <= nx < cols and 0 <= ny < rows):
+                        if border_game_over:
+                            continue
+                        nx %= cols
+                        ny %= rows
+                    neighbours[(y * cols + x) * 4 + action] = ny * cols + nx
+        return neighbours
+
+    @property
+    def mean_plan_time(self):
+        """Get the mean planning time over the last PLAN_TIME_WINDOW ticks
+        Returns:
+            float: The mean planning time in seconds.
+        """
+        return sum(self.plan_times) / len(self.plan_times) if self.plan_times else 0.0
+
+    def next_direction(self):
+        """Choose the direction of the next move
+        The snake follows the shortest path to the nearest food. If no food is reachable it
+        heads for the largest area it can still reach, to buy time until a path opens.
+        Returns:
+            tuple: The direction (dx, dy) to queue, or None if every move is fatal.
+        """
+        start = time.perf_counter()
+        self._sync_body()
+        head = self.engine.cell_index(self.engine.snake[0])
+        if len(self.engine.food) <= ASTAR_MAX_TARGETS:
+            action = self._astar(head)
+        else:
+            action = self._search(head)
+        if action is None:
+            action = self._roomiest_action(head)
+        self.last_plan_time = time.perf_counter() - start
+        self.plan_times.append(self.last_plan_time)
+        return None if action is None else AUTOPILOT_ACTIONS[action]
+
+    def _sync_body(self):
+        """Bring the segment sequence numbers up to date with the engine
+        After a single move only the new head cell changes. Any other change (a new game,
+        a restored snapshot, skipped ticks) renumbers the whole body.
+        Returns:
+            None
+        """
+        engine = self.engine
+        snake = engine.snake
+        synced = self._synced
+        if (synced is not None and engine.ticks == synced[0] + 1 and len(snake) > 1
+                and snake[1] == synced[1] and len(snake) - synced[2] in (0, 2)):
+            self._head_seq += 1
+            self.segment_seq[engine.cell_index(snake[0])] = self._head_seq
+        elif synced is None or engine.ticks != synced[0] or snake[0] != synced[1] or len(snake) != synced[2]:
+            # Walk from the tail to the head so the newest segment of each cell wins
+            self._head_seq = 0
+            length = len(snake)
+            for i in range(length - 1, -1, -1):
+                self.segment_seq[engine.cell_index(snake[i])] = -i
+        self._synced = (engine.ticks, snake[0], len(snake))
+
+    def _leave_offset(self):
+        """Get the offset turning a sequence number into moves until the segment leaves
+        The segment at index i from the head leaves its cell after len - i moves, and its
+        index is the number of heads pushed after it.
+        Returns:
+            int: Offset to add to segment_seq.
+        """
+        return len(self.engine.snake) - self._head_seq
+
+    def _safe_actions(self, head):
+        """List the moves out of the head cell that are not immediately fatal
+        Args:
+            head (int): Cell of the head.
+        Returns:
+            list: Tuples (action, cell) of the allowed moves.
+        """
+        engine = self.engine
+        grid = engine.grid
+        solid = engine.config["self_collision_game_over"]
+        reverse = OPPOSITE_ACTIONS[AUTOPILOT_ACTIONS.index(engine.direction)] if engine.direction else None
+        moves = []
+        for action in range(4):
+            cell = self.neighbours[head * 4 + action]
+            if action == reverse or cell == NO_CELL:
+                continue
+            # The tail is still in its cell when the collision is checked
+            if solid and grid[cell] != CELL_EMPTY and grid[cell] != CELL_FOOD:
+                continue
+            moves.append((action, cell))
+        return moves
+
+    def _search(self, head):
+        """Breadth-first search from the head, filling the distance field
+        Args:
+            head (int): Cell of the head.
+        Returns:
+            int: The first action of a shortest path to the nearest food, or None if no
+                food is reachable.
+        """
+        grid = self.engine.grid
+        solid = self.engine.config["self_collision_game_over"]
+        neighbours, distance, first_action = self.neighbours, self.distance, self.first_action
+        visited, queue, segment_seq = self.visited, self.queue, self.segment_seq
+        offset = self._leave_offset()
+        self.stamp += 1
+        stamp = self.stamp
+        visited[head] = stamp
+        write = 0
+        for action, cell in self._safe_actions(head):
+            if grid[cell] == CELL_FOOD:
+                return action
+            visited[cell] = stamp
+            distance[cell] = 1
+            first_action[cell] = action
+            queue[write] = cell
+            write += 1
+
+        read = 0
+        while read < write:
+            cell = queue[read]
+            read += 1
+            arrival = distance[cell] + 1
+            base = cell * 4
+            for action in range(4):
+                nxt = neighbours[base + action]
+                if nxt == NO_CELL or visited[nxt] == stamp:
+                    continue
+                value = grid[nxt]
+                if value == CELL_FOOD:
+                    return first_action[cell]
+                if solid and value != CELL_EMPTY and segment_seq[nxt] + offset >= arrival:
+                    continue
+                visited[nxt] = stamp
+                distance[nxt] = arrival
+                first_action[nxt] = first_action[cell]
+                queue[write] = nxt
+                write += 1
+        return None
+
+    def _heuristic(self, cell, targets):
+        """Estimate the number of moves from a cell to the closest target
+        Args:
+            cell (int): Index of the cell.
+            targets (list): Tuples (x, y) of the target cells in grid coordinates.
+        Returns:
+            int: The Manhattan distance to the closest target, through the borders if they wrap.
+        """
+        cols, rows = self.cols, self.rows
+        x, y = cell % cols, cell // cols
+        best = cols + rows
+        for tx, ty in targets:
+            dx, dy = abs(x - tx), abs(y - ty)
+            if self.wrap:
+                dx, dy = min(dx, cols - dx), min(dy, rows - dy)
+            if dx + dy < best:
+                best = dx + dy
+        return best
+
+    def _astar(self, head):
+        """A* search from the head towards the closest food
+        Args:
+            head (int): Cell of the head.
+        Returns:
+            int: The first action of a shortest path to the nearest food, or None if no
+                food is reachable.
+        """
+        grid = self.engine.grid
+        solid = self.engine.config["self_collision_game_over"]
+        cols = self.cols
+        targets = [(cell % cols, cell // cols) for cell in self.engine.food.values()]
+        if not targets:
+            return None
+        neighbours, distance, first_action = self.neighbours, self.distance, self.first_action
+        visited, segment_seq = self.visited, self.segment_seq
+        heuristic = self._heuristic
+        offset = self._leave_offset()
+        # A cell is closed when visited holds the closing stamp and open with the stamp before it
+        self.stamp += 2
+        closed = self.stamp
+        opened = closed - 1
+        visited[head] = closed
+        heap = []
+        for action, cell in self._safe_actions(head):
+            visited[cell] = opened
+            distance[cell] = 1
+            first_action[cell] = action
+            heappush(heap, (1 + heuristic(cell, targets), 1, cell))
+
+        while heap:
+            _, moves, cell = heappop(heap)
+            if visited[cell] == closed or moves != distance[cell]:
+                continue
+            if grid[cell] == CELL_FOOD:
+                return first_action[cell]
+            visited[cell] = closed
+            arrival = moves + 1
+            base = cell * 4
+            for action in range(4):
+                nxt = neighbours[base + action]
+                if nxt == NO_CELL or visited[nxt] == closed:
+                    continue
+                if visited[nxt] == opened and distance[nxt] <= arrival:
+                    continue
+                value = grid[nxt]
+                if solid and value != CELL_EMPTY and value != CELL_FOOD and segment_seq[nxt] + offset >= arrival:
+                    continue
+                visited[nxt] = opened
+                distance[nxt] = arrival
+                first_action[nxt] = first_action[cell]
+                heappush(heap, (arrival + heuristic(nxt, targets), arrival, nxt))
+        return None
+
+    def _roomiest_action(self, head):
+        """Pick the allowed move that leads to the largest reachable area
+        Args:
+            head (int): Cell of the head.
+        Returns:
+            int: The chosen action, or None if every move is fatal.
+        """
+        best_action, best_room = None, -1
+        for action, cell in self._safe_actions(head):
+            room = self._count_reachable(cell, head)
+            if room > best_room:
+                best_action, best_room = action, room
+        return best_action
+
+    def _count_reachable(self, start, head):
+        """Count the cells reachable from a cell next to the head
+        Args:
+            start (int): Cell to flood from, one move away from the head.
+            head (int): Cell of the head, treated as a wall.
+        Returns:
+            int: Number of reachable cells, including start.
+        """
+        grid = self.engine.grid
+        solid = self.engine.config["self_collision_game_over"]
+        neighbours, distance, visited, queue, segment_seq = (self.neighbours, self.distance, self.visited,
+                                                            self.queue, self.segment_seq)
+        offset = self._leave_offset()
+        self.stamp += 1
+        stamp = self.stamp
+        visited[head] = stamp
+        visited[start] = stamp
+        distance[start] = 1
+        queue[0] = start
+        read, write = 0, 1
+        while read < write:
+            cell = queue[read]
+            read += 1
+            arrival = distance[cell] + 1
+            base = cell * 4
+            for action in range(4):
+                nxt = neighbours[base + action]
+                if nxt == NO_CELL or visited[nxt] == stamp:
+                    continue
+                value = grid[nxt]
+                if solid and value != CELL_EMPTY and value != CELL_FOOD and segment_seq[nxt] + offset >= arrival:
+                    continue
+                visited[nxt] = stamp
+                distance[nxt] = arrival
+                queue[write] = nxt
+                write += 1
+        return write
@@ -0,0 +1,205 @@
+import numpy as np
+from config import WIDTH, HEIGHT, SIDE, levels_config
+from utils.globals import UP, DOWN, LEFT, RIGHT
+
+# Action indices understood by BatchSnakeEnv.step
+ACTIONS = (UP, DOWN, LEFT, RIGHT)
+ACTION_DX = np.array([d[0] for d in ACTIONS], dtype=np.int32)
+ACTION_DY = np.array([d[1] for d in ACTIONS], dtype=np.int32)
+OPPOSITE_ACTION = np.array([1, 0, 3, 2], dtype=np.int8)  # UP<->DOWN, LEFT<->RIGHT
+
+# Direction of a game whose snake has not moved yet, so any first action is accepted
+NO_DIRECTION = -1
+
+# Random food candidates drawn per game before falling back to an exact search
+SPAWN_ATTEMPTS = 32
+
+class BatchSnakeEnv:
+    def __init__(self, n_envs, levels="baby", cols=None, rows=None, seed=None):
+        """Initialize N independent games stored as NumPy arrays
+        This class applies the rules of SnakeEngine to many boards at once. Heads, ring-buffer
+        bodies, occupancy grids and food masks are kept in arrays so that one call to step
+        advances every game with a handful of vectorized operations. Finished games are
+        reset automatically.
+        Args:
+            n_envs (int): Number of games to run.
+            levels (str or list, optional): Level name from levels_config for all games, or
+                one level name per game. Defaults to "baby".
+            cols (int, optional): Number of grid columns, all of them able to hold food.
+                Defaults to the board of SnakeEngine for the window: the columns are
+                rounded up to include the partial last column, which the snake can enter
+                but food never spawns on.
+            rows (int, optional): Number of grid rows, as cols. Defaults to the rows of
+                SnakeEngine for the window, with the same rule for the partial last row.
+            seed (int, optional): Seed for food placement. Defaults to None.
+        """
+        if isinstance(levels, str):
+            levels = [levels] * n_envs
+        if len(levels) != n_envs:
+            raise ValueError(f"Expected {n_envs} levels, got {len(levels)}.")
+
+        self.n_envs = n_envs
+        # Food spawns on fully visible cells only, as in SnakeEngine
+        self.food_cols = WIDTH // SIDE if cols is None else cols
+        self.food_rows = HEIGHT // SIDE if rows is None else rows
+        self.cols = -(-WIDTH // SIDE) if cols is None else cols
+        self.rows = -(-HEIGHT // SIDE) if rows is None else rows
+        self.cells = self.cols * self.rows
+        self.rng = np.random.default_rng(seed)
+
+        # Per game rules
+        self.border_game_over = np.array([levels_config[l]["border_game_over"] for l in levels], dtype=bool)
+        self.self_collision_game_over = np.array([levels_config[l]["self_collision_game_over"] for l in levels], dtype=bool)
+        self.n_food_blocks = np.array([levels_config[l]["n_blocks"] for l in levels], dtype=np.int32)
+        self.total_score_to_win = np.array([levels_config[l]["total_score_to_win"] for l in levels], dtype=np.int32)
+
+        # The snake grows by two segments per food, so this bounds its length until the win
+        self.capacity = 2 * int(self.total_score_to_win.max()) + 3
+
+        self.head_x = np.zeros(n_envs, dtype=np.int32)
+        self.head_y = np.zeros(n_envs, dtype=np.int32)
+        self.direction = np.zeros(n_envs, dtype=np.int8)
+        self.body = np.zeros((n_envs, self.capacity), dtype=np.int32)  # Ring buffers of cell indices
+        self.head_ptr = np.zeros(n_envs, dtype=np.int64)
+        self.length = np.zeros(n_envs, dtype=np.int64)
+        self.occupancy = np.zeros((n_envs, self.cells), dtype=np.uint8)  # Body segments per cell
+        self.food = np.zeros((n_envs, self.cells), dtype=bool)
+        self.score = np.zeros(n_envs, dtype=np.int32)
+        self.final_score = np.zeros(n_envs, dtype=np.int32)
+        self.won = np.zeros(n_envs, dtype=bool)
+
+        # Flat views and row offsets used to index one cell per game without 2D fancy indexing
+        self._occupancy_flat = self.occupancy.reshape(-1)
+        self._food_flat = self.food.reshape(-1)
+        self._body_flat = self.body.reshape(-1)
+        self._cell_base = np.arange(n_envs, dtype=np.int64) * self.cells
+        self._body_base = np.arange(n_envs, dtype=np.int64) * self.capacity
+        self._food_area = np.zeros((self.rows, self.cols), dtype=bool)
+        self._food_area[:self.food_rows, :self.food_cols] = True
+        self._food_area = self._food_area.reshape(-1)
+
+        self.reset()
+
+    def reset(self, indices=None):
+        """Start new games on the selected boards
+        Args:
+            indices (array, optional): Indices of the games to reset. Defaults to all games.
+        Returns:
+            None
+        """
+        if indices is None:
+            indices = np.arange(self.n_envs)
+        indices = np.asarray(indices, dtype=np.int64)
+        if indices.size == 0:
+            return
+
+        # Centered on the cells food can use, as SnakeEngine centers on the whole cells
+        center_x, center_y = self.food_cols // 2, self.food_rows // 2
+        self.occupancy[indices] = 0
+        self.food[indices] = False
+        self.head_x[indices] = center_x
+        self.head_y[indices] = center_y
+        self.direction[indices] = NO_DIRECTION
+        self.body[indices, 0] = center_y * self.cols + center_x - 1  # Tail
+        self.body[indices, 1] = center_y * self.cols + center_x      # Head
+        self.head_ptr[indices] = 1
+        self.length[indices] = 2
+        self._occupancy_flat[self._cell_base[indices] + self.body[indices, 0]] += 1
+        self._occupancy_flat[self._cell_base[indices] + self.body[indices, 1]] += 1
+        self.score[indices] = 0
+
+        for k in range(int(self.n_food_blocks[indices].max())):
+            self._spawn_food(indices[self.n_food_blocks[indices] > k])
+
+    def step(self, actions):
+        """Advance every game by one move
+        Reversing into the current direction is ignored, as DirectionManager does; the
+        first move of a game may go any way. Games that end during the move are reset
+        before returning; their final score is kept
+        in final_score and won tells whether they reached total_score_to_win.
+        Args:
+            actions (array): One action index per game (0=UP, 1=DOWN, 2=LEFT, 3=RIGHT).
+        Returns:
+            tuple: The points scored during the move and the done flag of each game.
+        """
+        actions = np.asarray(actions, dtype=np.int8)
+        self.direction = np.where(OPPOSITE_ACTION[actions] == self.direction, self.direction, actions)
+
+        new_x = self.head_x + ACTION_DX[self.direction]
+        new_y = self.head_y + ACTION_DY[self.direction]
+        outside = (new_x < 0) | (new_x >= self.cols) | (new_y < 0) | (new_y >= self.rows)
+        new_x %= self.cols  # Border wrapping for games without border_game_over
+        new_y %= self.rows
+        new_cell = new_y * self.cols + new_x
+        new_cell_flat = self._cell_base + new_cell
+
+        # Current tail, the oldest of the length segments ending at head_ptr
+        tail_slot = (self.head_ptr - self.length + 1) % self.capacity
+        tail_cell = self._body_flat[self._body_base + tail_slot]
+
+        dead = outside & self.border_game_over
+        # As in SnakeEngine, a two-segment snake may move into its tail, which leaves the cell
+        into_tail = (self.length == 2) & (new_cell == tail_cell)
+        dead |= self.self_collision_game_over & (self._occupancy_flat[new_cell_flat] > 0) & ~into_tail
+        moving = np.flatnonzero(~dead)
+
+        # Push the new head
+        self.head_x[moving] = new_x[moving]
+        self.head_y[moving] = new_y[moving]
+        self.head_ptr[moving] = (self.head_ptr[moving] + 1) % self.capacity
+        self._body_flat[self._body_base[moving] + self.head_ptr[moving]] = new_cell[moving]
+        self._occupancy_flat[new_cell_flat[moving]] += 1
+
+        # Eat the food under the head
+        ate = self._food_flat[new_cell_flat[moving]]
+        eaters = moving[ate]
+        movers = moving[~ate]
+        self._food_flat[new_cell_flat[eaters]] = False
+        self.score[eaters] += 1
+
+        # Snakes that did not eat drop their tail
+        self._occupancy_flat[self._cell_base[movers] + tail_cell[movers]] -= 1
+
+        # Snakes that ate keep their tail and grow a copy of it behind
+        grow_slot = (tail_slot[eaters] - 1) % self.capacity
+        self._body_flat[self._body_base[eaters] + grow_slot] = tail_cell[eaters]
+        self._occupancy_flat[self._cell_base[eaters] + tail_cell[eaters]] += 1
+        self.length[eaters] += 2
+        self._spawn_food(eaters)
+
+        self.won = self.score >= self.total_score_to_win
+        dones = dead | self.won
+        rewards = np.zeros(self.n_envs, dtype=np.float32)
+        rewards[eaters] = 1.0
+
+        finished = np.flatnonzero(dones)
+        if finished.size:
+            self.final_score[finished] = self.score[finished]
+            self.reset(finished)
+        return rewards, dones
+
+    def _spawn_food(self, indices):
+        """Place one new food block on each selected board
+        Random cells are drawn for all boards at once and redrawn where they land on the
+        snake or on food. Boards still unlucky after SPAWN_ATTEMPTS draws (nearly full
+        boards) pick among their free cells exactly.
+        Args:
+            indices (array): Indices of the games that need a new food block.
+        Returns:
+            None
+        """
+        pending = np.asarray(indices, dtype=np.int64)
+        for _ in range(SPAWN_ATTEMPTS):
+            if pending.size == 0:
+                return
+            x = self.rng.integers(0, self.food_cols, size=pending.size)
+            y = self.rng.integers(0, self.food_rows, size=pending.size)
+            cells = self._cell_base[pending] + y * self.cols + x
+            free = (self._occupancy_flat[cells] == 0) & ~self._food_flat[cells]
+            self._food_flat[cells[free]] = True
+            pending = pending[~free]
+
+        for index in pending:
+            free_cells = np.flatnonzero((self.occupancy[index] == 0) & ~self.food[index] & self._food_area)
+            if free_cells.size:
+                self.food[index, self.rng.choice(free_cells)] = True
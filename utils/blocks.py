@@ -1,5 +1,5 @@
 import pygame
-from utils.textures import create_gradient_dot_texture, create_hen_texture, create_apple_texture, create_rabbit_texture
+from utils.textures import get_texture
 from config import SIDE
 from config import game_config
 
@@ -42,13 +42,15 @@ class Block:
             None
         """
         if not self.texture:
-            self.texture = create_gradient_dot_texture(self.color)
+            self.texture = get_texture("gradient_dot", self.color, SIDE)
 
-    def draw(self, display):
+    def draw(self, display, pos=None):
         """
         Draw the block on the display.
         Args:
             display (pygame.Surface): The game display surface.
+            pos (tuple, optional): Position (x, y) to draw at instead of the block's position,
+                for views that scroll over the board. Defaults to None.
         Returns:
             None
         """
@@ -57,25 +59,32 @@ class Block:
             if not self.texture:  # Fallback to a default texture
                 self.texture = pygame.Surface((SIDE, SIDE))
                 self.texture.fill(self.color)
-        x, y = self.pos
+        x, y = self.pos if pos is None else pos
         display.blit(self.texture, (x, y))
 
 class HenBlock(Block):
-    def __init__(self, pos):
+    def __init__(self, pos, level=None):
+        """
+        Initialize a food block whose texture depends on the level.
+        Args:
+            pos (tuple): Position of the block (x, y).
+            level (str, optional): Level deciding the texture. Defaults to the level in game_config.
+        """
         super().__init__(pos, (220, 220, 60))  # Default block color
+        self.level = level
 
     def update_texture(self):
         """
-        Override update_texture in HenBlock to use create_hen_texture.
+        Override update_texture in HenBlock to use the shared hen, rabbit or apple texture.
         """
         if not self.texture:
-            level = game_config.get("level", 1)
+            level = self.level or game_config.get("level", 1)
             if level == "medium":
-                self.texture = create_hen_texture(SIDE)
+                self.texture = get_texture("hen", size=SIDE)
             elif level == "hard":
-                self.texture = create_rabbit_texture(SIDE)
+                self.texture = get_texture("rabbit", size=SIDE)
             else:
-                self.texture = create_apple_texture(SIDE)
+                self.texture = get_texture("apple", size=SIDE)
 
 class AppleBlock(Block):
     def __init__(self, pos):
@@ -83,10 +92,10 @@ class AppleBlock(Block):
 
     def update_texture(self):
         """
-        Override update_texture in AppleBlock to use create_apple_texture.
+        Override update_texture in AppleBlock to use the shared apple texture.
         """
         if not self.texture:
-            self.texture = create_apple_texture(SIDE)
+            self.texture = get_texture("apple", size=SIDE)
 
 class RabbitBlock(Block):
     def __init__(self, pos):
@@ -94,7 +103,7 @@ class RabbitBlock(Block):
 
     def update_texture(self):
         """
-        Override update_texture in RabbitBlock to use create_rabbit_texture.
+        Override update_texture in RabbitBlock to use the shared rabbit texture.
         """
         if not self.texture:
-            self.texture = create_rabbit_texture(SIDE)
\ No newline at end of file
+            self.texture = get_texture("rabbit", size=SIDE)
\ No newline at end of file
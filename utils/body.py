@@ -0,0 +1,105 @@
+class SnakeBody:
+    """Ring buffer of snake segment positions, head first
+
+    Pushing a new head, pushing or popping the tail and reading any segment by index are
+    all O(1), so the cost of a move does not grow with the length of the snake. The
+    buffer doubles its capacity when full.
+    """
+    __slots__ = ("_items", "_start", "_len")
+
+    def __init__(self, positions=(), capacity=16):
+        """Initialize the body with the given segments
+        Args:
+            positions (iterable, optional): Segment positions (x, y), head first. Defaults to ().
+            capacity (int, optional): Initial number of slots in the buffer. Defaults to 16.
+        """
+        positions = list(positions)
+        capacity = max(capacity, len(positions), 1)
+        self._items = positions + [None] * (capacity - len(positions))
+        self._start = 0
+        self._len = len(positions)
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, index):
+        """Get a segment by index, with index 0 the head and -1 the tail
+        Args:
+            index (int): Index of the segment.
+        Returns:
+            tuple: Position (x, y) of the segment.
+        """
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("snake body index out of range")
+        items = self._items
+        return items[(self._start + index) % len(items)]
+
+    def __iter__(self):
+        items = self._items
+        capacity = len(items)
+        start = self._start
+        for i in range(self._len):
+            yield items[(start + i) % capacity]
+
+    def __repr__(self):
+        return f"SnakeBody({list(self)!r})"
+
+    def copy(self):
+        """Copy the body
+        Returns:
+            SnakeBody: An independent body with the same segments.
+        """
+        clone = SnakeBody.__new__(SnakeBody)
+        clone._items = self._items.copy()
+        clone._start = self._start
+        clone._len = self._len
+        return clone
+
+    def appendleft(self, pos):
+        """Push a new head segment
+        Args:
+            pos (tuple): Position (x, y) of the new head.
+        Returns:
+            None
+        """
+        if self._len == len(self._items):
+            self._grow()
+        self._start = (self._start - 1) % len(self._items)
+        self._items[self._start] = pos
+        self._len += 1
+
+    def append(self, pos):
+        """Push a new tail segment
+        Args:
+            pos (tuple): Position (x, y) of the new tail.
+        Returns:
+            None
+        """
+        if self._len == len(self._items):
+            self._grow()
+        self._items[(self._start + self._len) % len(self._items)] = pos
+        self._len += 1
+
+    def pop(self):
+        """Remove the tail segment
+        Returns:
+            tuple: Position (x, y) of the removed tail.
+        """
+        if not self._len:
+            raise IndexError("pop from empty snake body")
+        self._len -= 1
+        index = (self._start + self._len) % len(self._items)
+        pos = self._items[index]
+        self._items[index] = None
+        return pos
+
+    def _grow(self):
+        """Double the capacity, unrolling the segments to the start of the buffer
+        Returns:
+            None
+        """
+        items = list(self)
+        self._items = items + [None] * max(len(items), 1)
+        self._start = 0
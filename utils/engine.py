@@ -0,0 +1,336 @@
+import random
+from collections import namedtuple
+from config import WIDTH, HEIGHT, SIDE, game_config
+from utils.body import SnakeBody
+from utils.globals import RIGHT
+from utils.matrix import FreeCells
+
+# Events emitted by SnakeEngine.step as (name, payload) tuples
+EVENT_MOVE = "move"            # payload: (new_head, vacated_tail or None)
+EVENT_EAT = "eat"              # payload: position of the eaten food
+EVENT_SPAWN = "spawn"          # payload: position of the new food
+EVENT_GAME_OVER = "game_over"  # payload: cause of death ("border" or "self")
+EVENT_WIN = "win"              # payload: final score
+
+# Values stored in SnakeEngine.grid. Any other value is the number of snake segments in the cell,
+# up to MAX_CELL_SEGMENTS.
+CELL_EMPTY = 0
+CELL_FOOD = 255
+
+# Largest segment count stored in a grid cell, so a stack of segments never reads as food.
+# Segments stacked beyond it are counted in SnakeEngine.overflow.
+MAX_CELL_SEGMENTS = CELL_FOOD - 1
+
+# Snapshot of the game returned by SnakeEngine.step. The snake and food fields are
+# the engine's live containers, not copies, so stepping stays cheap.
+GameState = namedtuple("GameState", ["snake", "food", "score", "direction", "game_over", "game_win"])
+
+class SnakeEngine:
+    def __init__(self, config=None, width=WIDTH, height=HEIGHT, side=SIDE, seed=None):
+        """Initialize a headless game with the given rules and board size
+        This class owns the snake, the food, the score and the level rules. It has no
+        display, clock or event-queue dependency, so it can be stepped as fast as Python
+        allows by bots, tests and the pygame front-end alike.
+        Args:
+            config (dict, optional): Level rules with the same keys as game_config.
+                Defaults to a copy of the current game_config.
+            width (int, optional): Width of the board in pixels. Defaults to WIDTH.
+            height (int, optional): Height of the board in pixels. Defaults to HEIGHT.
+            side (int, optional): Size of each grid cell in pixels. Defaults to SIDE.
+            seed (int, optional): Seed of the game's random generator. Games with the same
+                seed, rules and actions play out identically. Defaults to a random seed.
+        """
+        self.config = dict(game_config if config is None else config)
+        self.width = width
+        self.height = height
+        self.side = side
+        # The snake may enter a last partial column or row, so the grid rounds up
+        self.cols = -(-width // side)
+        self.rows = -(-height // side)
+        self.reset(random.randrange(2 ** 32) if seed is None else seed)
+
+    def reset(self, seed=None):
+        """Start a new game with the snake centered and fresh food on the board
+        Args:
+            seed (int, optional): Reseed the game's random generator. Defaults to None, which
+                keeps drawing from the current generator.
+        Returns:
+            GameState: The state of the new game.
+        """
+        if seed is not None:
+            self.seed = seed
+            self.rng = random.Random(seed)
+        center_x = (self.width // self.side // 2) * self.side
+        center_y = (self.height // self.side // 2) * self.side
+        self.snake = SnakeBody([(center_x, center_y), (center_x - self.side, center_y)])  # Start with head and tail
+        self.direction = None
+        self.food = {}  # Food position -> grid cell, in spawn order
+        self.grid = bytearray(self.cols * self.rows)  # Occupancy of every cell, see CELL_EMPTY/CELL_FOOD
+        self.overflow = {}  # Cell -> segments stacked beyond MAX_CELL_SEGMENTS, when self-collision is allowed
+        # Food only spawns on fully visible cells, so the partial last column and row are left out
+        self.free = FreeCells(self.cols * self.rows, (y * self.cols + x
+                                                      for y in range(self.height // self.side)
+                                                      for x in range(self.width // self.side)))
+        for pos in self.snake:
+            self._occupy(self.cell_index(pos))
+        self.score = 0
+        self.ticks = 0
+        self.game_over = False
+        self.game_win = False
+        self.death_cause = None
+        for _ in range(self.config["n_food_blocks"]):
+            if self.spawn_food() is None:
+                break
+        return self.get_state()
+
+    def get_state(self):
+        """Get the current state of the game
+        Returns:
+            GameState: The current state of the game.
+        """
+        return GameState(self.snake, self.food, self.score, self.direction, self.game_over, self.game_win)
+
+    def snapshot(self):
+        """Capture the full state of the game, including its random generator
+        Returns:
+            tuple: An opaque snapshot to pass to restore.
+        """
+        return (tuple(self.snake), dict(self.food), bytes(self.grid), dict(self.overflow), self.free.copy(),
+                self.score, self.direction, self.ticks, self.game_over, self.game_win, self.death_cause,
+                self.rng.getstate())
+
+    def clone(self, rng=None):
+        """Copy the game into an independent engine
+        Cheaper than snapshot followed by restore on a new engine: the containers are
+        copied as flat lists and buffers and the rules are shared.
+        Args:
+            rng (random.Random, optional): Random generator for the clone's food placement.
+                Defaults to a copy of this engine's generator, so both games play out
+                identically. Passing a generator skips copying its state, for searches that
+                do not need to reproduce the game exactly.
+        Returns:
+            SnakeEngine: The copy of the game.
+        """
+        clone = SnakeEngine.__new__(SnakeEngine)
+        clone.__dict__.update(self.__dict__)
+        clone.snake = self.snake.copy()
+        clone.food = self.food.copy()
+        clone.grid = self.grid[:]
+        clone.overflow = self.overflow.copy()
+        clone.free = self.free.copy()
+        if rng is None:
+            rng = random.Random()
+            rng.setstate(self.rng.getstate())
+        clone.rng = rng
+        return clone
+
+    def restore(self, snapshot):
+        """Return the game to a state captured by snapshot
+        The same snapshot can be restored any number of times.
+        Args:
+            snapshot (tuple): A snapshot returned by snapshot on an engine with the same
+                rules and board size.
+        Returns:
+            GameState: The restored state of the game.
+        """
+        (snake, food, grid, overflow, free, self.score, self.direction, self.ticks,
+         self.game_over, self.game_win, self.death_cause, rng_state) = snapshot
+        self.snake = SnakeBody(snake, capacity=2 * len(snake))
+        self.food = dict(food)
+        self.grid = bytearray(grid)
+        self.overflow = dict(overflow)
+        self.free = free.copy()
+        self.rng.setstate(rng_state)
+        return self.get_state()
+
+    def cell_index(self, pos):
+        """Convert a pixel position into its index in the occupancy grid
+        Args:
+            pos (tuple): Position (x, y) aligned to the grid.
+        Returns:
+            int: Index of the cell in grid.
+        """
+        return pos[1] // self.side * self.cols + pos[0] // self.side
+
+    def spawn_food(self):
+        """Place a new food block in a random empty cell
+        Returns:
+            tuple: Position (x, y) of the new food, or None if the board is full.
+        """
+        cell = self.free.sample(self.rng)
+        if cell is None:
+            return None
+        pos = (cell % self.cols * self.side, cell // self.cols * self.side)
+        self.free.discard(cell)
+        self.food[pos] = cell
+        self.grid[cell] = CELL_FOOD
+        return pos
+
+    def next_head(self, direction):
+        """Compute where the head lands after one move in the given direction
+        Borders either wrap around or end the game depending on border_game_over.
+        Args:
+            direction (tuple): The direction vector (dx, dy) of the move.
+        Returns:
+            tuple: The new head position (x, y), or None if the snake hits a border.
+        """
+        head = self.snake[0]
+        new_head = (
+            (head[0] + direction[0] * self.side) // self.side * self.side,
+            (head[1] + direction[1] * self.side) // self.side * self.side
+        )
+        if new_head[0] < 0 or new_head[0] >= self.width or new_head[1] < 0 or new_head[1] >= self.height:
+            if self.config["border_game_over"]:
+                return None
+            # Handle border wrapping logic, landing on the last grid-aligned column or row
+            if new_head[0] < 0:  # Left border
+                new_head = ((self.cols - 1) * self.side, new_head[1])
+            elif new_head[0] >= self.width:  # Right border
+                new_head = (0, new_head[1])
+            elif new_head[1] < 0:  # Top border
+                new_head = (new_head[0], (self.rows - 1) * self.side)
+            else:  # Bottom border
+                new_head = (new_head[0], 0)
+        return new_head
+
+    def step(self, action=None):
+        """Advance the game by one move
+        This function moves the snake one cell, checks collisions with the borders and with
+        itself, lets the snake eat and grow, spawns new food and checks the win condition.
+        Args:
+            action (tuple, optional): The direction (dx, dy) to move in. None keeps the
+                current direction (RIGHT if the snake has not moved yet).
+        Returns:
+            tuple: The GameState after the move and the list of (event, payload) tuples
+                describing what happened during the move.
+        """
+        events = []
+        if self.game_over:
+            return self.get_state(), events
+
+        direction = action or self.direction or RIGHT
+        self.direction = direction
+        self.ticks += 1
+        snake = self.snake
+        new_head = self.next_head(direction)
+
+        # Ensure the initial movement does not trigger a collision
+        if new_head is not None and len(snake) == 2 and new_head == snake[1]:
+            self._push_head(new_head)
+            events.append((EVENT_MOVE, (new_head, self._pop_tail())))
+            return self.get_state(), events
+
+        if new_head is None:
+            self._end_game(events, "border")
+            return self.get_state(), events
+
+        # Check for collision with itself. The new head never lands on the current head,
+        # so any snake segment in the target cell is one of snake[1:].
+        if self.config["self_collision_game_over"] and self.grid[self.cell_index(new_head)] not in (CELL_EMPTY, CELL_FOOD):
+            self._end_game(events, "self")
+            return self.get_state(), events
+
+        ate = self.update_blocks(new_head, events)
+        self._push_head(new_head)
+        if ate:
+            # Grow the snake by adding a new segment at the tail position
+            self._push_tail(snake[-1])
+            new_food = self.spawn_food()
+            if new_food:
+                events.append((EVENT_SPAWN, new_food))
+            events.append((EVENT_MOVE, (new_head, None)))
+        else:
+            events.append((EVENT_MOVE, (new_head, self._pop_tail())))
+
+        if self.score >= self.config["total_score_to_win"]:
+            self.game_over = True
+            self.game_win = True
+            events.append((EVENT_WIN, self.score))
+        return self.get_state(), events
+
+    def update_blocks(self, new_head, events):
+        """Let the snake eat the food in the cell it is moving into
+        If the new head lands on a food block, the food is removed and the score increases.
+        The caller grows the snake and spawns the replacement food.
+        Args:
+            new_head (tuple): The position (x, y) the head is moving into.
+            events (list): The event list of the current move, extended in place.
+        Returns:
+            bool: True if the snake eats during this move, False otherwise.
+        """
+        cell = self.food.pop(new_head, None)
+        if cell is None:
+            return False
+
+        self.grid[cell] = CELL_EMPTY
+        self.score += 1
+        events.append((EVENT_EAT, new_head))
+        return True
+
+    def _push_head(self, pos):
+        """Insert a new head segment and mark its cell as occupied
+        Args:
+            pos (tuple): Position (x, y) of the new head.
+        Returns:
+            None
+        """
+        self.snake.appendleft(pos)
+        self._occupy(self.cell_index(pos))
+
+    def _push_tail(self, pos):
+        """Append a tail segment and mark its cell as occupied
+        Args:
+            pos (tuple): Position (x, y) of the new tail.
+        Returns:
+            None
+        """
+        self.snake.append(pos)
+        self._occupy(self.cell_index(pos))
+
+    def _pop_tail(self):
+        """Remove the tail segment and release its cell
+        Returns:
+            tuple: Position (x, y) of the removed tail.
+        """
+        pos = self.snake.pop()
+        cell = self.cell_index(pos)
+        extra = self.overflow.get(cell)
+        if extra:
+            if extra == 1:
+                del self.overflow[cell]
+            else:
+                self.overflow[cell] = extra - 1
+            return pos
+        self.grid[cell] -= 1
+        if self.grid[cell] == CELL_EMPTY:
+            self.free.add(cell)
+        return pos
+
+    def _occupy(self, cell):
+        """Add a snake segment to a cell, taking it out of the free cells
+        The grid count stops at MAX_CELL_SEGMENTS and further segments are counted in
+        overflow, so the count never reaches CELL_FOOD or the byte limit.
+        Args:
+            cell (int): Index of the cell.
+        Returns:
+            None
+        """
+        count = self.grid[cell]
+        if count == CELL_EMPTY:
+            self.free.discard(cell)
+        elif count == MAX_CELL_SEGMENTS:
+            self.overflow[cell] = self.overflow.get(cell, 0) + 1
+            return
+        self.grid[cell] += 1
+
+    def _end_game(self, events, cause):
+        """Mark the game as lost and record the cause
+        Args:
+            events (list): The event list of the current move, extended in place.
+            cause (str): Why the game ended ("border" or "self").
+        Returns:
+            None
+        """
+        self.game_over = True
+        self.death_cause = cause
+        events.append((EVENT_GAME_OVER, cause))
@@ -0,0 +1,219 @@
+import numpy as np
+from config import WIDTH, HEIGHT, SIDE, levels_config
+from utils.engine import SnakeEngine, CELL_EMPTY, CELL_FOOD, EVENT_SPAWN
+from utils.globals import UP, DOWN, LEFT, RIGHT
+from utils.utils import is_opposite_direction, get_tail_direction, get_direction_angle
+
+# Actions understood by SnakeEnv.step, by index
+ACTIONS = (UP, DOWN, LEFT, RIGHT)
+
+# Observation channels of the grid mode
+GRID_CHANNELS = ("head", "body", "food")
+
+# Tiles of the pixel mode, by index: dirt, body and food, then the head and the tail
+# rotated by each angle of TILE_ANGLES
+TILE_DIRT, TILE_BODY, TILE_FOOD = 0, 1, 2
+TILE_ANGLES = (0, 90, 180, 270)
+TILE_HEAD = 3
+TILE_TAIL = TILE_HEAD + len(TILE_ANGLES)
+
+# Tile of each occupancy grid value: empty cells show dirt, food shows food and any
+# segment count shows body
+GRID_TILES = np.full(256, TILE_BODY, dtype=np.uint8)
+GRID_TILES[CELL_EMPTY] = TILE_DIRT
+GRID_TILES[CELL_FOOD] = TILE_FOOD
+
+# Tile arrays of the pixel mode by level, built once from the game's textures
+PIXEL_TILES = {}
+
+class SnakeEnv:
+    def __init__(self, level="baby", observation="grid", seed=None, max_ticks=None):
+        """Initialize a reset/step environment around SnakeEngine
+        The action space is the index of a direction in ACTIONS. Turning back into the
+        current direction is ignored, as DirectionManager does for players.
+        Two observation modes are available. "grid" returns a uint8 array of shape
+        (3, rows, cols) with the head, body and food channels, built straight from the
+        engine's occupancy grid without any surface work. "pixels" returns an RGB array of
+        shape (HEIGHT, WIDTH, 3) showing the game's textures, assembled with NumPy from
+        per-cell tiles so that a step only repaints the cells the move touched.
+        Args:
+            level (str, optional): Level name from levels_config. Defaults to "baby".
+            observation (str, optional): "grid" or "pixels". Defaults to "grid".
+            seed (int, optional): Seed of the first game. Defaults to a random seed.
+            max_ticks (int, optional): Truncate games after this many moves. Defaults to None.
+        """
+        if observation not in ("grid", "pixels"):
+            raise ValueError(f"Invalid observation mode: {observation}. Choose from 'grid', 'pixels'.")
+        config = levels_config[level]
+        self.level = level
+        self.observation = observation
+        self.max_ticks = max_ticks
+        self.engine = SnakeEngine({
+            "level": level,
+            "n_food_blocks": config["n_blocks"],
+            "total_score_to_win": config["total_score_to_win"],
+            "border_game_over": config["border_game_over"],
+            "self_collision_game_over": config["self_collision_game_over"],
+        }, WIDTH, HEIGHT, SIDE, seed)
+        self.n_actions = len(ACTIONS)
+        self.observation_shape = (len(GRID_CHANNELS), self.engine.rows, self.engine.cols) if observation == "grid" else (HEIGHT, WIDTH, 3)
+        self._tiles = None
+        self._frame = None
+        if observation == "pixels":
+            self._reset_pixels()
+
+    def reset(self, seed=None):
+        """Start a new game
+        Args:
+            seed (int, optional): Seed of the new game. Defaults to None, which keeps
+                drawing from the environment's random generator.
+        Returns:
+            tuple: The first observation and the info dict.
+        """
+        self.engine.reset(seed)
+        if self.observation == "pixels":
+            self._reset_pixels()
+        return self._observe(), self._info()
+
+    def step(self, action):
+        """Move the snake once
+        Args:
+            action (int): Index of the direction in ACTIONS.
+        Returns:
+            tuple: The observation, the reward (points scored during the move), whether the
+                game ended, whether it was truncated by max_ticks, and the info dict.
+        """
+        engine = self.engine
+        direction = ACTIONS[action]
+        if engine.direction is not None and is_opposite_direction(engine.direction, direction):
+            direction = engine.direction
+        score = engine.score
+        if self.observation == "pixels":
+            # The old head turns into body and the old tail may leave its cell
+            touched = [engine.snake[0], engine.snake[-1]]
+        _, events = engine.step(direction)
+        if self.observation == "pixels":
+            snake = engine.snake
+            touched += (snake[0], snake[1], snake[-1], snake[-2])
+            touched += (payload for event, payload in events if event == EVENT_SPAWN)
+            for pos in set(touched):
+                self._paint_cell(pos)
+        truncated = self.max_ticks is not None and engine.ticks >= self.max_ticks and not engine.game_over
+        return self._observe(), float(engine.score - score), engine.game_over, truncated, self._info()
+
+    def _info(self):
+        """Build the info dict returned by reset and step
+        Returns:
+            dict: The score, the number of moves and the cause of death, if any.
+        """
+        return {"score": self.engine.score, "ticks": self.engine.ticks, "death_cause": self.engine.death_cause}
+
+    def _observe(self):
+        """Build the observation of the current state
+        Returns:
+            numpy.ndarray: The grid or pixel observation.
+        """
+        if self.observation == "grid":
+            return self._observe_grid()
+        return self._observe_pixels()
+
+    def _observe_grid(self):
+        """Build the head/body/food channels from the engine's occupancy grid
+        Returns:
+            numpy.ndarray: A uint8 array of shape (3, rows, cols).
+        """
+        engine = self.engine
+        grid = np.frombuffer(engine.grid, dtype=np.uint8).reshape(engine.rows, engine.cols)
+        obs = np.empty(self.observation_shape, dtype=np.uint8)
+        obs[0] = 0
+        head = engine.snake[0]
+        obs[0, head[1] // engine.side, head[0] // engine.side] = 1
+        np.not_equal(grid, CELL_EMPTY, out=obs[1].view(bool))
+        obs[1] &= grid != CELL_FOOD
+        np.equal(grid, CELL_FOOD, out=obs[2].view(bool))
+        return obs
+
+    def _reset_pixels(self):
+        """Paint the whole frame of a new game
+        The frame covers the partial last column and row of the board in full, and the
+        observation is cropped to the window.
+        Returns:
+            None
+        """
+        if self._tiles is None:
+            self._tiles = get_pixel_tiles(self.level)
+        engine = self.engine
+        side = engine.side
+        cells = GRID_TILES[np.frombuffer(engine.grid, dtype=np.uint8)].reshape(engine.rows, engine.cols)
+        for pos in (engine.snake[0], engine.snake[-1]):
+            cells[pos[1] // side, pos[0] // side] = self._cell_tile(pos)
+        frame = self._tiles[cells]  # (rows, cols, side, side, 3)
+        self._frame = np.ascontiguousarray(frame.transpose(0, 2, 1, 3, 4)).reshape(engine.rows * side, engine.cols * side, 3)
+
+    def _cell_tile(self, pos):
+        """Pick the tile showing a cell
+        The head is drawn over the tail and the tail over the body, in cells that several
+        segments share.
+        Args:
+            pos (tuple): Position (x, y) of the cell.
+        Returns:
+            int: Index of the tile.
+        """
+        snake = self.engine.snake
+        if pos == snake[0]:
+            return TILE_HEAD + TILE_ANGLES.index(get_direction_angle(get_tail_direction(snake[0], snake[1])))
+        if pos == snake[-1]:
+            return TILE_TAIL + TILE_ANGLES.index(get_direction_angle(get_tail_direction(snake[-2], snake[-1])))
+        return GRID_TILES[self.engine.grid[self.engine.cell_index(pos)]]
+
+    def _paint_cell(self, pos):
+        """Repaint one cell of the frame from the current state
+        Args:
+            pos (tuple): Position (x, y) of the cell.
+        Returns:
+            None
+        """
+        side = self.engine.side
+        self._frame[pos[1]:pos[1] + side, pos[0]:pos[0] + side] = self._tiles[self._cell_tile(pos)]
+
+    def _observe_pixels(self):
+        """Export the current frame
+        Returns:
+            numpy.ndarray: A uint8 array of shape (HEIGHT, WIDTH, 3), a copy of the frame.
+        """
+        return self._frame[:HEIGHT, :WIDTH].copy()
+
+def get_pixel_tiles(level):
+    """Get the tiles of the pixel observations of a level, building them on first use
+    Each tile is one cell of the level's dirt with a sprite drawn over it, rendered with
+    the same textures and rotations as render_game.
+    Args:
+        level (str): The level deciding the dirt and food textures.
+    Returns:
+        numpy.ndarray: A uint8 array of shape (n_tiles, SIDE, SIDE, 3) indexed by the
+            TILE_* constants.
+    """
+    tiles = PIXEL_TILES.get(level)
+    if tiles is not None:
+        return tiles
+    import pygame
+    import snake
+    if not snake.SNAKE_HEAD_FRAMES:
+        snake.init_textures()
+    dirt = snake.get_texture("dirt", size=SIDE, variant=snake.DIRT_VARIANTS.get(level, 1))
+    head = snake.SNAKE_HEAD_FRAMES["short_tongue"]
+    sprites = [None, (snake.SNAKE_TEXTURE, 0), None]
+    sprites += [(head, angle) for angle in TILE_ANGLES]
+    sprites += [(snake.SNAKE_TAIL_TEXTURE, angle) for angle in TILE_ANGLES]
+
+    tiles = np.empty((len(sprites), SIDE, SIDE, 3), dtype=np.uint8)
+    surface = pygame.Surface((SIDE, SIDE), 0, 32)
+    for index, sprite in enumerate(sprites):
+        surface.blit(dirt, (0, 0))
+        if index == TILE_FOOD:
+            snake.HenBlock((0, 0), level).draw(surface)
+        elif sprite is not None:
+            snake.draw_block(surface, (0, 0), None, sprite[0], sprite[1])
+        tiles[index] = pygame.surfarray.array3d(surface).transpose(1, 0, 2)
+    PIXEL_TILES[level] = tiles
+    return tiles
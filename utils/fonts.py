@@ -0,0 +1,49 @@
+import pygame
+from collections import OrderedDict
+
+# Maximum number of rendered strings kept by render_text before the least recently used is dropped
+TEXT_CACHE_SIZE = 128
+
+# Loaded fonts by size
+_fonts = {}
+
+# Rendered text surfaces by (text, size, color)
+_text_cache = OrderedDict()
+
+def get_font(size):
+    """
+    Get the default system font at the given size, loading it only once.
+    Args:
+        size (int): Font size in points.
+    Returns:
+        pygame.font.Font: The loaded font.
+    """
+    font = _fonts.get(size)
+    if font is None:
+        font = pygame.font.SysFont(None, size)
+        _fonts[size] = font
+    return font
+
+def render_text(text, size, color):
+    """
+    Render antialiased text, reusing the surface when the same string was rendered before.
+    Surfaces are kept in a bounded LRU cache keyed by (text, size, color), so labels whose
+    value did not change are not rendered again. Callers must not draw on the returned surface.
+    Args:
+        text (str): The text to render.
+        size (int): Font size in points.
+        color (tuple): Text color (R, G, B).
+    Returns:
+        pygame.Surface: The rendered text.
+    """
+    key = (text, size, color)
+    surface = _text_cache.get(key)
+    if surface is not None:
+        _text_cache.move_to_end(key)
+        return surface
+
+    surface = get_font(size).render(text, True, color)
+    _text_cache[key] = surface
+    if len(_text_cache) > TEXT_CACHE_SIZE:
+        _text_cache.popitem(last=False)
+    return surface
@@ -0,0 +1,157 @@
+import os
+from array import array
+from config import CACHE_DIR
+from utils.engine import CELL_EMPTY, CELL_FOOD
+from utils.globals import UP, DOWN, LEFT, RIGHT
+
+# Shortcuts off the cycle are only taken while the snake fills less than this fraction of the board
+SHORTCUT_MAX_FILL = 0.5
+
+# Cells kept free between the head and the tail when taking a shortcut. Eating stalls the
+# tail for a move, so this leaves room for the growth of a few meals in a row.
+SHORTCUT_MARGIN = 4
+
+# Version of the cycle layout stored in CACHE_DIR, part of the file name so that a change
+# to build_hamiltonian_cycle never reads back cycles built by an older one
+HAMILTONIAN_CACHE_VERSION = 1
+
+# Cycles already loaded in this process, by (cols, rows)
+_cycles = {}
+
+def has_hamiltonian_cycle(cols, rows):
+    """Check whether a board has a Hamiltonian cycle
+    A grid graph has one when both sides have at least 2 cells and at least one side is
+    even; with both sides odd, the two colours of the checkerboard differ in size.
+    Args:
+        cols (int): Number of columns.
+        rows (int): Number of rows.
+    Returns:
+        bool: True if build_hamiltonian_cycle can build a cycle for the board.
+    """
+    return min(cols, rows) >= 2 and (cols % 2 == 0 or rows % 2 == 0)
+
+def build_hamiltonian_cycle(cols, rows):
+    """Build a cycle visiting every cell of a cols x rows board exactly once
+    With an even number of rows, the cycle runs back and forth along the rows over
+    columns 1..cols-1 and returns to the start through column 0. With an odd number of
+    rows but an even number of columns the same pattern is used on the transposed board.
+    Args:
+        cols (int): Number of columns.
+        rows (int): Number of rows.
+    Returns:
+        array: The cells of the cycle in visiting order, as indices y * cols + x.
+    """
+    if not has_hamiltonian_cycle(cols, rows):
+        raise ValueError(f"A {cols}x{rows} board has no Hamiltonian cycle.")
+    transpose = rows % 2 == 1
+    width, height = (rows, cols) if transpose else (cols, rows)
+    path = []
+    for y in range(height):
+        xs = range(1, width) if y % 2 == 0 else range(width - 1, 0, -1)
+        path.extend((x, y) for x in xs)
+    path.extend((0, y) for y in range(height - 1, -1, -1))
+    if transpose:
+        path = [(y, x) for x, y in path]
+    return array("I", (y * cols + x for x, y in path))
+
+def load_hamiltonian_cycle(cols, rows, cache_dir=CACHE_DIR):
+    """Get the Hamiltonian cycle of a board size, building it only once
+    The cycle is kept in memory and stored in cache_dir, so later games and processes
+    read it back instead of building it again. Failing to write the cache is not an
+    error: the cycle is still returned.
+    Args:
+        cols (int): Number of columns.
+        rows (int): Number of rows.
+        cache_dir (str, optional): Directory of the cached cycles. Defaults to CACHE_DIR.
+    Returns:
+        array: The cells of the cycle in visiting order, see build_hamiltonian_cycle.
+    """
+    cycle = _cycles.get((cols, rows))
+    if cycle is not None:
+        return cycle
+
+    path = os.path.join(cache_dir, f"hamiltonian-v{HAMILTONIAN_CACHE_VERSION}-{cols}x{rows}.bin")
+    cycle = array("I")
+    try:
+        with open(path, "rb") as f:
+            cycle.frombytes(f.read())
+    except OSError:
+        pass
+    if len(cycle) != cols * rows:
+        cycle = build_hamiltonian_cycle(cols, rows)
+        # Written under a temporary name and renamed, so concurrent games never read a partial file
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(temp_path, "wb") as f:
+                f.write(cycle.tobytes())
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    _cycles[(cols, rows)] = cycle
+    return cycle
+
+class HamiltonianSolver:
+    def __init__(self, engine):
+        """Initialize a solver that can fill the whole board without dying
+        The snake follows a Hamiltonian cycle over the WIDTH // SIDE x HEIGHT // SIDE cells
+        food can spawn on, so it never runs into itself or a wall and eventually eats every
+        food. While the snake is short it takes shortcuts towards the nearest food: it may
+        skip ahead along the cycle as long as it stays behind the food and keeps
+        SHORTCUT_MARGIN cells between its head and its tail. The body then always lies on
+        the stretch of the cycle between the tail and the head, so no shortcut can trap it.
+        Each decision looks at the four neighbours of the head and at the food blocks, so
+        its cost does not depend on the size of the board or the length of the snake.
+        Args:
+            engine (SnakeEngine): The engine whose snake is steered.
+        """
+        self.engine = engine
+        self.cols = engine.width // engine.side
+        self.rows = engine.height // engine.side
+        cycle = load_hamiltonian_cycle(self.cols, self.rows)
+        self.length = len(cycle)
+        # Position of every engine grid cell on the cycle, -1 outside the board it covers
+        self.order = array("i", [-1]) * (engine.cols * engine.rows)
+        self.next_action = [None] * (engine.cols * engine.rows)
+        for i, cell in enumerate(cycle):
+            x, y = cell % self.cols, cell // self.cols
+            self.order[y * engine.cols + x] = i
+        for i, cell in enumerate(cycle):
+            x, y = cell % self.cols, cell // self.cols
+            nxt = cycle[(i + 1) % self.length]
+            self.next_action[y * engine.cols + x] = (nxt % self.cols - x, nxt // self.cols - y)
+
+    def next_direction(self):
+        """Choose the direction of the next move
+        Returns:
+            tuple: The direction (dx, dy) of the next move, or None if the head is off the
+                cycle, on the partial column or row of the board.
+        """
+        engine = self.engine
+        snake = engine.snake
+        head = engine.cell_index(snake[0])
+        direction = self.next_action[head]
+        if direction is None or len(snake) >= SHORTCUT_MAX_FILL * self.length or not engine.food:
+            return direction
+
+        order, length = self.order, self.length
+        head_pos = order[head]
+        ahead_of_tail = (order[engine.cell_index(snake[-1])] - head_pos) % length
+        food_distance = min((order[cell] - head_pos) % length for cell in engine.food.values())
+        best_distance = 1
+        grid = engine.grid
+        ecols = engine.cols
+        x, y = head % ecols, head // ecols
+        for dx, dy in (UP, DOWN, LEFT, RIGHT):
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < self.cols and 0 <= ny < self.rows):
+                continue
+            cell = ny * ecols + nx
+            if grid[cell] != CELL_EMPTY and grid[cell] != CELL_FOOD:
+                continue
+            distance = (order[cell] - head_pos) % length
+            if best_distance < distance <= food_distance and distance < ahead_of_tail - SHORTCUT_MARGIN:
+                best_distance = distance
+                direction = (dx, dy)
+        return direction
@@ -1,40 +1,46 @@
 import random
+from config import WIDTH, HEIGHT, SIDE
 
 # === Position Calculation Functions ===
-def generate_block_position(forbidden):
+def generate_block_position(forbidden, rng=random, width=WIDTH, height=HEIGHT, side=SIDE):
     """
     Generate a new random position for a block aligned to the grid.
 
     This function generates a random position for a block in a grid
     where the block's position does not overlap with any of the forbidden
-    positions provided. The grid is defined by the constants WIDTH and HEIGHT,
-    and the block's position is aligned to this grid.
+    positions provided. The grid covers width x height pixels in cells of side
+    pixels, the window by default, and the block's position is aligned to this grid.
 
     Parameters:
     - forbidden (set): A set of positions that are forbidden for the new block.
       These are typically the positions currently occupied by other blocks or the snake.
+    - rng (random.Random): The random generator to draw from. Default is the global
+      random module.
+    - width (int): Width of the board in pixels. Default is WIDTH.
+    - height (int): Height of the board in pixels. Default is HEIGHT.
+    - side (int): Size of each grid cell in pixels. Default is SIDE.
 
     Returns:
     - tuple: A tuple (x, y) representing the new position of the block, or None
       if no valid position can be found.
     """
-    cols = 800 // 30  # WIDTH // SIDE
-    rows = 600 // 30  # HEIGHT // SIDE
+    cols = width // side
+    rows = height // side
 
     # Create a list of all valid grid positions
     all_positions = []
     for x in range(cols):
         for y in range(rows):
-            pos = (x * 30, y * 30)  # SIDE
+            pos = (x * side, y * side)
             if pos not in forbidden:
                 all_positions.append(pos)
 
     if not all_positions:
         return None
 
-    return random.choice(all_positions)
+    return rng.choice(all_positions)
 
-def get_random_empty_cell(snake_positions=None, block_positions=None):
+def get_random_empty_cell(snake_positions=None, block_positions=None, rng=random, width=WIDTH, height=HEIGHT, side=SIDE):
     """
     Get a random empty cell that's not occupied by snake or blocks.
 
@@ -46,6 +52,11 @@ def get_random_empty_cell(snake_positions=None, block_positions=None):
     Parameters:
     - snake_positions (list): A list of positions occupied by the snake. Default is None.
     - block_positions (list): A list of positions occupied by blocks. Default is None.
+    - rng (random.Random): The random generator to draw from. Default is the global
+      random module.
+    - width (int): Width of the board in pixels. Default is WIDTH.
+    - height (int): Height of the board in pixels. Default is HEIGHT.
+    - side (int): Size of each grid cell in pixels. Default is SIDE.
 
     Returns:
     - tuple: A tuple (x, y) representing a random empty cell in the grid, or None
@@ -56,4 +67,81 @@ def get_random_empty_cell(snake_positions=None, block_positions=None):
         forbidden.update(snake_positions)
     if block_positions:
         forbidden.update(block_positions)
-    return generate_block_position(forbidden)
+    return generate_block_position(forbidden, rng, width, height, side)
+
+# === Free Cell Index ===
+class FreeCells:
+    """Set of free grid cells with O(1) add, discard and random sample
+
+    Free cells are kept in a dense list and each cell remembers its slot in that list, so
+    a cell is removed by swapping the last free cell into its slot. Cells outside the
+    universe given at construction are never reported as free.
+    """
+    NOT_FREE = -1  # Slot value of a cell in the universe that is currently taken
+    OUTSIDE = -2   # Slot value of a cell that can never be free
+
+    def __init__(self, n_cells, universe):
+        """Initialize the index with every cell of the universe free
+        Args:
+            n_cells (int): Total number of cells in the grid.
+            universe (iterable): Indices of the cells that may ever be free.
+        """
+        self._cells = list(universe)
+        self._slot = [self.OUTSIDE] * n_cells
+        for i, cell in enumerate(self._cells):
+            self._slot[cell] = i
+
+    def __len__(self):
+        return len(self._cells)
+
+    def __contains__(self, cell):
+        return self._slot[cell] >= 0
+
+    def add(self, cell):
+        """Mark a cell as free
+        Args:
+            cell (int): Index of the cell.
+        Returns:
+            None
+        """
+        if self._slot[cell] == self.NOT_FREE:
+            self._slot[cell] = len(self._cells)
+            self._cells.append(cell)
+
+    def discard(self, cell):
+        """Mark a cell as taken, if it was free
+        Args:
+            cell (int): Index of the cell.
+        Returns:
+            None
+        """
+        i = self._slot[cell]
+        if i < 0:
+            return
+        last = self._cells.pop()
+        if last != cell:
+            self._cells[i] = last
+            self._slot[last] = i
+        self._slot[cell] = self.NOT_FREE
+
+    def copy(self):
+        """Copy the index
+        Returns:
+            FreeCells: An independent index with the same free cells.
+        """
+        clone = FreeCells.__new__(FreeCells)
+        clone._cells = self._cells.copy()
+        clone._slot = self._slot.copy()
+        return clone
+
+    def sample(self, rng=random):
+        """Pick a random free cell without removing it
+        Args:
+            rng (random.Random, optional): The random generator to draw from. Defaults to
+                the global random module.
+        Returns:
+            int: Index of a free cell, or None if no cell is free.
+        """
+        if not self._cells:
+            return None
+        return self._cells[rng.randrange(len(self._cells))]
@@ -0,0 +1,217 @@
+import math
+import os
+import random
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from utils.engine import CELL_EMPTY, CELL_FOOD
+from utils.globals import UP, DOWN, LEFT, RIGHT
+
+# Directions searched by the agent, by index
+MCTS_ACTIONS = (UP, DOWN, LEFT, RIGHT)
+OPPOSITE_ACTIONS = (1, 0, 3, 2)  # UP<->DOWN, LEFT<->RIGHT
+
+# Wall-clock time in seconds spent searching each move
+MCTS_TIME_BUDGET = 0.05
+
+# Weight of the exploration term of UCB1
+EXPLORATION = 1.4
+
+# Random moves played after the tree to estimate the value of a leaf
+ROLLOUT_DEPTH = 10
+
+# Value of losing the game, in points of score
+DEATH_PENALTY = 10.0
+
+# Value of ending a rollout next to a food, in points of score
+FOOD_PROXIMITY_WEIGHT = 0.5
+
+class _Node:
+    """Statistics of one action sequence from the root"""
+    __slots__ = ("children", "visits", "value")
+
+    def __init__(self):
+        self.children = {}
+        self.visits = 0
+        self.value = 0.0
+
+def _legal_actions(engine):
+    """List the actions that are not a 180-degree turn
+    Args:
+        engine (SnakeEngine): The game.
+    Returns:
+        list: Indices into MCTS_ACTIONS.
+    """
+    if engine.direction is None:
+        return [0, 1, 2, 3]
+    reverse = OPPOSITE_ACTIONS[MCTS_ACTIONS.index(engine.direction)]
+    return [action for action in range(4) if action != reverse]
+
+def _safe_actions(engine, actions):
+    """Keep the actions that do not lose the game on the next move
+    Args:
+        engine (SnakeEngine): The game.
+        actions (list): Indices into MCTS_ACTIONS.
+    Returns:
+        list: The safe actions, or actions itself if every one of them is fatal.
+    """
+    solid = engine.config["self_collision_game_over"]
+    safe = []
+    for action in actions:
+        head = engine.next_head(MCTS_ACTIONS[action])
+        if head is None:
+            continue
+        if solid and engine.grid[engine.cell_index(head)] not in (CELL_EMPTY, CELL_FOOD):
+            continue
+        safe.append(action)
+    return safe or actions
+
+def _food_proximity(engine):
+    """Score how close the head is to the nearest food
+    Rewards are sparse with short rollouts, so leaves are also valued by this proximity,
+    which pulls the search towards food it cannot reach within the rollout.
+    Args:
+        engine (SnakeEngine): The game.
+    Returns:
+        float: 1 next to a food, decreasing to 0 across the board.
+    """
+    if not engine.food:
+        return 0.0
+    side = engine.side
+    head_x, head_y = engine.snake[0]
+    distance = min(abs(x - head_x) + abs(y - head_y) for x, y in engine.food) // side
+    return 1.0 - distance / (engine.cols + engine.rows)
+
+def search(engine, time_budget=MCTS_TIME_BUDGET, seed=None, exploration=EXPLORATION, rollout_depth=ROLLOUT_DEPTH):
+    """Run Monte-Carlo tree search from the current state of a game
+    The tree is open loop: nodes are action sequences from the root, and every iteration
+    replays its sequence on a fresh clone of the game, so the random food spawns are
+    sampled anew each time instead of being stored in the tree.
+    Args:
+        engine (SnakeEngine): The game to search from. It is not modified.
+        time_budget (float, optional): Seconds to search for. Defaults to MCTS_TIME_BUDGET.
+        seed (int, optional): Seed of the search's random generator. Defaults to None.
+        exploration (float, optional): Weight of the UCB1 exploration term. Defaults to EXPLORATION.
+        rollout_depth (int, optional): Random moves after the tree. Defaults to ROLLOUT_DEPTH.
+    Returns:
+        dict: Maps each root action index to its (visits, total value).
+    """
+    rng = random.Random(seed)
+    root = _Node()
+    start_score = engine.score
+    deadline = time.perf_counter() + time_budget
+    while time.perf_counter() < deadline:
+        sim = engine.clone(rng)
+        node = root
+        path = [root]
+        # Selection and expansion
+        while not sim.game_over:
+            actions = _legal_actions(sim)
+            untried = [action for action in actions if action not in node.children]
+            if untried:
+                action = rng.choice(untried)
+                node.children[action] = node = _Node()
+                sim.step(MCTS_ACTIONS[action])
+                path.append(node)
+                break
+            log_visits = math.log(node.visits)
+            action = max(actions, key=lambda a: node.children[a].value / node.children[a].visits
+                         + exploration * math.sqrt(log_visits / node.children[a].visits))
+            node = node.children[action]
+            sim.step(MCTS_ACTIONS[action])
+            path.append(node)
+
+        # Rollout
+        for _ in range(rollout_depth):
+            if sim.game_over:
+                break
+            sim.step(MCTS_ACTIONS[rng.choice(_safe_actions(sim, _legal_actions(sim)))])
+
+        value = sim.score - start_score
+        if sim.game_over and not sim.game_win:
+            value -= DEATH_PENALTY
+        else:
+            value += FOOD_PROXIMITY_WEIGHT * _food_proximity(sim)
+        for node in path:
+            node.visits += 1
+            node.value += value
+    return {action: (child.visits, child.value) for action, child in root.children.items()}
+
+def _search_worker(args):
+    """Run search in a worker process
+    Args:
+        args (tuple): The arguments of search.
+    Returns:
+        dict: The root statistics returned by search.
+    """
+    return search(*args)
+
+class MCTSAgent:
+    def __init__(self, engine, time_budget=MCTS_TIME_BUDGET, n_workers=None,
+                 exploration=EXPLORATION, rollout_depth=ROLLOUT_DEPTH):
+        """Initialize a Monte-Carlo tree search agent for the snake of an engine
+        Every move the agent searches for time_budget seconds. With several workers the
+        search is root parallel: each process grows its own tree from a copy of the game
+        and the visit counts of the root actions are summed. Searches clone the engine,
+        which copies a few flat containers, rather than the drawable blocks.
+        Args:
+            engine (SnakeEngine): The engine whose snake is steered.
+            time_budget (float, optional): Seconds to search per move. Defaults to MCTS_TIME_BUDGET.
+            n_workers (int, optional): Number of search processes; 1 searches in this
+                process. Defaults to the number of CPUs.
+            exploration (float, optional): Weight of the UCB1 exploration term. Defaults to EXPLORATION.
+            rollout_depth (int, optional): Random moves after the tree. Defaults to ROLLOUT_DEPTH.
+        """
+        self.engine = engine
+        self.time_budget = time_budget
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.exploration = exploration
+        self.rollout_depth = rollout_depth
+        self.rng = random.Random()
+        self.last_iterations = 0
+        self.last_plan_time = 0.0
+        self._pool = None
+
+    def next_direction(self):
+        """Choose the direction of the next move
+        Returns:
+            tuple: The direction (dx, dy) of the most visited root action that does not
+                lose the game on this move, if any, or None if the game is over.
+        """
+        if self.engine.game_over:
+            return None
+        start = time.perf_counter()
+        seeds = [self.rng.randrange(2 ** 32) for _ in range(self.n_workers)]
+        if self.n_workers == 1:
+            results = [search(self.engine, self.time_budget, seeds[0], self.exploration, self.rollout_depth)]
+        else:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.n_workers)
+                weakref.finalize(self, self._pool.shutdown, wait=False, cancel_futures=True)
+            jobs = [(self.engine, self.time_budget, seed, self.exploration, self.rollout_depth) for seed in seeds]
+            results = list(self._pool.map(_search_worker, jobs))
+
+        totals = {}
+        for result in results:
+            for action, (visits, value) in result.items():
+                total = totals.setdefault(action, [0, 0.0])
+                total[0] += visits
+                total[1] += value
+        self.last_iterations = sum(visits for visits, _ in totals.values())
+        self.last_plan_time = time.perf_counter() - start
+        # Rare ties in the statistics can favour a fatal move, so only safe moves are picked
+        # while there are any
+        safe = [action for action in _safe_actions(self.engine, _legal_actions(self.engine)) if action in totals]
+        if not safe:
+            return None
+        best = max(safe, key=lambda action: (totals[action][0], totals[action][1]))
+        return MCTS_ACTIONS[best]
+
+    def close(self):
+        """Stop the worker processes, if any
+        Returns:
+            None
+        """
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,194 @@
+import csv
+import json
+import os
+import time
+from array import array
+from utils.fonts import render_text
+
+# Phases of a frame timed by FrameProfiler, in the order game_loop runs them
+PROFILE_PHASES = ("events", "update", "textures", "render", "flip", "wait")
+
+# Number of most recent frames kept by FrameProfiler
+PROFILE_CAPACITY = 600
+
+# Seconds between refreshes of the overlay text
+OVERLAY_REFRESH = 0.5
+
+# Font size and color of the overlay
+OVERLAY_FONT_SIZE = 20
+OVERLAY_COLOR = (255, 255, 255)
+
+class FrameProfiler:
+    def __init__(self, capacity=PROFILE_CAPACITY, overlay=False):
+        """Initialize a recorder of per-phase frame times
+        game_loop calls begin_frame, then mark after each phase with the phase's name, then
+        end_frame. mark adds the time since the previous mark to the phase, so a phase that
+        runs several times in a frame (several simulation ticks) is summed. The last
+        capacity frames are kept in preallocated ring buffers, one per phase plus the whole
+        frame, so recording does not allocate.
+        Args:
+            capacity (int, optional): Number of frames kept. Defaults to PROFILE_CAPACITY.
+            overlay (bool, optional): Draw the frame time percentiles on screen. Defaults to False.
+        """
+        self.capacity = capacity
+        self.overlay = overlay
+        self.samples = {phase: array("d", [0.0]) * capacity for phase in PROFILE_PHASES + ("frame",)}
+        self.count = 0
+        self._index = 0
+        self._frame_start = 0.0
+        self._last = 0.0
+        self._overlay_time = None
+        self._overlay_labels = []
+
+    def __bool__(self):
+        return True
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def begin_frame(self):
+        """Start timing a new frame
+        Returns:
+            None
+        """
+        index = self._index
+        for samples in self.samples.values():
+            samples[index] = 0.0
+        self._frame_start = self._last = time.perf_counter()
+
+    def mark(self, phase):
+        """Add the time since the previous mark to a phase of the current frame
+        Args:
+            phase (str): One of PROFILE_PHASES.
+        Returns:
+            None
+        """
+        now = time.perf_counter()
+        self.samples[phase][self._index] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        """Finish the current frame and record its total time
+        Returns:
+            None
+        """
+        self.samples["frame"][self._index] = time.perf_counter() - self._frame_start
+        self._index = (self._index + 1) % self.capacity
+        self.count += 1
+
+    def frames(self, phase="frame"):
+        """Get the recorded times of a phase, oldest first
+        Args:
+            phase (str, optional): One of PROFILE_PHASES, or "frame" for whole frames.
+                Defaults to "frame".
+        Returns:
+            list: Durations in seconds.
+        """
+        samples = self.samples[phase]
+        if self.count < self.capacity:
+            return samples[:self.count].tolist()
+        return (samples[self._index:] + samples[:self._index]).tolist()
+
+    def percentiles(self, phase="frame"):
+        """Get the median and tail times of a phase over the recorded frames
+        Args:
+            phase (str, optional): One of PROFILE_PHASES, or "frame" for whole frames.
+                Defaults to "frame".
+        Returns:
+            dict: The p50, p95 and p99 times in milliseconds, 0 before the first frame.
+        """
+        ordered = sorted(self.frames(phase))
+        if not ordered:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+        last = len(ordered) - 1
+        return {f"p{q}": ordered[min(last, len(ordered) * q // 100)] * 1000 for q in (50, 95, 99)}
+
+    def summary(self):
+        """Get the percentiles of every phase and of whole frames
+        Returns:
+            dict: Maps "frame" and each phase to its percentiles, as returned by percentiles.
+        """
+        return {phase: self.percentiles(phase) for phase in ("frame",) + PROFILE_PHASES}
+
+    def draw_overlay(self, display):
+        """Draw the frame time percentiles in the bottom-left corner of the display
+        The text is rebuilt every OVERLAY_REFRESH seconds, so the overlay costs a few blits
+        on the other frames.
+        Args:
+            display (Surface): The surface to draw on.
+        Returns:
+            Rect: The area drawn, or None if the overlay is disabled.
+        """
+        if not self.overlay:
+            return None
+        now = time.perf_counter()
+        if self._overlay_time is None or now - self._overlay_time >= OVERLAY_REFRESH:
+            self._overlay_time = now
+            frame = self.percentiles()
+            lines = [f"frame ms  p50 {frame['p50']:.2f}  p95 {frame['p95']:.2f}  p99 {frame['p99']:.2f}"]
+            lines.append("p95 ms  " + "  ".join(f"{phase} {self.percentiles(phase)['p95']:.2f}"
+                                                for phase in PROFILE_PHASES))
+            self._overlay_labels = [render_text(line, OVERLAY_FONT_SIZE, OVERLAY_COLOR) for line in lines]
+
+        x = 5
+        y = display.get_height() - 5 - sum(label.get_height() for label in self._overlay_labels)
+        area = None
+        for label in self._overlay_labels:
+            rect = display.blit(label, (x, y))
+            area = rect if area is None else area.union(rect)
+            y += label.get_height()
+        return area
+
+    def dump(self, path):
+        """Write the recorded frames to a file
+        A .json path gets the percentiles and the per-frame times; any other path gets a CSV
+        file with one row per frame and one column per phase, in milliseconds.
+        Args:
+            path (str): Path of the file.
+        Returns:
+            None
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        columns = ("frame",) + PROFILE_PHASES
+        frames = [self.frames(column) for column in columns]
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump({
+                    "frames": len(self),
+                    "summary": self.summary(),
+                    "samples_ms": {column: [t * 1000 for t in times] for column, times in zip(columns, frames)},
+                }, f, indent=2)
+            return
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow([f"{column}_ms" for column in columns])
+            for row in zip(*frames):
+                writer.writerow([f"{t * 1000:.4f}" for t in row])
+
+class NullProfiler:
+    """Profiler that records nothing, used when profiling is disabled
+
+    It has the methods of FrameProfiler, each doing nothing, so game_loop calls them
+    unconditionally at the cost of a no-op call per phase.
+    """
+    overlay = False
+
+    def __bool__(self):
+        return False
+
+    def begin_frame(self):
+        pass
+
+    def mark(self, phase):
+        pass
+
+    def end_frame(self):
+        pass
+
+    def draw_overlay(self, display):
+        return None
+
+# Shared disabled profiler
+NULL_PROFILER = NullProfiler()
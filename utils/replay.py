@@ -0,0 +1,216 @@
+import struct
+from config import levels_config
+from utils.engine import SnakeEngine
+from utils.globals import UP, DOWN, LEFT, RIGHT
+
+# Moves are stored as 2-bit indices into this tuple, four moves per byte
+REPLAY_ACTIONS = (UP, DOWN, LEFT, RIGHT)
+ACTION_CODES = {direction: code for code, direction in enumerate(REPLAY_ACTIONS)}
+
+# Level names by the code stored in the header
+REPLAY_LEVELS = tuple(levels_config)
+UNKNOWN_LEVEL = 255
+
+REPLAY_MAGIC = b"SNKR"
+REPLAY_VERSION = 1
+
+# magic, version, level, border_game_over, self_collision_game_over, n_food_blocks,
+# total_score_to_win, width, height, side, seed, number of ticks
+REPLAY_HEADER = struct.Struct("<4sBBBBHIHHHQI")
+
+# Largest seed a replay can store, as the header keeps it in an unsigned 64-bit field
+MAX_SEED = 2 ** 64 - 1
+
+# Ticks between the snapshots a ReplayPlayer keeps for seeking
+KEYFRAME_INTERVAL = 256
+
+class Replay:
+    def __init__(self, level, config, width, height, side, seed, moves=b"", n_ticks=0):
+        """Initialize a replay of one game
+        A replay holds everything needed to re-simulate a game with SnakeEngine: the
+        level rules, the board size, the seed of the game's random generator and the
+        direction of every tick, packed 2 bits per move.
+        Args:
+            level (str): The level the game was played at.
+            config (dict): The level rules, with the same keys as game_config.
+            width (int): Width of the board in pixels.
+            height (int): Height of the board in pixels.
+            side (int): Size of each grid cell in pixels.
+            seed (int): Seed of the game's random generator.
+            moves (bytes, optional): The packed moves. Defaults to b"".
+            n_ticks (int, optional): Number of moves in moves. Defaults to 0.
+        """
+        self.level = level
+        self.config = {
+            "level": level,
+            "n_food_blocks": config["n_food_blocks"],
+            "total_score_to_win": config["total_score_to_win"],
+            "border_game_over": bool(config["border_game_over"]),
+            "self_collision_game_over": bool(config["self_collision_game_over"]),
+        }
+        self.width = width
+        self.height = height
+        self.side = side
+        self.seed = seed
+        self.moves = bytearray(moves)
+        self.n_ticks = n_ticks
+
+    def __len__(self):
+        return self.n_ticks
+
+    def append(self, direction):
+        """Record the direction of the next tick
+        Args:
+            direction (tuple): The direction (dx, dy) the snake moved in.
+        Returns:
+            None
+        """
+        shift = (self.n_ticks & 3) * 2
+        if shift == 0:
+            self.moves.append(0)
+        self.moves[-1] |= ACTION_CODES[direction] << shift
+        self.n_ticks += 1
+
+    def action(self, tick):
+        """Get the direction of a tick
+        Args:
+            tick (int): Index of the tick, starting at 0.
+        Returns:
+            tuple: The direction (dx, dy) of the move.
+        """
+        return REPLAY_ACTIONS[(self.moves[tick >> 2] >> ((tick & 3) * 2)) & 3]
+
+    def new_engine(self):
+        """Create an engine at the start of the recorded game
+        Returns:
+            SnakeEngine: A fresh engine with the recorded rules, board and seed.
+        """
+        return SnakeEngine(self.config, self.width, self.height, self.side, self.seed)
+
+    def to_bytes(self):
+        """Serialize the replay
+        Returns:
+            bytes: The header followed by the packed moves.
+        """
+        level = REPLAY_LEVELS.index(self.level) if self.level in REPLAY_LEVELS else UNKNOWN_LEVEL
+        header = REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, level,
+                                    self.config["border_game_over"], self.config["self_collision_game_over"],
+                                    self.config["n_food_blocks"], self.config["total_score_to_win"],
+                                    self.width, self.height, self.side, self.seed, self.n_ticks)
+        return header + bytes(self.moves)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Deserialize a replay
+        Args:
+            data (bytes): Data produced by to_bytes.
+        Returns:
+            Replay: The decoded replay.
+        """
+        (magic, version, level, border_game_over, self_collision_game_over, n_food_blocks,
+         total_score_to_win, width, height, side, seed, n_ticks) = REPLAY_HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError(f"Not a version {REPLAY_VERSION} replay.")
+        config = {
+            "n_food_blocks": n_food_blocks,
+            "total_score_to_win": total_score_to_win,
+            "border_game_over": border_game_over,
+            "self_collision_game_over": self_collision_game_over,
+        }
+        level = REPLAY_LEVELS[level] if level < len(REPLAY_LEVELS) else None
+        moves = data[REPLAY_HEADER.size:REPLAY_HEADER.size + (n_ticks + 3) // 4]
+        return cls(level, config, width, height, side, seed, moves, n_ticks)
+
+    def save(self, path):
+        """Write the replay to a file
+        Args:
+            path (str): Path of the file.
+        Returns:
+            None
+        """
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """Read a replay from a file
+        Args:
+            path (str): Path of the file.
+        Returns:
+            Replay: The decoded replay.
+        """
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+def record_game(engine, level):
+    """Create an empty replay for a game about to be played
+    Args:
+        engine (SnakeEngine): The engine of the game, before its first move.
+        level (str): The level of the game.
+    Returns:
+        Replay: The replay to append the moves of the game to.
+    """
+    return Replay(level, engine.config, engine.width, engine.height, engine.side, engine.seed)
+
+class ReplayPlayer:
+    def __init__(self, replay, keyframe_interval=KEYFRAME_INTERVAL):
+        """Initialize a player that re-simulates a replay headlessly
+        The player steps a SnakeEngine through the recorded moves. Every keyframe_interval
+        ticks it keeps an engine snapshot, so seeking costs at most the distance to the
+        nearest keyframe before the target tick.
+        Args:
+            replay (Replay): The replay to play.
+            keyframe_interval (int, optional): Ticks between keyframes. Defaults to KEYFRAME_INTERVAL.
+        """
+        self.replay = replay
+        self.keyframe_interval = keyframe_interval
+        self.engine = replay.new_engine()
+        self.keyframes = {0: self.engine.snapshot()}
+
+    @property
+    def tick(self):
+        """Get the number of ticks played so far
+        Returns:
+            int: The current tick.
+        """
+        return self.engine.ticks
+
+    def step(self):
+        """Play the next recorded move
+        Returns:
+            tuple: The GameState and events of the move, as returned by SnakeEngine.step,
+                or None at the end of the replay or once the game is over.
+        """
+        tick = self.engine.ticks
+        if tick >= self.replay.n_ticks or self.engine.game_over:
+            return None
+        result = self.engine.step(self.replay.action(tick))
+        if self.engine.ticks % self.keyframe_interval == 0 and self.engine.ticks not in self.keyframes:
+            self.keyframes[self.engine.ticks] = self.engine.snapshot()
+        return result
+
+    def seek(self, tick):
+        """Move the playback to a tick
+        The engine stops counting ticks when the game ends, so playback stops there too if
+        the replay holds moves past the end of the game.
+        Args:
+            tick (int): The tick to go to, clamped to the length of the replay.
+        Returns:
+            GameState: The state of the game after that many ticks, or at the end of the game.
+        """
+        tick = max(0, min(tick, self.replay.n_ticks))
+        keyframe = tick - tick % self.keyframe_interval
+        while keyframe not in self.keyframes:
+            keyframe -= self.keyframe_interval
+        if not keyframe <= self.engine.ticks <= tick:
+            self.engine.restore(self.keyframes[keyframe])
+        while self.engine.ticks < tick and self.step() is not None:
+            pass
+        return self.engine.get_state()
+
+    def play_to_end(self):
+        """Fast-forward to the end of the replay
+        Returns:
+            GameState: The final state of the game.
+        """
+        return self.seek(self.replay.n_ticks)
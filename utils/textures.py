@@ -1,20 +1,29 @@
+import hashlib
+import os
+import numpy as np
 import pygame
 import random
+from collections import OrderedDict
+from config import CACHE_DIR, TEXTURE_DISK_CACHE
 
 # Global textures (used outside this file)
 FOOD_BLOCK_TEXTURE = None
 SNAKE_TEXTURE = None
 SNAKE_HEAD_TEXTURE = None
 SNAKE_TAIL_TEXTURE = None
-BG_TEXTURE_LEVEL_1 = None  # Background texture
-BG_TEXTURE_LEVEL_2 = None  # Background texture
-BG_TEXTURE_LEVEL_3 = None  # Background texture
 
-# Local Textures
-HEN_TEXTURE = None
-APPLE_TEXTURE = None
-RABBIT_TEXTURE = None
-RABBIT_TEXTURE = None
+# Random generator for cosmetic noise, kept apart from the gameplay randomness of each game
+COSMETIC_RNG = random.Random()
+
+# Maximum number of generated textures kept by get_texture before the least recently used is dropped
+TEXTURE_CACHE_SIZE = 64
+_texture_cache = OrderedDict()
+
+# Directory of the generated textures persisted by get_texture
+TEXTURE_CACHE_DIR = os.path.join(CACHE_DIR, "textures")
+
+# Hash of this module's source, so editing a generator invalidates the textures on disk
+_code_version = None
 
 # === Texture Generation Functions ===
 def create_gradient_dot_texture(color, size=30, dot_size=4):
@@ -37,27 +46,59 @@ def create_gradient_dot_texture(color, size=30, dot_size=4):
              max(0, int(color[1] * 0.7)),
              max(0, int(color[2] * 0.7)))
 
-    # Draw gradient background
-    for y in range(size):
-        blend = y / size
-        line_color = (
-            int(darker[0] + (lighter[0] - darker[0]) * blend),
-            int(darker[1] + (lighter[1] - darker[1]) * blend),
-            int(darker[2] + (lighter[2] - darker[2]) * blend)
-        )
-        pygame.draw.line(texture, line_color, (0, y), (size, y))
+    # Gradient background, one color per row (surfarray indexes pixels as [x, y])
+    blend = np.arange(size) / size
+    rows = (np.array(darker) + np.outer(blend, np.subtract(lighter, darker))).astype(np.uint8)
+    pixels = np.empty((size, size), dtype=np.uint32)
+    pixels[:] = _map_colors(texture, rows)
 
-    # Add dots overlay
+    # Add dots overlay, stamping the pixels of one drawn circle at every dot center
     highlight_color = (min(255, int(color[0] * 1.2)),
                       min(255, int(color[1] * 1.2)),
                       min(255, int(color[2] * 1.2)))
 
-    for y in range(dot_size, size-dot_size, dot_size*2):
-        for x in range(dot_size, size-dot_size, dot_size*2):
-            pygame.draw.circle(texture, highlight_color, (x, y), dot_size//2)
+    # Dot centers are range(dot_size, size - dot_size, dot_size * 2) on both axes
+    if dot_size < size - dot_size:
+        highlight = _map_colors(texture, np.array([highlight_color]))[0]
+        step = dot_size * 2
+        for dx, dy in _circle_offsets(dot_size // 2):
+            pixels[dot_size + dx:size - dot_size + dx:step, dot_size + dy:size - dot_size + dy:step] = highlight
 
+    pygame.surfarray.pixels2d(texture)[...] = pixels
     return texture
 
+# Pixels filled by pygame.draw.circle, by radius, memoized by _circle_offsets
+_circle_offsets_cache = {}
+
+def _circle_offsets(radius):
+    """
+    Get the pixels pygame.draw.circle fills for a circle centered on the origin.
+    Args:
+        radius (int): Radius of the circle.
+    Returns:
+        list: Offsets (dx, dy) of the filled pixels.
+    """
+    offsets = _circle_offsets_cache.get(radius)
+    if offsets is None:
+        stamp = pygame.Surface((2 * radius + 1, 2 * radius + 1), pygame.SRCALPHA)
+        pygame.draw.circle(stamp, (255, 255, 255), (radius, radius), radius)
+        xs, ys = np.nonzero(pygame.surfarray.pixels_alpha(stamp))
+        offsets = _circle_offsets_cache[radius] = list(zip((xs - radius).tolist(), (ys - radius).tolist()))
+    return offsets
+
+def _map_colors(texture, colors):
+    """
+    Convert opaque colors to the pixel values of a texture, for writes through surfarray.pixels2d.
+    Args:
+        texture (pygame.Surface): 32-bit surface the pixels are written to.
+        colors (numpy.ndarray): Colors (R, G, B), one per row.
+    Returns:
+        numpy.ndarray: The pixel values, as uint32.
+    """
+    r_shift, g_shift, b_shift, _ = texture.get_shifts()
+    colors = colors.astype(np.uint32)
+    return (colors[:, 0] << r_shift) | (colors[:, 1] << g_shift) | (colors[:, 2] << b_shift) | np.uint32(texture.get_masks()[3])
+
 def create_serpent_long_thong_head_texture(color, size=30):
     """
     Create a special serpent head texture with scales, eyes, and a long tongue.
@@ -292,112 +333,71 @@ def create_snake_tail_texture(color, size=30):
 
     return texture
 
-def create_dirt_texture_level_1(size=30):
+def create_dirt_texture_level_1(size=30, rng=None):
     """
     Create a grainy blue dirt texture for the background.
     Args:
         size (int): Size of the texture (width and height).
+        rng (random.Random, optional): Random generator for the grain. Defaults to COSMETIC_RNG.
     Returns:
         pygame.Surface: Generated texture for the dirt background.
     """
     # Base blue color
     base_color = (70, 130, 180)  # Steel blue
-    texture = pygame.Surface((size, size), pygame.SRCALPHA)
-
-    # Create variations of blue for the grainy effect
-    darker = (
-        max(0, base_color[0] - 30),
-        max(0, base_color[1] - 30),
-        max(0, base_color[2] - 30)
-    )
-    lighter = (
-        min(255, base_color[0] + 30),
-        min(255, base_color[1] + 30),
-        min(255, base_color[2] + 30)
-    )
-
-    # Fill with base color
-    texture.fill(base_color)
-
-    # Add random noise for grainy effect
-    for y in range(size):
-        for x in range(size):
-            if random.random() < 0.3:  # 30% chance for a grain
-                color = random.choice([darker, lighter])
-                texture.set_at((x, y), color)
-
-    return texture
+    return _create_dirt_texture(base_color, size, rng)
 
-def create_dirt_texture_level_2(size=30):
+def create_dirt_texture_level_2(size=30, rng=None):
     """
     Create a grainy brown dirt texture for the background.
     Args:
         size (int): Size of the texture (width and height).
+        rng (random.Random, optional): Random generator for the grain. Defaults to COSMETIC_RNG.
     Returns:
         pygame.Surface: Generated texture for the dirt background.
     """
     # Base brown color
     base_color = (139, 69, 19)  # Saddle brown
-    texture = pygame.Surface((size, size), pygame.SRCALPHA)
-
-    # Create variations of brown for the grainy effect
-    darker = (
-        max(0, base_color[0] - 30),
-        max(0, base_color[1] - 30),
-        max(0, base_color[2] - 30)
-    )
-    lighter = (
-        min(255, base_color[0] + 30),
-        min(255, base_color[1] + 30),
-        min(255, base_color[2] + 30)
-    )
-
-    # Fill with base color
-    texture.fill(base_color)
-
-    # Add random noise for grainy effect
-    for y in range(size):
-        for x in range(size):
-            if random.random() < 0.3:  # 30% chance for a grain
-                color = random.choice([darker, lighter])
-                texture.set_at((x, y), color)
+    return _create_dirt_texture(base_color, size, rng)
 
-    return texture
-
-def create_dirt_texture_level_3(size=30):
+def create_dirt_texture_level_3(size=30, rng=None):
     """
     Create a grainy red dirt texture for the background.
     Args:
         size (int): Size of the texture (width and height).
+        rng (random.Random, optional): Random generator for the grain. Defaults to COSMETIC_RNG.
     Returns:
         pygame.Surface: Generated texture for the dirt background.
     """
     # Base red color
     base_color = (178, 34, 34)  # Firebrick red
+    return _create_dirt_texture(base_color, size, rng)
+
+def _create_dirt_texture(base_color, size, rng):
+    """
+    Create a grainy dirt texture: the base color with 30% of the pixels turned a shade
+    darker or lighter.
+    The grain is drawn as a NumPy noise mask and copied into the surface at once, so
+    even full-screen textures are generated in a fraction of a second.
+    Args:
+        base_color (tuple): Base color of the dirt (R, G, B).
+        size (int): Size of the texture (width and height).
+        rng (random.Random): Random generator for the grain, or None for COSMETIC_RNG.
+    Returns:
+        pygame.Surface: Generated texture for the dirt background.
+    """
     texture = pygame.Surface((size, size), pygame.SRCALPHA)
 
-    # Create variations of red for the grainy effect
-    darker = (
-        max(0, base_color[0] - 30),
-        max(0, base_color[1] - 30),
-        max(0, base_color[2] - 30)
-    )
-    lighter = (
-        min(255, base_color[0] + 30),
-        min(255, base_color[1] + 30),
-        min(255, base_color[2] + 30)
-    )
-
-    # Fill with base color
-    texture.fill(base_color)
-
-    # Add random noise for grainy effect
-    for y in range(size):
-        for x in range(size):
-            if random.random() < 0.3:  # 30% chance for a grain
-                color = random.choice([darker, lighter])
-                texture.set_at((x, y), color)
+    # Create variations of the base color for the grainy effect
+    darker = tuple(max(0, c - 30) for c in base_color)
+    lighter = tuple(min(255, c + 30) for c in base_color)
+    palette = _map_colors(texture, np.array([base_color, lighter, darker]))
 
+    # Add random noise for grainy effect: 30% chance for a grain, half darker, half lighter
+    noise = np.random.default_rng((rng or COSMETIC_RNG).getrandbits(64)).random((size, size), dtype=np.float32)
+    shade = (noise < 0.3).view(np.uint8)
+    shade += noise < 0.15
+
+    pygame.surfarray.pixels2d(texture)[...] = palette[shade]
     return texture
 
 # Updated create_hen_texture to remove current eyes and beak, add a new big beak at the bottom, and place two big eyes in the center.
@@ -520,3 +520,130 @@ def create_rabbit_texture(size=30):
     pygame.draw.polygon(texture, nose_color, nose_points)
 
     return texture
+
+# === Texture Registry ===
+# Poses of the snake head animation, used as variants of the "serpent_head" texture
+SNAKE_HEAD_POSES = ("short_tongue", "long_tongue", "closed_eyes")
+
+# Dirt generators by variant, called as generator(size, rng)
+DIRT_GENERATORS = {
+    1: create_dirt_texture_level_1,
+    2: create_dirt_texture_level_2,
+    3: create_dirt_texture_level_3,
+}
+
+# Generators used by get_texture, called as generator(color, size, variant)
+TEXTURE_GENERATORS = {
+    "gradient_dot": lambda color, size, variant: create_gradient_dot_texture(color, size),
+    "snake_tail": lambda color, size, variant: create_snake_tail_texture(color, size),
+    "serpent_head": lambda color, size, variant: {
+        "short_tongue": create_serpent_short_thong_head_texture,
+        "long_tongue": create_serpent_long_thong_head_texture,
+        "closed_eyes": create_serpent_head_texture_closed_eyes,
+    }[variant](color, size),
+    "dirt": lambda color, size, variant: DIRT_GENERATORS[variant](size),
+    "hen": lambda color, size, variant: create_hen_texture(size),
+    "apple": lambda color, size, variant: create_apple_texture(size),
+    "rabbit": lambda color, size, variant: create_rabbit_texture(size),
+}
+
+def get_texture(kind, color=None, size=30, variant=None):
+    """
+    Get a shared texture, generating it on first use.
+    Textures are memoized by (kind, color, size, variant) in a bounded LRU cache, so
+    every block and sprite of the same kind draws from the same surface. With
+    TEXTURE_DISK_CACHE set, generated textures are also saved as PNG files in
+    TEXTURE_CACHE_DIR and later launches load them instead of generating them again.
+    Callers must not draw on the returned surface.
+    Args:
+        kind (str): Name of the generator in TEXTURE_GENERATORS.
+        color (tuple, optional): Base color (R, G, B) for generators that take one.
+        size (int): Size of the texture (width and height).
+        variant (optional): Generator specific variant, e.g. the head pose or dirt level.
+    Returns:
+        pygame.Surface: The shared texture.
+    """
+    key = (kind, color, size, variant)
+    texture = _texture_cache.get(key)
+    if texture is not None:
+        _texture_cache.move_to_end(key)
+        return texture
+
+    texture = _load_cached_texture(kind, color, size, variant) if TEXTURE_DISK_CACHE else None
+    if texture is None:
+        texture = TEXTURE_GENERATORS[kind](color, size, variant)
+        if TEXTURE_DISK_CACHE:
+            _save_cached_texture(texture, kind, color, size, variant)
+    _texture_cache[key] = texture
+    if len(_texture_cache) > TEXTURE_CACHE_SIZE:
+        _texture_cache.popitem(last=False)
+    return texture
+
+def texture_cache_path(kind, color, size, variant):
+    """
+    Get the file a generated texture is persisted to.
+    The name is derived from the generator, its parameters and the version of the code
+    that generates it, so a changed generator never loads a stale texture.
+    Args:
+        kind (str): Name of the generator in TEXTURE_GENERATORS.
+        color (tuple): Base color (R, G, B), or None.
+        size (int): Size of the texture (width and height).
+        variant: Generator specific variant, or None.
+    Returns:
+        str: Path of the PNG file.
+    """
+    global _code_version
+    if _code_version is None:
+        with open(__file__, "rb") as f:
+            _code_version = hashlib.sha1(f.read()).hexdigest()
+    digest = hashlib.sha1(repr((kind, color, size, variant, _code_version)).encode()).hexdigest()[:16]
+    return os.path.join(TEXTURE_CACHE_DIR, f"{kind}-{size}-{digest}.png")
+
+def _load_cached_texture(kind, color, size, variant):
+    """
+    Load a texture persisted by an earlier launch.
+    Returns:
+        pygame.Surface: The texture, or None if it is not cached or cannot be read.
+    """
+    path = texture_cache_path(kind, color, size, variant)
+    if not os.path.exists(path):
+        return None
+    try:
+        return pygame.image.load(path)
+    except (pygame.error, OSError):
+        return None
+
+def _save_cached_texture(texture, kind, color, size, variant):
+    """
+    Persist a generated texture for later launches.
+    The file is written under a temporary name and renamed, so concurrent launches never
+    read a partial file. Failing to write the cache is not an error.
+    Returns:
+        None
+    """
+    path = texture_cache_path(kind, color, size, variant)
+    temp_path = f"{path}.{os.getpid()}.png"
+    try:
+        os.makedirs(TEXTURE_CACHE_DIR, exist_ok=True)
+        pygame.image.save(texture, temp_path)
+        os.replace(temp_path, path)
+    except (pygame.error, OSError):
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def build_rotations(texture, size=30):
+    """
+    Precompute the four right-angle rotations of a texture.
+    Args:
+        texture (pygame.Surface): The texture to rotate.
+        size (int): Size of the grid cell the texture is drawn in.
+    Returns:
+        dict: Maps each angle (0, 90, 180, 270) to a (rotated texture, (dx, dy)) pair, where
+            (dx, dy) is the offset from the cell corner that keeps the texture centered.
+    """
+    rotations = {}
+    for angle in (0, 90, 180, 270):
+        rotated = pygame.transform.rotate(texture, angle) if angle else texture
+        offset = ((size - rotated.get_width()) // 2, (size - rotated.get_height()) // 2)
+        rotations[angle] = (rotated, offset)
+    return rotations
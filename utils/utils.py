@@ -25,19 +25,19 @@ def lerp(start, end, t):
         y1 + (y2 - y1) * t
     )
 
-def get_segment_position(current, target, frame, total_frames):
+def get_segment_position(current, target, frame, total_frames, move_resolution=0.25):
     """
     Get interpolated position for a snake segment.
     Args:
         current (tuple): Current position of the segment (x, y).
         target (tuple): Target position of the segment (x, y).
-        frame (int): Current frame number.
-        total_frames (int): Total number of frames for the movement.
+        frame (float): Current frame number, or time elapsed in the movement.
+        total_frames (float): Total number of frames, or duration, of the movement.
+        move_resolution (float, optional): Fraction of the way to the target covered by
+            the easing. Defaults to 0.25.
     Returns:
         tuple: Interpolated position (x, y).
     """
-    MOVE_RESOLUTION = 0.25
-
     if frame >= total_frames:
         return target
     t = frame / total_frames
@@ -47,13 +47,13 @@ def get_segment_position(current, target, frame, total_frames):
 
     # Adjust interpolation to move half the pixels
     adjusted_target = (
-        current[0] + (target[0] - current[0]) * MOVE_RESOLUTION,
-        current[1] + (target[1] - current[1]) * MOVE_RESOLUTION
+        current[0] + (target[0] - current[0]) * move_resolution,
+        current[1] + (target[1] - current[1]) * move_resolution
     )
 
     return lerp(current, adjusted_target, t)
 
-def generate_block_position(forbidden, width, height, side):
+def generate_block_position(forbidden, width, height, side, rng=random):
     """
     Generate a new random position for a block aligned to the grid.
     Args:
@@ -61,6 +61,7 @@ def generate_block_position(forbidden, width, height, side):
         width (int): Width of the game area.
         height (int): Height of the game area.
         side (int): Size of each grid cell.
+        rng (random.Random, optional): Random generator to draw from. Defaults to the global random module.
     Returns:
         tuple: Random position (x, y) or None if no valid positions are available.
     """
@@ -78,9 +79,9 @@ def generate_block_position(forbidden, width, height, side):
     if not all_positions:
         return None
 
-    return random.choice(all_positions)
+    return rng.choice(all_positions)
 
-def get_random_empty_cell(snake_positions=None, block_positions=None, width=None, height=None, side=None):
+def get_random_empty_cell(snake_positions=None, block_positions=None, width=None, height=None, side=None, rng=random):
     """
     Get a random empty cell that's not occupied by snake or blocks.
     Args:
@@ -89,6 +90,7 @@ def get_random_empty_cell(snake_positions=None, block_positions=None, width=None
         width (int): Width of the game area.
         height (int): Height of the game area.
         side (int): Size of each grid cell.
+        rng (random.Random, optional): Random generator to draw from. Defaults to the global random module.
     Returns:
         tuple: Random empty position (x, y) or None if no valid positions are available.
     """
@@ -97,7 +99,7 @@ def get_random_empty_cell(snake_positions=None, block_positions=None, width=None
         forbidden.update(snake_positions)
     if block_positions:
         forbidden.update(block_positions)
-    return generate_block_position(forbidden, width, height, side)
+    return generate_block_position(forbidden, width, height, side, rng)
 
 def get_tail_direction(prev_pos, tail_pos):
     """
@@ -0,0 +1,201 @@
+import multiprocessing as mp
+import os
+from multiprocessing import shared_memory
+import numpy as np
+from config import WIDTH, HEIGHT
+from utils.env import SnakeEnv, ACTIONS
+
+# Commands sent to the workers through their pipes
+CMD_STEP = "step"
+CMD_RESET = "reset"
+CMD_CLOSE = "close"
+
+def _shared_array(shape, dtype):
+    """Allocate a zeroed NumPy array backed by a new shared memory block
+    Args:
+        shape (tuple): Shape of the array.
+        dtype (numpy.dtype): Type of the elements.
+    Returns:
+        tuple: The SharedMemory block and the array viewing it.
+    """
+    size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    array[...] = 0
+    return shm, array
+
+def _worker(conn, start, stop, level, observation, seed, max_ticks, buffers):
+    """Run the games [start, stop) of a SubprocSnakeVecEnv until told to close
+    The worker reads the actions from and writes the observations, rewards, flags and
+    scores of its games to the shared buffers; only the command and an acknowledgement
+    go through the pipe.
+    Args:
+        conn (multiprocessing.connection.Connection): The worker's end of the pipe.
+        start (int): Index of the first game of the worker.
+        stop (int): Index after the last game of the worker.
+        level (str): Level name from levels_config.
+        observation (str): "grid" or "pixels".
+        seed (int): Seed of the first game, offset by the game index. None for random seeds.
+        max_ticks (int): Truncate games after this many moves, or None.
+        buffers (dict): SharedMemory blocks with their shapes and types, by name.
+    Returns:
+        None
+    """
+    arrays = {name: np.ndarray(shape, dtype=dtype, buffer=shm.buf)[start:stop]
+              for name, (shm, shape, dtype) in buffers.items()}
+    obs, actions, rewards = arrays["obs"], arrays["actions"], arrays["rewards"]
+    terminated, truncated, scores = arrays["terminated"], arrays["truncated"], arrays["scores"]
+    envs = [SnakeEnv(level, observation, None if seed is None else seed + i, max_ticks) for i in range(start, stop)]
+    try:
+        while True:
+            command, data = conn.recv()
+            if command == CMD_STEP:
+                for i, env in enumerate(envs):
+                    obs[i], rewards[i], terminated[i], truncated[i], info = env.step(int(actions[i]))
+                    scores[i] = info["score"]
+                    if terminated[i] or truncated[i]:
+                        obs[i] = env.reset()[0]
+            elif command == CMD_RESET:
+                for i, env in enumerate(envs):
+                    obs[i] = env.reset(None if data is None else data + start + i)[0]
+                    scores[i] = 0
+            elif command == CMD_CLOSE:
+                break
+            conn.send(None)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        conn.close()
+
+class SubprocSnakeVecEnv:
+    def __init__(self, n_envs, n_workers=None, level="baby", observation="grid", seed=None, max_ticks=None):
+        """Initialize N games run by a pool of worker processes
+        Each worker owns a contiguous slice of SnakeEnv games. Actions, observations,
+        rewards, done flags and scores live in multiprocessing.shared_memory buffers that
+        every process views as NumPy arrays, so stepping only sends a short command per
+        worker through its pipe instead of pickling observations. All workers are stepped
+        in lockstep: step sends the command to every worker, then waits for all of them.
+        Finished games are reset automatically, as in BatchSnakeEnv.
+        Args:
+            n_envs (int): Number of games to run.
+            n_workers (int, optional): Number of worker processes, at most n_envs.
+                Defaults to the number of CPUs.
+            level (str, optional): Level name from levels_config. Defaults to "baby".
+            observation (str, optional): "grid" or "pixels", see SnakeEnv. Defaults to "grid".
+            seed (int, optional): Seed of the first game; game i uses seed + i. Defaults to None.
+            max_ticks (int, optional): Truncate games after this many moves. Defaults to None.
+        """
+        n_workers = min(n_workers or os.cpu_count() or 1, n_envs)
+        self.n_envs = n_envs
+        self.n_workers = n_workers
+        self.n_actions = len(ACTIONS)
+        if observation == "pixels":
+            self.observation_shape = (HEIGHT, WIDTH, 3)
+        else:
+            self.observation_shape = SnakeEnv(level, observation).observation_shape
+
+        specs = {
+            "obs": ((n_envs,) + self.observation_shape, np.uint8),
+            "actions": ((n_envs,), np.int8),
+            "rewards": ((n_envs,), np.float32),
+            "terminated": ((n_envs,), bool),
+            "truncated": ((n_envs,), bool),
+            "scores": ((n_envs,), np.int32),
+        }
+        self._shms = []
+        buffers = {}
+        for name, (shape, dtype) in specs.items():
+            shm, array = _shared_array(shape, dtype)
+            self._shms.append(shm)
+            setattr(self, name, array)
+            buffers[name] = (shm, shape, dtype)
+
+        # Split the games as evenly as possible between the workers
+        bounds = np.linspace(0, n_envs, n_workers + 1).astype(int)
+        self._conns = []
+        self._processes = []
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            parent_conn, child_conn = mp.Pipe()
+            process = mp.Process(target=_worker, daemon=True,
+                                 args=(child_conn, int(start), int(stop), level, observation, seed, max_ticks, buffers))
+            process.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._processes.append(process)
+        self.closed = False
+        self._broadcast(CMD_RESET, seed)
+
+    def _broadcast(self, command, data):
+        """Send a command to every worker and wait until all of them are done
+        Args:
+            command (str): One of CMD_STEP, CMD_RESET, CMD_CLOSE.
+            data: Argument of the command.
+        Returns:
+            None
+        """
+        for conn in self._conns:
+            conn.send((command, data))
+        for conn in self._conns:
+            conn.recv()
+
+    def reset(self, seed=None):
+        """Start new games on every board
+        Args:
+            seed (int, optional): Seed of the first game; game i uses seed + i. Defaults to
+                None, which keeps drawing from each game's random generator.
+        Returns:
+            numpy.ndarray: The observations, of shape (n_envs,) + observation_shape.
+        """
+        self._broadcast(CMD_RESET, seed)
+        return self.obs
+
+    def step(self, actions):
+        """Move the snake of every game once
+        The returned arrays are views of the shared buffers and are overwritten by the
+        next call to step or reset; copy them to keep them.
+        Args:
+            actions (array): Index of the direction in ACTIONS, one per game.
+        Returns:
+            tuple: The observations, the rewards, whether each game ended, whether it was
+                truncated by max_ticks, and the score of each game after the move. Games that
+                ended are already reset, so their observation is the first one of the new game.
+        """
+        self.actions[:] = actions
+        self._broadcast(CMD_STEP, None)
+        return self.obs, self.rewards, self.terminated, self.truncated, self.scores
+
+    def close(self):
+        """Stop the workers and release the shared buffers
+        Returns:
+            None
+        """
+        if self.closed:
+            return
+        self.closed = True
+        for conn in self._conns:
+            try:
+                conn.send((CMD_CLOSE, None))
+            except (BrokenPipeError, EOFError):
+                pass
+        for process in self._processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+        for conn in self._conns:
+            conn.close()
+        # Drop the array views before closing the memory they point to
+        for name in ("obs", "actions", "rewards", "terminated", "truncated", "scores"):
+            setattr(self, name, None)
+        for shm in self._shms:
+            shm.close()
+            shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __del__(self):
+        if not getattr(self, "closed", True):
+            self.close()
@@ -0,0 +1,163 @@
+import random
+from collections import OrderedDict
+import pygame
+from config import CHUNK_CELLS, CHUNK_CACHE_SIZE
+from utils.textures import DIRT_GENERATORS
+
+# Color of the window area outside a board smaller than the view along one axis
+OUTSIDE_COLOR = (0, 0, 0)
+
+class Camera:
+    def __init__(self, view_width, view_height, world_width, world_height, side):
+        """Initialize a viewport onto a board larger than the window
+        The camera keeps its target, the snake head, at the center of the view, clamped so
+        the view never scrolls past the edges of the board. Along an axis where the board
+        is smaller than the view, the board is centered instead.
+        Args:
+            view_width (int): Width of the view in pixels.
+            view_height (int): Height of the view in pixels.
+            world_width (int): Width of the board in pixels.
+            world_height (int): Height of the board in pixels.
+            side (int): Size of each grid cell in pixels.
+        """
+        self.view_width = view_width
+        self.view_height = view_height
+        self.world_width = world_width
+        self.world_height = world_height
+        self.side = side
+        self.x = 0
+        self.y = 0
+
+    def follow(self, pos):
+        """Center the view on a cell
+        Args:
+            pos (tuple): Position (x, y) in pixels of the cell, which may lie between cells.
+        Returns:
+            None
+        """
+        self.x = self._clamp(pos[0] + self.side / 2 - self.view_width / 2, self.world_width, self.view_width)
+        self.y = self._clamp(pos[1] + self.side / 2 - self.view_height / 2, self.world_height, self.view_height)
+
+    @staticmethod
+    def _clamp(offset, world, view):
+        """Keep an offset of the view inside the board
+        Args:
+            offset (float): Wanted offset of the view in pixels.
+            world (int): Size of the board along the axis.
+            view (int): Size of the view along the axis.
+        Returns:
+            int: The offset, centering the board if it is smaller than the view.
+        """
+        if world <= view:
+            return (world - view) // 2
+        return int(min(max(offset, 0), world - view))
+
+    def to_screen(self, pos):
+        """Convert a position on the board into a position in the view
+        Args:
+            pos (tuple): Position (x, y) in pixels on the board.
+        Returns:
+            tuple: Position (x, y) in pixels in the view.
+        """
+        return (pos[0] - self.x, pos[1] - self.y)
+
+    def is_visible(self, pos):
+        """Check whether any part of a cell-sized sprite is in the view
+        Args:
+            pos (tuple): Position (x, y) in pixels on the board of the sprite.
+        Returns:
+            bool: True if the sprite overlaps the view.
+        """
+        return (-self.side < pos[0] - self.x < self.view_width and
+                -self.side < pos[1] - self.y < self.view_height)
+
+    def visible_cells(self, cols, rows):
+        """Get the columns and rows of the board that overlap the view
+        Args:
+            cols (int): Number of columns of the board.
+            rows (int): Number of rows of the board.
+        Returns:
+            tuple: The ranges of the visible columns and rows.
+        """
+        side = self.side
+        return (range(max(0, self.x // side), min(cols, (self.x + self.view_width - 1) // side + 1)),
+                range(max(0, self.y // side), min(rows, (self.y + self.view_height - 1) // side + 1)))
+
+class ChunkedBackground:
+    def __init__(self, variant, world_width, world_height, side, chunk_cells=CHUNK_CELLS, capacity=CHUNK_CACHE_SIZE):
+        """Initialize the background of a large board, rendered in square chunks on first sight
+        Each chunk is a dirt texture of its own, drawn by the level's dirt generator with a
+        seed derived from the chunk coordinates, so the ground does not repeat across the
+        board and a dropped chunk comes back unchanged. The most recently drawn chunks are
+        kept in an LRU cache, so a frame costs one blit per visible chunk and memory stays
+        bounded whatever the size of the board.
+        Args:
+            variant (int): Dirt variant of the level, a key of DIRT_GENERATORS.
+            world_width (int): Width of the board in pixels.
+            world_height (int): Height of the board in pixels.
+            side (int): Size of each grid cell in pixels.
+            chunk_cells (int, optional): Side of a chunk in cells. Defaults to CHUNK_CELLS.
+            capacity (int, optional): Number of chunks kept. Defaults to CHUNK_CACHE_SIZE.
+        """
+        self.variant = variant
+        self.world_width = world_width
+        self.world_height = world_height
+        self.chunk_size = chunk_cells * side
+        self.capacity = capacity
+        self._chunks = OrderedDict()
+        self.generated = 0
+
+    def chunk(self, cx, cy):
+        """Get the surface of a chunk, rendering it on first use
+        Args:
+            cx (int): Column of the chunk.
+            cy (int): Row of the chunk.
+        Returns:
+            Surface: The chunk, chunk_size pixels wide and high.
+        """
+        key = (cx, cy)
+        surface = self._chunks.get(key)
+        if surface is not None:
+            self._chunks.move_to_end(key)
+            return surface
+        surface = DIRT_GENERATORS[self.variant](self.chunk_size, random.Random(f"dirt-{self.variant}-{cx}-{cy}"))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()  # The dirt is opaque, so drop the alpha for fast blits
+        self.generated += 1
+        self._chunks[key] = surface
+        if len(self._chunks) > self.capacity:
+            self._chunks.popitem(last=False)
+        return surface
+
+    def draw(self, display, camera):
+        """Draw the chunks in the view of a camera
+        Args:
+            display (Surface): The surface to draw on, the size of the view.
+            camera (Camera): The camera giving the view.
+        Returns:
+            None
+        """
+        size = self.chunk_size
+        world = pygame.Rect(-camera.x, -camera.y, self.world_width, self.world_height)
+        if not world.contains(display.get_rect()):
+            display.fill(OUTSIDE_COLOR)
+        x0, y0 = max(0, camera.x), max(0, camera.y)
+        x1 = min(self.world_width, camera.x + camera.view_width)
+        y1 = min(self.world_height, camera.y + camera.view_height)
+        for cy in range(y0 // size, (y1 - 1) // size + 1):
+            for cx in range(x0 // size, (x1 - 1) // size + 1):
+                # Chunks on the last column and row may stick out of the board
+                area = pygame.Rect(0, 0, min(size, self.world_width - cx * size), min(size, self.world_height - cy * size))
+                display.blit(self.chunk(cx, cy), (cx * size - camera.x, cy * size - camera.y), area)
+
+class WorldView:
+    def __init__(self, view_width, view_height, engine, variant):
+        """Initialize the camera and background of a board larger than the window
+        Args:
+            view_width (int): Width of the view in pixels.
+            view_height (int): Height of the view in pixels.
+            engine (SnakeEngine): The engine holding the board.
+            variant (int): Dirt variant of the level, a key of DIRT_GENERATORS.
+        """
+        self.camera = Camera(view_width, view_height, engine.width, engine.height, engine.side)
+        self.background = ChunkedBackground(variant, engine.width, engine.height, engine.side)